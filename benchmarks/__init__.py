@@ -0,0 +1 @@
+"""Benchmarks run against synthetic journals, see `benchmarks.journals`."""
@@ -0,0 +1,80 @@
+"""Observer call overhead: events fed one at a time versus in batches.
+
+python -m benchmarks.batch_observers --journals 60
+
+Journals are parsed once up front, only feeding the observers is timed.
+"""
+
+import argparse
+import tempfile
+import time
+from typing import Callable
+from trademeds.journal.events import GameEvent
+from trademeds.journal.traverser import BATCH_SIZE, JournalEventTraverser
+from trademeds.observers.cargo import VitalsCargoSessionCollector
+from trademeds.observers.incomplete_cargo import IncompleteCargoTracker
+from .journals import write_journals
+
+Observer = VitalsCargoSessionCollector | IncompleteCargoTracker
+
+
+def read_events(journal_path: str) -> list[list[GameEvent]]:
+    """Parsed events per journal, newest first."""
+    traverser = JournalEventTraverser(journal_path)
+    return [list(traverser.read_events(name)) for name in traverser.journal_files()]
+
+
+def one_at_a_time(observer: Observer, journals: list[list[GameEvent]]) -> None:
+    for events in journals:
+        for event in events:
+            observer.handle_event(event)
+
+
+def batched(observer: Observer, journals: list[list[GameEvent]]) -> None:
+    for events in journals:
+        for start in range(0, len(events), BATCH_SIZE):
+            observer.handle_events(events[start : start + BATCH_SIZE])
+
+
+def feed_time(
+    make: Callable[[], Observer],
+    feed: Callable[[Observer, list[list[GameEvent]]], None],
+    journals: list[list[GameEvent]],
+    repeat: int,
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        observer = make()
+        started = time.perf_counter()
+        feed(observer, journals)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--journals", type=int, default=60, help="Synthetic journals")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_journals(tmp, args.journals)
+        journals = read_events(tmp)
+    count = sum(len(events) for events in journals)
+
+    print(f"events: {count:,}")
+    observers: list[tuple[str, Callable[[], Observer]]] = [
+        ("VitalsCargoSessionCollector", VitalsCargoSessionCollector),
+        ("IncompleteCargoTracker", lambda: IncompleteCargoTracker(depth=10**9)),
+    ]
+    for name, make in observers:
+        single = feed_time(make, one_at_a_time, journals, args.repeat)
+        batch = feed_time(make, batched, journals, args.repeat)
+        print(
+            f"{name:28} {single / count * 1e9:6.0f} ns/event one at a time,"
+            f" {batch / count * 1e9:6.0f} ns/event batched ({single / batch:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Journals skipped by Bloom filters for a filtered pending-cargo query.
+
+python -m benchmarks.bloom_skip --journals 365 --fpr 0.01
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from trademeds.journal.bloom import BloomIndex
+from trademeds.journal.filters import JournalFilter
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.observers.incomplete_cargo import IncompleteCargoTracker
+from .journals import FACTIONS, write_journals
+
+
+def run_query(
+    journal_path: str, event_filter: JournalFilter, blooms: BloomIndex | None
+) -> tuple[float, int]:
+    traverser = JournalEventTraverser(journal_path, event_filter)
+    read = 0
+    read_events = traverser.read_events
+
+    def counting_read_events(name: str):  # type: ignore[no-untyped-def]
+        nonlocal read
+        read += 1
+        return read_events(name)
+
+    traverser.read_events = counting_read_events  # type: ignore[method-assign]
+    traverser.add_observer(IncompleteCargoTracker(depth=10_000))
+
+    started = time.perf_counter()
+    traverser.traverse(max_sessions=None, blooms=blooms)
+    return time.perf_counter() - started, read
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--journals", type=int, default=365)
+    parser.add_argument("--events", type=int, default=500, help="Events per session")
+    parser.add_argument("--fpr", type=float, default=0.01)
+    parser.add_argument("--faction", default=FACTIONS[0])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_path = os.path.join(tmp, "journals")
+        write_journals(journal_path, args.journals, events_per_session=args.events)
+        event_filter = JournalFilter(faction=args.faction)
+
+        plain, _ = run_query(journal_path, event_filter, None)
+
+        blooms = BloomIndex(os.path.join(tmp, "blooms"), fpr=args.fpr)
+        traverser = JournalEventTraverser(journal_path)
+        started = time.perf_counter()
+        for name in traverser.journal_files():
+            blooms.get(traverser, name)
+        build = time.perf_counter() - started
+
+        indexed, read = run_query(
+            journal_path, event_filter, BloomIndex(blooms.path, fpr=args.fpr)
+        )
+        sidecars = sum(
+            os.path.getsize(os.path.join(blooms.path, name))
+            for name in os.listdir(blooms.path)
+        )
+
+    print(f"journals:           {args.journals}")
+    print(
+        f"skipped:            {args.journals - read} ({1 - read / args.journals:.0%})"
+    )
+    print(
+        f"sidecar bytes:      {sidecars} ({sidecars / args.journals:.0f} per journal)"
+    )
+    print(f"build sidecars:     {build:.3f}s")
+    print(f"filtered scan:      {plain:.3f}s")
+    print(f"with Bloom filters: {indexed:.3f}s ({plain / indexed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Simulated squadron members uploading to one ingest server on localhost.
+
+python -m benchmarks.ingest_load --clients 8 --sessions 20 --batch 500
+
+Every client uploads its own synthetic journal events in batches and then
+uploads every tenth batch again, like a push retried after a lost reply.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from trademeds.journal.parser import JournalEventParser
+from trademeds.squadron.client import post_batch
+from trademeds.squadron.server import IngestServer
+from .journals import session_events
+
+
+def client_lines(client: int, sessions: int, events: int) -> list[str]:
+    rng = random.Random(client)
+    parser = JournalEventParser()
+    started_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    lines = []
+    for session in range(sessions):
+        for event in session_events(
+            rng,
+            started_at + timedelta(hours=4 * session),
+            events,
+            first_mission_id=(client * sessions + session) * events,
+        ):
+            # What JournalPusher sends: only events the parser knows
+            if parser.recognises(event["event"]):
+                lines.append(json.dumps(event))
+    return lines
+
+
+def run_client(
+    url: str, client: int, lines: list[str], batch_size: int
+) -> tuple[list[float], int]:
+    batches = [lines[i : i + batch_size] for i in range(0, len(lines), batch_size)]
+    retried = batches[::10]
+    latencies = []
+    accepted = 0
+    for batch in batches + retried:
+        started = time.perf_counter()
+        accepted += post_batch(url, f"CMDR Bench {client}", batch)["accepted"]
+        latencies.append(time.perf_counter() - started)
+    return latencies, accepted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=20, help="Sessions per client")
+    parser.add_argument("--events", type=int, default=500, help="Events per session")
+    parser.add_argument("--batch", type=int, default=500, help="Lines per upload")
+    args = parser.parse_args()
+
+    lines = [
+        client_lines(client, args.sessions, args.events)
+        for client in range(args.clients)
+    ]
+    total = sum(len(client) for client in lines)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = IngestServer(tmp)
+        loop = asyncio.new_event_loop()
+        port = loop.run_until_complete(server.start("127.0.0.1", 0))
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{port}"
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.clients) as clients:
+            results = list(
+                clients.map(
+                    run_client,
+                    [url] * args.clients,
+                    range(args.clients),
+                    lines,
+                    [args.batch] * args.clients,
+                )
+            )
+        elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        pending = get_report(url)
+        report = time.perf_counter() - started
+
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    latencies = sorted(latency for client, _ in results for latency in client)
+    accepted = sum(client_accepted for _, client_accepted in results)
+    print(f"clients:          {args.clients}")
+    print(f"events:           {total:,} ({accepted:,} accepted, all new once)")
+    print(f"uploads:          {len(latencies):,} of up to {args.batch} lines")
+    print(f"elapsed:          {elapsed:.2f}s ({total / elapsed:,.0f} events/s)")
+    print(
+        f"upload latency:   p50 {statistics.median(latencies) * 1000:.0f} ms,"
+        f" p99 {latencies[int(len(latencies) * 0.99)] * 1000:.0f} ms"
+    )
+    print(f"pending cargo:    {pending} records in {report:.2f}s")
+    assert accepted == total, "every event must be logged exactly once"
+
+
+def get_report(url: str) -> int:
+    with urllib.request.urlopen(url + "/pending-cargo") as response:
+        return sum(1 for _ in response)
+
+
+if __name__ == "__main__":
+    main()
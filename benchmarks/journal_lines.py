@@ -0,0 +1,12 @@
+from trademeds.journal.traverser import JournalEventTraverser
+
+
+def read_lines(journal_path: str) -> list[str]:
+    """Non-blank lines of every journal, newest first."""
+    traverser = JournalEventTraverser(journal_path)
+    return [
+        line
+        for name in traverser.journal_files()
+        for line in traverser.read_lines(name)
+        if line.strip()
+    ]
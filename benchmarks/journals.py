@@ -0,0 +1,181 @@
+import json
+import os
+import random
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator
+
+FACTIONS = [
+    "Sudz Jet Netcoms Industry",
+    "Aknandan Partnership",
+    "Terran Colonial Forces",
+    "LHS 1914 Jet Vision Incorporated",
+    "Wolf 1301 Purple Transport Co",
+    "Bureau of Chacobog League",
+    "HIP 8525 Free",
+    "Aymarahuara United Corp.",
+]
+SYSTEMS = ["Sudz", "Aknandan", "LHS 1914", "Wolf 1301", "Chacobog", "HIP 8525"]
+COMMODITIES = ["Fish", "Gold", "Tea", "Coffee", "AgriculturalMedicines", "Beer"]
+# Events the parser ignores but real journals are mostly made of
+NOISE = ["Music", "ReceiveText", "Scan", "FuelScoop", "Loadout", "ShipTargeted"]
+
+
+def _event(timestamp: datetime, event: str, **fields: Any) -> dict[str, Any]:
+    return {
+        "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "event": event,
+        **fields,
+    }
+
+
+def _mission(rng: random.Random, mission_id: int, faction: str) -> dict[str, Any]:
+    commodity = rng.choice(COMMODITIES)
+    return {
+        "Faction": faction,
+        "Name": "Mission_Delivery_name",
+        "LocalisedName": f"Deliver {commodity}",
+        "MissionID": mission_id,
+        "Commodity": f"${commodity}_Name;",
+        "Commodity_Localised": commodity,
+        "Count": rng.randint(10, 700),
+        "DestinationSystem": rng.choice(SYSTEMS),
+        "DestinationStation": "Houssay Ring",
+        "Reward": rng.randint(100_000, 5_000_000),
+    }
+
+
+def session_events(
+    rng: random.Random, started_at: datetime, events: int, first_mission_id: int
+) -> Iterator[dict[str, Any]]:
+    """One game session: a LoadGame followed by a trading and mission mix."""
+    timestamp = started_at
+    yield _event(timestamp, "LoadGame", Commander="CMDR Bench")
+    faction = rng.choice(FACTIONS)
+    mission_id = first_mission_id
+    market_id = rng.randint(3_000_000_000, 3_000_000_100)
+
+    for _ in range(events):
+        timestamp += timedelta(seconds=rng.randint(1, 30))
+        roll = rng.random()
+        if roll < 0.05:
+            system = rng.choice(SYSTEMS)
+            yield _event(
+                timestamp,
+                "FSDJump",
+                StarSystem=system,
+                SystemAddress=zlib.crc32(system.encode()),
+            )
+        elif roll < 0.1:
+            market_id = rng.randint(3_000_000_000, 3_000_000_100)
+            yield _event(
+                timestamp,
+                "Market",
+                MarketID=market_id,
+                StationName="Houssay Ring",
+                StationType="Orbis",
+                StarSystem=rng.choice(SYSTEMS),
+            )
+        elif roll < 0.2:
+            commodity = rng.choice(COMMODITIES)
+            count = rng.randint(1, 700)
+            yield _event(
+                timestamp,
+                "MarketBuy",
+                MarketID=market_id,
+                Type=commodity.lower(),
+                Count=count,
+                BuyPrice=100,
+                TotalCost=100 * count,
+            )
+        elif roll < 0.3:
+            commodity = rng.choice(COMMODITIES)
+            count = rng.randint(1, 700)
+            yield _event(
+                timestamp,
+                "MarketSell",
+                MarketID=market_id,
+                Type=commodity.lower(),
+                Count=count,
+                SellPrice=150,
+                TotalSale=150 * count,
+                AvgPricePaid=100,
+            )
+        elif roll < 0.34:
+            mission_id += 1
+            yield _event(
+                timestamp,
+                "MissionAccepted",
+                Expiry=(timestamp + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                Influence="++",
+                Reputation="++",
+                **_mission(rng, mission_id, faction),
+            )
+        elif roll < 0.37:
+            yield _event(
+                timestamp,
+                "CargoDepot",
+                MissionID=mission_id,
+                UpdateType="Deliver",
+                CargoType=rng.choice(COMMODITIES),
+                Count=10,
+                StartMarketID=0,
+                EndMarketID=market_id,
+                ItemsCollected=0,
+                ItemsDelivered=10,
+                TotalItemsToDeliver=20,
+                Progress=0.0,
+            )
+        elif roll < 0.4:
+            yield _event(
+                timestamp,
+                "MissionCompleted",
+                FactionEffects=[
+                    {
+                        "Faction": faction,
+                        "Effects": [],
+                        "Influence": [
+                            {
+                                "SystemAddress": 5068464399785,
+                                "Trend": "UpGood",
+                                "Influence": "++",
+                            }
+                        ],
+                        "ReputationTrend": "UpGood",
+                        "Reputation": "++",
+                    }
+                ],
+                **_mission(rng, mission_id, faction),
+            )
+        else:
+            yield _event(timestamp, rng.choice(NOISE), Text="x" * rng.randint(20, 200))
+
+
+def write_journals(
+    path: str,
+    journals: int,
+    sessions_per_journal: int = 2,
+    events_per_session: int = 500,
+    seed: int = 1,
+) -> list[str]:
+    """Write deterministic synthetic journals to `path`, returns their names."""
+    os.makedirs(path, exist_ok=True)
+    rng = random.Random(seed)
+    started_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mission_id = 1_000_000_000
+    names = []
+
+    for _ in range(journals):
+        name = f"Journal.{started_at.strftime('%Y-%m-%dT%H%M%S')}.01.log"
+        with open(os.path.join(path, name), "w") as f:
+            for session in range(sessions_per_journal):
+                session_start = started_at + timedelta(hours=4 * session)
+                for event in session_events(
+                    rng, session_start, events_per_session, mission_id
+                ):
+                    f.write(json.dumps(event) + "\n")
+                mission_id += events_per_session
+        names.append(name)
+        started_at += timedelta(days=1)
+
+    return names
@@ -0,0 +1,54 @@
+"""Journal lines decoded per second by each installed JSON backend.
+
+python -m benchmarks.json_decoders --path "%USERPROFILE%\\Saved Games\\Frontier Developments\\Elite Dangerous"
+
+Without --path, synthetic journals are generated.
+"""
+
+import argparse
+import tempfile
+import time
+from trademeds.journal.decoders import available_decoders, get_decoder
+from .journal_lines import read_lines
+from .journals import write_journals
+
+
+def decode_rate(backend: str, lines: list[str], repeat: int) -> float:
+    _, decode = get_decoder(backend)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for line in lines:
+            decode(line)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default=None, help="Journal directory to decode")
+    parser.add_argument("--journals", type=int, default=60, help="Synthetic journals")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.path is not None:
+        lines = read_lines(args.path)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_journals(tmp, args.journals)
+            lines = read_lines(tmp)
+    size = sum(len(line.encode()) for line in lines)
+
+    print(f"lines: {len(lines):,} ({size / 1e6:.1f} MB)")
+    baseline = None
+    for backend in reversed(available_decoders()):
+        elapsed = decode_rate(backend, lines, args.repeat)
+        baseline = baseline or elapsed
+        print(
+            f"{backend:9} {len(lines) / elapsed:12,.0f} lines/s"
+            f" {size / elapsed / 1e6:8.1f} MB/s ({baseline / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
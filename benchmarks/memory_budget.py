@@ -0,0 +1,49 @@
+"""Peak memory of collecting and writing out sessions with and without a budget.
+
+python -m benchmarks.memory_budget --sessions 5000 --max-memory 8M
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from typing import Optional
+from trademeds.store.spool import SessionSpool, parse_size
+from trademeds.viewers.records import RecordWriter
+from trademeds.viewers.session import SessionView
+from .output_formats import make_markets, make_sessions
+
+
+def run(sessions: int, max_memory: Optional[int]) -> tuple[float, int, int]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    spool = SessionSpool(max_memory)
+    # Generated in chunks, like a traversal closing one session at a time
+    for seed in range(0, sessions, 100):
+        spool.extend(make_sessions(min(100, sessions - seed), seed=seed))
+
+    with open(os.devnull, "wb") as devnull, RecordWriter(devnull, "ndjson") as writer:
+        writer.write_all(SessionView(make_markets()).records(spool))
+    spool.close()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, writer.records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--max-memory", type=parse_size, default=parse_size("8M"))
+    args = parser.parse_args()
+
+    for label, budget in (("in memory", None), ("budgeted", args.max_memory)):
+        elapsed, peak, records = run(args.sessions, budget)
+        print(
+            f"{label:10} {elapsed:7.2f}s  peak {peak / 2**20:7.1f} MiB"
+            f"  ({records:,} records)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Per-call cost of the hot functions, compared against a saved baseline.
+
+python -m benchmarks.micro
+python -m benchmarks.micro --save
+python -m benchmarks.micro --only parse/fast --threshold 10
+
+Times parsing one line of each event type `JournalEventParser` knows (and
+of ignored events) in both modes, `handle_event` of the session collector
+and the pending cargo tracker, `CargoSessionBuilder.build` and
+`SessionView._missions_repr` of a large session. Each case runs for at
+least 0.2s per repeat, repeats take turns across the cases and the fastest
+one counts. Cases more than --threshold percent slower than the baseline
+are flagged and the exit status is 1. Baselines only compare on the
+machine they were saved on, and a busy machine can be 20% slower from run
+to run; raise --repeat or --threshold there.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import tempfile
+import timeit
+from typing import Callable, Iterator, Optional
+from trademeds.journal.decoders import get_decoder
+from trademeds.journal.events import GameEvent
+from trademeds.journal.filters import raw_event_name
+from trademeds.journal.parser import PARSE_MODES, JournalEventParser
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.models.entities import CargoSession
+from trademeds.observers.cargo import CargoSessionBuilder, VitalsCargoSessionCollector
+from trademeds.observers.incomplete_cargo import IncompleteCargoTracker
+from trademeds.viewers.session import SessionView
+from .journal_lines import read_lines
+from .journals import write_journals
+
+BASELINE = os.path.join(os.path.dirname(__file__), "micro_baseline.json")
+# Lines of each event type parsed per run
+SAMPLES = 200
+
+# Events the parser knows that the synthetic journals don't have
+EXTRA_LINES = {
+    "Location": '{ "timestamp":"2024-01-01T00:00:00Z", "event":"Location",'
+    ' "Docked":true, "StationName":"Houssay Ring", "StationType":"Orbis",'
+    ' "MarketID":3000000001, "StarSystem":"Sudz", "SystemAddress":5068464399785 }',
+    "MissionAbandoned": '{ "timestamp":"2024-01-01T00:00:00Z",'
+    ' "event":"MissionAbandoned", "Name":"Mission_Delivery_name",'
+    ' "LocalisedName":"Deliver Fish", "MissionID":1000000001 }',
+}
+
+# name, operations per run, run
+Case = tuple[str, int, Callable[[], object]]
+
+
+def lines_by_event(lines: list[str]) -> dict[str, list[str]]:
+    """Up to `SAMPLES` lines per event type, other events under "(ignored)"."""
+    parser = JournalEventParser()
+    by_event: dict[str, list[str]] = {}
+    for line in lines:
+        name = raw_event_name(line) or ""
+        if not parser.recognises(name):
+            name = "(ignored)"
+        samples = by_event.setdefault(name, [])
+        if len(samples) < SAMPLES:
+            samples.append(line)
+    for name, line in EXTRA_LINES.items():
+        by_event.setdefault(name, [line] * SAMPLES)
+    return by_event
+
+
+def parse_cases(lines: list[str]) -> Iterator[Case]:
+    _, decode = get_decoder()
+    for mode in PARSE_MODES:
+        parser = JournalEventParser(mode)
+        for name, samples in sorted(lines_by_event(lines).items()):
+
+            def run(parser: JournalEventParser = parser, samples: list[str] = samples):
+                for line in samples:
+                    parser.parse_line(line, decode)
+
+            yield f"parse/{mode}/{name}", len(samples), run
+
+
+def observer_cases(events: list[GameEvent]) -> Iterator[Case]:
+    def collect() -> None:
+        handle_event = VitalsCargoSessionCollector().handle_event
+        for event in events:
+            handle_event(event)
+
+    def track() -> None:
+        handle_event = IncompleteCargoTracker(depth=10**9).handle_event
+        for event in events:
+            handle_event(event)
+
+    yield "VitalsCargoSessionCollector.handle_event", len(events), collect
+    yield "IncompleteCargoTracker.handle_event", len(events), track
+
+
+def session_cases(session: CargoSession) -> Iterator[Case]:
+    builder = CargoSessionBuilder()
+
+    def build() -> None:
+        # build() hands its totals over and starts afresh, so fill it again
+        builder.sold = session.sold
+        builder.bought = session.bought
+        builder.missions = session.missions
+        builder.last_event_at = session.ended_at
+        builder.build(session.started_at)
+
+    view = SessionView({})
+
+    def missions_repr() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            view._missions_repr(session.missions)
+
+    yield "CargoSessionBuilder.build", 1, build
+    yield "SessionView._missions_repr", 1, missions_repr
+
+
+def cases(journals: int, session_events: int) -> list[Case]:
+    with tempfile.TemporaryDirectory() as tmp:
+        write_journals(tmp, journals)
+        lines = read_lines(tmp)
+        traverser = JournalEventTraverser(tmp)
+        events = [
+            event
+            for name in traverser.journal_files()
+            for event in traverser.read_events(name)
+        ]
+
+    # One long session, like a weekend of hauling
+    with tempfile.TemporaryDirectory() as tmp:
+        write_journals(
+            tmp, 1, sessions_per_journal=1, events_per_session=session_events
+        )
+        traverser = JournalEventTraverser(tmp)
+        collector = VitalsCargoSessionCollector()
+        traverser.add_observer(collector)
+        traverser.traverse(max_sessions=None)
+        session = collector.sessions[0]
+
+    return [
+        *parse_cases(lines),
+        *observer_cases(events),
+        *session_cases(session),
+    ]
+
+
+def time_per_op(selected: list[Case], repeat: int) -> dict[str, float]:
+    """Nanoseconds per operation of each case's fastest repeat.
+
+    Repeats go round all the cases, so a stretch of background load slows
+    one repeat of many cases rather than every repeat of a few.
+    """
+    timers = []
+    for name, ops, run in selected:
+        timer = timeit.Timer(run)
+        number, _ = timer.autorange()
+        timers.append((name, ops, number, timer))
+
+    best = {name: float("inf") for name, _, _, _ in timers}
+    for _ in range(repeat):
+        for name, ops, number, timer in timers:
+            best[name] = min(best[name], timer.timeit(number) / number / ops * 1e9)
+    return best
+
+
+def load_baseline(path: str) -> dict[str, float]:
+    try:
+        with open(path) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if baseline.get("python") != platform.python_version():
+        print(
+            f"Baseline is from Python {baseline.get('python')},"
+            f" this is {platform.python_version()}"
+        )
+    return baseline["results"]  # type: ignore[no-any-return]
+
+
+def save_baseline(path: str, results: dict[str, float]) -> None:
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": {name: round(ns, 1) for name, ns in sorted(results.items())},
+            },
+            f,
+            indent=2,
+        )
+        f.write("\n")
+
+
+def change(now: float, before: Optional[float]) -> Optional[float]:
+    """Percent `now` is slower than `before`, negative when faster."""
+    return (now / before - 1) * 100 if before else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline JSON file")
+    parser.add_argument(
+        "--save", action="store_true", help="Store the results as the baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=25.0,
+        help="Percent slower than the baseline that counts as a regression",
+    )
+    parser.add_argument(
+        "--only", default=None, help="Only run cases whose name contains this"
+    )
+    parser.add_argument("--journals", type=int, default=20, help="Synthetic journals")
+    parser.add_argument(
+        "--session-events", type=int, default=20_000, help="Events in the large session"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    selected = [
+        case
+        for case in cases(args.journals, args.session_events)
+        if args.only is None or args.only in case[0]
+    ]
+    results = time_per_op(selected, args.repeat)
+
+    slower = []
+    print(f"{'case':44} {'per call':>15} {'baseline':>15}")
+    for name, now in results.items():
+        percent = change(now, baseline.get(name))
+        if percent is None:
+            compared = "new"
+        else:
+            compared = f"{percent:+6.1f}%"
+            if percent > args.threshold:
+                compared += "  SLOWER"
+                slower.append(name)
+        before = f"{baseline[name]:12,.0f} ns" if name in baseline else " " * 15
+        print(f"{name:44} {now:12,.0f} ns {before}  {compared}")
+
+    if args.save:
+        # Cases left out by --only keep their baseline
+        save_baseline(args.baseline, baseline | results)
+        print(f"Saved {len(results)} results to {args.baseline}")
+    elif slower:
+        raise SystemExit(
+            f"{len(slower)} cases slower than the baseline by more than"
+            f" {args.threshold:g}%: {', '.join(slower)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Writing a sessions report as text, NDJSON and JSON.
+
+python -m benchmarks.output_formats --sessions 5000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from trademeds.models.entities import CargoMission, CargoSession, Market
+from trademeds.viewers.records import RecordWriter
+from trademeds.viewers.session import SessionView
+from .journals import COMMODITIES, FACTIONS, SYSTEMS
+
+
+def make_sessions(count: int, seed: int = 1) -> list[CargoSession]:
+    rng = random.Random(seed)
+    started_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    sessions = []
+    for i in range(count):
+        missions = {}
+        for mission_id in range(i * 20, i * 20 + rng.randint(0, 20)):
+            commodity = rng.choice(COMMODITIES)
+            missions[mission_id] = CargoMission(
+                mission_id=mission_id,
+                title=f"Deliver {commodity}",
+                technical_name=rng.choice(["Mission_Delivery", "Mission_Collect"]),
+                faction=rng.choice(FACTIONS),
+                good=commodity,
+                count=rng.randint(10, 700),
+                system=rng.choice(SYSTEMS),
+                influence={"VITALS": 2},
+            )
+        sessions.append(
+            CargoSession(
+                started_at=started_at,
+                ended_at=started_at + timedelta(hours=2),
+                sold={
+                    market_id: {
+                        good.lower(): rng.randint(1, 700) for good in COMMODITIES
+                    }
+                    for market_id in range(rng.randint(1, 4))
+                },
+                missions=missions,
+            )
+        )
+        started_at -= timedelta(hours=4)
+    return sessions
+
+
+def make_markets() -> dict[int, Market]:
+    return {
+        market_id: Market(
+            market_id=market_id,
+            station_name="Houssay Ring",
+            system_name=SYSTEMS[market_id],
+            is_carrier=False,
+        )
+        for market_id in range(4)
+    }
+
+
+def timed(write: Callable[[], None]) -> float:
+    started = time.perf_counter()
+    write()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=5000)
+    args = parser.parse_args()
+
+    sessions = make_sessions(args.sessions)
+    view = SessionView(make_markets())
+
+    with open(os.devnull, "wb") as devnull:
+        text_out = io.TextIOWrapper(devnull, write_through=False)
+
+        def text() -> None:
+            with contextlib.redirect_stdout(text_out):
+                view.display_sessions(sessions)
+            text_out.flush()
+
+        def ndjson_per_record() -> None:
+            # What a naive exporter does: one encode and write per record
+            with contextlib.redirect_stdout(text_out):
+                for record in view.records(sessions):
+                    print(json.dumps(record, default=str), flush=True)
+
+        def ndjson() -> None:
+            with RecordWriter(devnull, "ndjson") as writer:
+                writer.write_all(view.records(sessions))
+
+        def json_array() -> None:
+            with RecordWriter(devnull, "json") as writer:
+                writer.write_all(view.records(sessions))
+
+        results = {
+            "text": timed(text),
+            "ndjson, flush per record": timed(ndjson_per_record),
+            "ndjson": timed(ndjson),
+            "json": timed(json_array),
+        }
+
+    records = sum(1 for _ in view.records(sessions))
+    print(f"sessions: {args.sessions}, records: {records}", file=sys.stderr)
+    for name, elapsed in results.items():
+        print(f"{name + ':':26} {elapsed:.3f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Full-history session scan with journals reduced in worker processes.
+
+python -m benchmarks.parallel_scan --journals 200 --jobs 1 2 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.observers.cargo import VitalsCargoSessionCollector
+from .journals import write_journals
+
+
+def scan(journal_path: str, jobs: int) -> float:
+    traverser = JournalEventTraverser(journal_path)
+    traverser.add_observer(VitalsCargoSessionCollector())
+
+    started = time.perf_counter()
+    traverser.traverse(max_sessions=None, jobs=jobs)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--journals", type=int, default=200)
+    parser.add_argument("--events", type=int, default=500, help="Events per session")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_path = os.path.join(tmp, "journals")
+        write_journals(journal_path, args.journals, events_per_session=args.events)
+
+        sequential = scan(journal_path, 1)
+        print(f"cpus: {os.cpu_count()}, journals: {args.journals}")
+        print(f"sequential: {sequential:.3f}s")
+        for jobs in args.jobs:
+            elapsed = scan(journal_path, jobs)
+            print(f"jobs={jobs}: {elapsed:.3f}s ({sequential / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Journal lines parsed per second by each parser mode and shadow sample.
+
+python -m benchmarks.parse_modes --path "%USERPROFILE%\\Saved Games\\Frontier Developments\\Elite Dangerous"
+
+Without --path, synthetic journals are generated.
+"""
+
+import argparse
+import tempfile
+import time
+from typing import Optional
+from trademeds.journal.decoders import get_decoder
+from trademeds.journal.parser import JournalEventParser
+from trademeds.journal.shadow import ShadowVerifier
+from .journal_lines import read_lines
+from .journals import write_journals
+
+
+def parse_time(
+    mode: str, sample: Optional[float], lines: list[str], repeat: int
+) -> tuple[float, int]:
+    _, decode = get_decoder()
+    best = float("inf")
+    mismatched = 0
+    for _ in range(repeat):
+        shadow = ShadowVerifier(sample, seed=1) if sample is not None else None
+        parser = JournalEventParser(mode, shadow)
+        started = time.perf_counter()
+        for line in lines:
+            parser.parse_line(line, decode)
+        best = min(best, time.perf_counter() - started)
+        mismatched = shadow.mismatched if shadow is not None else 0
+    return best, mismatched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", default=None, help="Journal directory to parse")
+    parser.add_argument("--journals", type=int, default=60, help="Synthetic journals")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.path is not None:
+        lines = read_lines(args.path)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_journals(tmp, args.journals)
+            lines = read_lines(tmp)
+
+    print(f"lines: {len(lines):,}")
+    baseline = None
+    for mode, sample in (
+        ("validate", None),
+        ("fast", None),
+        ("fast", 0.01),
+        ("fast", 0.1),
+        ("fast", 1.0),
+    ):
+        elapsed, mismatched = parse_time(mode, sample, lines, args.repeat)
+        baseline = baseline or elapsed
+        label = mode if sample is None else f"{mode}, shadow {sample:.0%}"
+        print(
+            f"{label:18} {len(lines) / elapsed:12,.0f} lines/s"
+            f" ({baseline / elapsed:.1f}x, {mismatched} mismatches)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Journal events, traversal recorders and servers shared by the test modules."""
+
+import asyncio
+import json
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.squadron.server import IngestServer
+
+
+def write_journal(path, events):
+    with open(path, "w") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def record_reads(monkeypatch) -> list[str]:
+    """Names of the journal files parsed from now on."""
+    read: list[str] = []
+    read_events = JournalEventTraverser.read_events
+
+    def recording_read_events(self, name):
+        read.append(name)
+        return read_events(self, name)
+
+    monkeypatch.setattr(JournalEventTraverser, "read_events", recording_read_events)
+    return read
+
+
+def run_ingest_server(path, scenario):
+    """Result of `scenario(url)` run against an ingest server on localhost."""
+
+    async def main():
+        server = IngestServer(str(path))
+        port = await server.start("127.0.0.1", 0)
+        try:
+            return await scenario(f"http://127.0.0.1:{port}")
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def make_load_game(timestamp: str):
+    return {"timestamp": timestamp, "event": "LoadGame"}
+
+
+def make_market(
+    timestamp: str,
+    market_id: int = 5,
+    system: str = "Sudz",
+    station: str = "Houssay Ring",
+):
+    return {
+        "timestamp": timestamp,
+        "event": "Market",
+        "MarketID": market_id,
+        "StationName": station,
+        "StationType": "Orbis",
+        "StarSystem": system,
+    }
+
+
+def make_buy(timestamp: str, market_id: int, good: str, count: int, price: int):
+    return {
+        "timestamp": timestamp,
+        "event": "MarketBuy",
+        "MarketID": market_id,
+        "Type": good,
+        "Count": count,
+        "BuyPrice": price,
+        "TotalCost": count * price,
+    }
+
+
+def make_sell(
+    timestamp: str,
+    count: int,
+    market_id: int = 5,
+    good: str = "fish",
+    price: int = 200,
+    paid: int = 100,
+):
+    return {
+        "timestamp": timestamp,
+        "event": "MarketSell",
+        "MarketID": market_id,
+        "Type": good,
+        "Count": count,
+        "SellPrice": price,
+        "TotalSale": count * price,
+        "AvgPricePaid": paid,
+    }
+
+
+def make_mission_accepted(
+    timestamp: str,
+    mission_id: int,
+    faction: str = "Sudz Jet Netcoms Industry",
+    commodity: str = "Fish",
+    count: int = 20,
+):
+    return {
+        "timestamp": timestamp,
+        "event": "MissionAccepted",
+        "Faction": faction,
+        "Name": "Mission_Delivery",
+        "LocalisedName": f"Deliver {commodity}",
+        "MissionID": mission_id,
+        "Expiry": "2025-03-01T00:00:00Z",
+        "Influence": "++",
+        "Reputation": "++",
+        "Commodity": f"${commodity}_Name;",
+        "Commodity_Localised": commodity,
+        "Count": count,
+        "DestinationSystem": "Sudz",
+    }
+
+
+def make_depot(timestamp: str, mission_id: int, delivered: int, total: int = 20):
+    return {
+        "timestamp": timestamp,
+        "event": "CargoDepot",
+        "MissionID": mission_id,
+        "UpdateType": "Deliver",
+        "CargoType": "Fish",
+        "Count": delivered,
+        "StartMarketID": 0,
+        "EndMarketID": 5,
+        "ItemsCollected": 0,
+        "ItemsDelivered": delivered,
+        "TotalItemsToDeliver": total,
+        "Progress": 0.0,
+    }
@@ -0,0 +1,86 @@
+import json
+import os
+from datetime import datetime, timezone
+import pytest
+from trademeds.journal.archive import JournalArchive, archive_journals
+from trademeds.journal.traverser import JournalEventTraverser
+from ..helpers import make_load_game, make_sell, write_journal
+
+
+@pytest.mark.parametrize("codec", ["gzip", "lzma", "bz2"])
+def test_archived_journal_reads_like_plain_journal(tmp_path, codec):
+    journals = make_journals(tmp_path)
+    expected = read_all(journals)
+
+    archived = archive_journals(journals, now(), codec=codec, block_size=300)
+
+    assert archived == ["Journal.2025-02-14T090000.01.log"]
+    assert sorted(os.listdir(journals)) == [
+        "Journal.2025-02-14T090000.01.log.archive",
+        "Journal.2025-02-15T090000.01.log",
+    ]
+    assert read_all(journals) == expected
+
+
+def test_traversal_only_decompresses_blocks_it_reaches(tmp_path, monkeypatch):
+    journals = make_journals(tmp_path)
+    archive_journals(journals, now(), block_size=300)
+    archive = JournalArchive(str(journals / "Journal.2025-02-14T090000.01.log.archive"))
+    assert len(archive.blocks) > 2
+    archive.close()
+
+    read: list[int] = []
+    read_block = JournalArchive.read_block
+
+    def recording_read_block(self, i):
+        read.append(i)
+        return read_block(self, i)
+
+    monkeypatch.setattr(JournalArchive, "read_block", recording_read_block)
+    traverser = JournalEventTraverser(str(journals))
+    traverser.traverse(since=datetime(2025, 2, 14, 9, 50, tzinfo=timezone.utc))
+
+    # Only the newest blocks, down to the first event older than `since`
+    assert read == list(range(len(archive.blocks) - 1, read[-1] - 1, -1))
+    assert len(read) < len(archive.blocks) / 2
+
+
+def test_archived_lines_only_split_on_newlines(tmp_path):
+    journals = make_journals(tmp_path)
+    with open(journals / "Journal.2025-02-14T090000.01.log", "a") as f:
+        event = make_load_game("2025-02-14T10:00:00Z") | {"Commander": "Jo\u2028e"}
+        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    expected = read_all(journals)
+
+    archive_journals(journals, now(), block_size=300)
+
+    assert read_all(journals) == expected
+
+
+# Test helpers
+def make_journals(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    for day in (14, 15):
+        write_journal(
+            journals / f"Journal.2025-02-{day}T090000.01.log",
+            [make_load_game(f"2025-02-{day}T09:00:00Z")]
+            + [
+                make_sell(f"2025-02-{day}T09:{minute:02}:00Z", minute)
+                for minute in range(1, 60)
+            ],
+        )
+    return journals
+
+
+def read_all(journals):
+    traverser = JournalEventTraverser(str(journals))
+    return [
+        event
+        for name in traverser.journal_files()
+        for event in traverser.read_events(name)
+    ]
+
+
+def now():
+    return datetime.now(timezone.utc)
@@ -0,0 +1,210 @@
+import json
+import pytest
+from trademeds.journal.bloom import BLOOM_FPR_ENV, BloomFilter, BloomIndex
+from trademeds.journal.filters import JournalFilter
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.observers.cargo import VitalsCargoSessionCollector
+from trademeds.observers.incomplete_cargo import IncompleteCargoTracker
+from ..helpers import (
+    make_depot,
+    make_load_game,
+    make_market,
+    make_mission_accepted,
+    make_sell,
+    record_reads,
+    write_journal,
+)
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_fpr():
+    bloom_filter = BloomFilter.for_capacity(1000, fpr=0.01)
+    for i in range(1000):
+        bloom_filter.add(f"mission:{i}")
+
+    assert all(f"mission:{i}" in bloom_filter for i in range(1000))
+    false_positives = sum(f"mission:{i}" in bloom_filter for i in range(1000, 11000))
+    assert false_positives < 300
+
+
+def test_skips_journals_that_cant_match(tmp_path, monkeypatch):
+    journals = make_journals(tmp_path)
+    event_filter = JournalFilter(faction="Sudz Jet Netcoms Industry")
+    expected, _ = track(journals, event_filter)
+
+    blooms = BloomIndex(str(tmp_path / "blooms"))
+    track(journals, event_filter, blooms)  # builds the sidecars
+    read = record_reads(monkeypatch)
+    missions, sessions_seen = track(journals, event_filter, BloomIndex(blooms.path))
+
+    assert missions == expected
+    assert missions[13].count == 5  # delivered in the skipped journal
+    assert sessions_seen == 4
+    assert "Journal.2025-02-14T090000.01.log" not in read
+
+
+def test_changed_journal_rebuilds_sidecar(tmp_path):
+    journals = make_journals(tmp_path)
+    traverser = JournalEventTraverser(str(journals))
+    blooms = BloomIndex(str(tmp_path / "blooms"))
+    name = "Journal.2025-02-14T090000.01.log"
+    assert not blooms.may_contain(traverser, name, "mission:99")
+
+    with open(journals / name, "a") as f:
+        f.write(json.dumps(make_mission_accepted("2025-02-14T09:05:00Z", 99)))
+
+    assert BloomIndex(blooms.path).may_contain(traverser, name, "mission:99")
+
+
+def test_looks_a_mission_up_in_its_journals_only(tmp_path, monkeypatch):
+    journals = make_journals(tmp_path)
+    event_filter = JournalFilter(mission=13)
+    blooms = BloomIndex(str(tmp_path / "blooms"))
+    track(journals, event_filter, blooms)  # builds the sidecars
+
+    read = record_reads(monkeypatch)
+    missions, _ = track(journals, event_filter, BloomIndex(blooms.path))
+
+    assert list(missions) == [13]
+    assert missions[13].count == 5
+    assert sorted(read) == [
+        "Journal.2025-02-13T090000.01.log",
+        "Journal.2025-02-14T090000.01.log",
+    ]
+
+
+def test_sidecars_are_rebuilt_for_another_fpr(tmp_path, monkeypatch):
+    journals = make_journals(tmp_path)
+    traverser = JournalEventTraverser(str(journals))
+    name = "Journal.2025-02-13T090000.01.log"
+    path = str(tmp_path / "blooms")
+    BloomIndex(path).get(traverser, name)
+
+    monkeypatch.setenv(BLOOM_FPR_ENV, "0.0001")
+    blooms = BloomIndex(path)
+    assert blooms.fpr == 0.0001
+    assert blooms.get(traverser, name).filter.hashes == 13
+
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        BloomIndex(path, fpr=1)
+
+
+def test_skipped_progress_is_replayed_in_journal_order(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-13T090000.01.log",
+        [
+            make_load_game("2025-02-13T09:00:00Z"),
+            make_mission_accepted("2025-02-13T09:01:00Z", 7, count=30),
+            make_depot("2025-02-13T09:02:00Z", 7, delivered=10, total=30),
+        ],
+    )
+    write_journal(
+        journals / "Journal.2025-02-14T090000.01.log",
+        [
+            make_load_game("2025-02-14T09:00:00Z"),
+            make_depot("2025-02-14T09:02:00Z", 7, delivered=25, total=30),
+        ],
+    )
+    event_filter = JournalFilter(faction="Sudz Jet Netcoms Industry")
+    blooms = BloomIndex(str(tmp_path / "blooms"))
+    assert not blooms.may_match(
+        JournalEventTraverser(str(journals)),
+        "Journal.2025-02-14T090000.01.log",
+        event_filter,
+    )
+
+    missions, sessions_seen = track(journals, event_filter, blooms)
+
+    assert missions[7].count == 5
+    assert (missions, sessions_seen) == track(journals, event_filter)
+
+
+def test_skipped_journals_keep_markets_and_session_end(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-13T090000.01.log",
+        [
+            make_load_game("2025-02-13T09:00:00Z"),
+            make_market("2025-02-13T09:01:00Z", 5),
+            make_sell("2025-02-13T09:02:00Z", 5),
+        ],
+    )
+    # The same session continues after the game wrote a new journal
+    write_journal(
+        journals / "Journal.2025-02-13T100000.01.log",
+        [make_market("2025-02-13T10:01:00Z", 6)],
+    )
+    event_filter = JournalFilter(commodity="Fish")
+    expected = collect(journals, event_filter)
+
+    markets, sessions = collect(
+        journals, event_filter, BloomIndex(str(tmp_path / "blooms"))
+    )
+
+    assert (markets, sessions) == expected
+    assert set(markets) == {5, 6}
+    assert sessions[0].ended_at.hour == 10
+
+
+def test_skipped_journals_keep_their_trades(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-13T090000.01.log",
+        [
+            make_load_game("2025-02-13T09:00:00Z"),
+            make_sell("2025-02-13T09:02:00Z", 5),
+            make_sell("2025-02-13T09:03:00Z", 2, good="gold"),
+        ],
+    )
+    event_filter = JournalFilter(faction="Aknandan Partnership", commodity="Fish")
+    blooms = BloomIndex(str(tmp_path / "blooms"))
+    assert not blooms.may_match(
+        JournalEventTraverser(str(journals)),
+        "Journal.2025-02-13T090000.01.log",
+        event_filter,
+    )
+
+    _, sessions = collect(journals, event_filter, blooms)
+
+    assert sessions[0].sold == {5: {"fish": 5}}
+    assert collect(journals, event_filter)[1] == sessions
+
+
+# Test helpers
+def make_journals(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    factions = {
+        13: "Sudz Jet Netcoms Industry",
+        14: "Aknandan Partnership",
+        15: "Sudz Jet Netcoms Industry",
+        16: "Aknandan Partnership",
+    }
+    for day, faction in factions.items():
+        events = [
+            make_load_game(f"2025-02-{day}T09:00:00Z"),
+            make_mission_accepted(f"2025-02-{day}T09:01:00Z", day, faction),
+        ]
+        if day == 14:
+            events.append(make_depot("2025-02-14T09:03:00Z", 13, delivered=15))
+        write_journal(journals / f"Journal.2025-02-{day}T090000.01.log", events)
+    return journals
+
+
+def track(journals, event_filter, blooms=None):
+    traverser = JournalEventTraverser(str(journals), event_filter)
+    tracker = IncompleteCargoTracker()
+    traverser.add_observer(tracker)
+    traverser.traverse(max_sessions=None, blooms=blooms)
+    return tracker.missions, tracker.sessions_seen
+
+
+def collect(journals, event_filter, blooms=None):
+    traverser = JournalEventTraverser(str(journals), event_filter)
+    collector = VitalsCargoSessionCollector()
+    traverser.add_observer(collector)
+    traverser.traverse(max_sessions=None, blooms=blooms)
+    return collector.markets, collector.sessions
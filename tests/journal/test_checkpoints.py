@@ -0,0 +1,92 @@
+import json
+import pickle
+import pytest
+from trademeds.journal.checkpoints import CheckpointStore
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.observers.cargo import VitalsCargoSessionCollector
+from trademeds.observers.incomplete_cargo import IncompleteCargoTracker
+from ..helpers import (
+    make_depot,
+    make_load_game,
+    make_market,
+    make_mission_accepted,
+    make_sell,
+    record_reads,
+    write_journal,
+)
+
+
+def test_checkpointed_traversal_matches_plain_traversal(tmp_path, monkeypatch):
+    journals = make_journals(tmp_path)
+    expected = traverse(journals, depth=3)
+
+    checkpoints = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    assert traverse(journals, depth=3, checkpoints=checkpoints) == expected
+
+    read = record_reads(monkeypatch)
+    assert traverse(journals, depth=3, checkpoints=checkpoints) == expected
+    assert read == []
+    checkpoints.close()
+
+
+def test_changed_journal_is_parsed_again(tmp_path, monkeypatch):
+    journals = make_journals(tmp_path)
+    checkpoints = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    traverse(journals, depth=4, checkpoints=checkpoints)
+
+    with open(journals / "Journal.2025-02-16T090000.01.log", "a") as f:
+        f.write(json.dumps(make_depot("2025-02-16T10:00:00Z", 14, 20)) + "\n")
+
+    read = record_reads(monkeypatch)
+    tracker, sessions = traverse(journals, depth=4, checkpoints=checkpoints)
+
+    assert read == ["Journal.2025-02-16T090000.01.log"]
+    assert (tracker, sessions) == traverse(journals, depth=4)
+    assert 14 not in tracker
+    checkpoints.close()
+
+
+def test_parallel_traversal_matches_plain_traversal(tmp_path):
+    journals = make_journals(tmp_path)
+
+    assert traverse(journals, depth=3, jobs=2) == traverse(journals, depth=3)
+    assert traverse(journals, depth=10, jobs=3) == traverse(journals, depth=10)
+
+
+def test_unpicklable_observer_fails_instead_of_hanging(tmp_path):
+    journals = make_journals(tmp_path)
+    traverser = JournalEventTraverser(str(journals))
+    collector = VitalsCargoSessionCollector()
+    collector.fresh = lambda: collector  # type: ignore[method-assign]
+    collector.unpicklable = lambda: None  # type: ignore[attr-defined]
+    traverser.add_observer(collector)
+
+    with pytest.raises((pickle.PicklingError, AttributeError)):
+        traverser.traverse(max_sessions=None, jobs=2)
+
+
+# Test helpers
+def make_journals(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    for day in (13, 14, 15, 16):
+        events = [
+            make_load_game(f"2025-02-{day}T09:00:00Z"),
+            make_market(f"2025-02-{day}T09:01:00Z"),
+            make_mission_accepted(f"2025-02-{day}T09:02:00Z", day),
+            make_sell(f"2025-02-{day}T09:03:00Z", day),
+        ]
+        if day > 13:
+            events.append(make_depot(f"2025-02-{day}T09:04:00Z", day - 1, 5))
+        write_journal(journals / f"Journal.2025-02-{day}T090000.01.log", events)
+    return journals
+
+
+def traverse(journals, depth: int, checkpoints=None, jobs=1):
+    traverser = JournalEventTraverser(str(journals))
+    tracker = IncompleteCargoTracker(depth=depth)
+    collector = VitalsCargoSessionCollector()
+    traverser.add_observer(tracker)
+    traverser.add_observer(collector)
+    traverser.traverse(max_sessions=depth, checkpoints=checkpoints, jobs=jobs)
+    return tracker.missions, collector.sessions
@@ -0,0 +1,87 @@
+import json
+import sys
+import pytest
+from trademeds.journal.decoders import BACKENDS, get_decoder
+from trademeds.journal.parser import JournalEventParser
+from ..helpers import (
+    make_buy,
+    make_depot,
+    make_load_game,
+    make_market,
+    make_mission_accepted,
+    make_sell,
+)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_parse_identical_events(backend):
+    pytest.importorskip(backend)
+    _, decode = get_decoder(backend)
+    parser = JournalEventParser()
+
+    for line in make_lines():
+        expected = json.loads(line)
+        assert decode(line) == expected
+        assert decode(line.encode()) == expected
+        assert parser.parse(decode(line)) == parser.parse(expected)
+
+
+def test_decoder_from_environment(monkeypatch):
+    monkeypatch.setenv("TRADEMEDS_JSON_DECODER", "json")
+    assert get_decoder() == ("json", json.loads)
+    assert get_decoder("json")[0] == "json"
+
+    monkeypatch.setenv("TRADEMEDS_JSON_DECODER", "yaml")
+    with pytest.raises(ValueError, match="Unknown JSON decoder"):
+        get_decoder()
+
+
+def test_auto_falls_back_to_the_standard_library(monkeypatch):
+    monkeypatch.delenv("TRADEMEDS_JSON_DECODER", raising=False)
+    for backend in BACKENDS[:-1]:
+        monkeypatch.setitem(sys.modules, backend, None)
+
+    assert get_decoder() == ("json", json.loads)
+
+
+# Test helpers
+def make_lines() -> list[str]:
+    events = [
+        make_load_game("2025-02-14T09:00:00Z"),
+        make_market("2025-02-14T09:01:00Z", station='Château   "Ring"'),
+        make_buy("2025-02-14T09:02:00Z", 3_228_342_528, "fish", 700, 2**31),
+        make_sell("2025-02-14T09:03:00Z", 3, paid=-1),
+        make_mission_accepted("2025-02-14T09:04:00Z", 2**62, faction="サドズ"),
+        make_depot("2025-02-14T09:05:00Z", 7, delivered=15)
+        | {"Progress": 0.1234567890123456789},
+        {
+            "timestamp": "2025-02-14T09:06:00Z",
+            "event": "MissionCompleted",
+            "Faction": "Sudz",
+            "Name": "Mission_Delivery",
+            "LocalisedName": "Deliver \\ fish \U0001f41f",
+            "MissionID": 1,
+            "FactionEffects": [
+                {
+                    "Faction": "Sudz",
+                    "Effects": [
+                        {"Effect": "$e;", "Effect_Localised": "", "Trend": "UpGood"}
+                    ],
+                    "Influence": [
+                        {
+                            "SystemAddress": 5068464399785,
+                            "Trend": "UpGood",
+                            "Influence": "+++",
+                        }
+                    ],
+                    "ReputationTrend": "UpGood",
+                    "Reputation": "++",
+                }
+            ],
+            "Reward": 1e6,
+        },
+    ]
+    lines = [json.dumps(event) for event in events]
+    # The game writes non-ASCII characters unescaped, with spaces after separators
+    lines += [json.dumps(event, ensure_ascii=False) + "\r\n" for event in events]
+    return lines
@@ -0,0 +1,76 @@
+import shutil
+from datetime import datetime, timedelta, timezone
+from trademeds.journal.dedup import LineWindow, unique_journals
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.observers.cargo import VitalsCargoSessionCollector
+from ..helpers import make_load_game, make_sell, write_journal
+
+JOURNAL = "Journal.2025-02-14T090000.01.log"
+COPY = "Journal.2025-02-14T090000.01 - Copy.log"
+
+
+def test_copied_journals_are_left_out(tmp_path):
+    write_journal(tmp_path / JOURNAL, make_session())
+    shutil.copy(tmp_path / JOURNAL, tmp_path / COPY)
+    # Same size, different contents
+    write_journal(
+        tmp_path / "Journal.2025-02-15T090000.01.log",
+        make_session("2025-02-15"),
+    )
+
+    traverser = JournalEventTraverser(str(tmp_path))
+    assert traverser.journal_files() == ["Journal.2025-02-15T090000.01.log", JOURNAL]
+    assert sold(traverser) == [4, 4]
+
+
+def test_dedupe_window_drops_lines_of_partial_copies(tmp_path):
+    events = make_session()
+    write_journal(tmp_path / JOURNAL, events)
+    write_journal(tmp_path / COPY, events[:3])  # a backup taken mid session
+    assert len(unique_journals(str(tmp_path), [JOURNAL, COPY])) == 2
+
+    assert sold(JournalEventTraverser(str(tmp_path))) == [4, 2]
+
+    traverser = JournalEventTraverser(str(tmp_path), dedupe_window=timedelta(hours=1))
+    assert sold(traverser) == [4]
+
+
+def test_dedupe_window_is_read_from_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADEMEDS_DEDUPE_WINDOW", "90m")
+    assert JournalEventTraverser(str(tmp_path)).dedupe_window == timedelta(minutes=90)
+
+
+def test_line_window_forgets_lines_far_newer_than_the_traversal():
+    window = LineWindow(timedelta(hours=1))
+    start = datetime(2025, 2, 14, 23, tzinfo=timezone.utc)
+    for hour in range(24):
+        at = start - timedelta(hours=hour)
+        line = f'{{ "timestamp":"{at:%Y-%m-%dT%H:%M:%SZ}", "event":"Music" }}'
+        assert not window.seen(line)
+        assert window.seen(line)
+        assert len(window.buckets) <= 3
+
+    assert window.duplicates == 24
+    assert not window.seen("not a journal line")
+    assert not window.seen("not a journal line")
+
+
+# Test helpers
+def make_session(day: str = "2025-02-14"):
+    return [
+        make_load_game(f"{day}T09:00:00Z"),
+        make_sell(f"{day}T09:01:00Z", 1),
+        make_sell(f"{day}T09:02:00Z", 1),
+        make_sell(f"{day}T09:03:00Z", 1),
+        make_sell(f"{day}T09:04:00Z", 1),
+    ]
+
+
+def sold(traverser: JournalEventTraverser) -> list[int]:
+    collector = VitalsCargoSessionCollector()
+    traverser.add_observer(collector)
+    traverser.traverse(max_sessions=None)
+    return [
+        sum(count for goods in session.sold.values() for count in goods.values())
+        for session in collector.sessions
+    ]
@@ -0,0 +1,151 @@
+import json
+from trademeds.journal.filters import JournalFilter, raw_event_name
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.observers.cargo import VitalsCargoSessionCollector
+from trademeds.observers.incomplete_cargo import IncompleteCargoTracker
+from ..helpers import (
+    make_depot,
+    make_load_game,
+    make_market,
+    make_mission_accepted,
+    make_sell,
+    write_journal,
+)
+
+
+def test_raw_event_name():
+    assert raw_event_name('{ "timestamp":"x", "event":"LoadGame" }') == "LoadGame"
+    assert (
+        raw_event_name(json.dumps(make_load_game("2025-02-14T09:00:00Z"))) == "LoadGame"
+    )
+    assert raw_event_name("{}") is None
+
+
+def test_rejects_lines_before_decoding(tmp_path):
+    journals = make_journals(tmp_path)
+
+    traverser = JournalEventTraverser(
+        str(journals), JournalFilter(faction="Sudz Jet Netcoms Industry")
+    )
+    decoded = record_decoding(traverser)
+    events = list(traverser.read_events("Journal.2025-02-14T090000.01.log"))
+
+    # The other faction's mission is never decoded; the fish sale names no
+    # faction, trades are kept
+    assert [event.event for event in events] == [
+        "CargoDepot",
+        "MarketSell",
+        "MissionAccepted",
+        "LoadGame",
+    ]
+    assert len(decoded) == 4
+
+
+def test_commodity_filter_matches_internal_and_localised_names(tmp_path):
+    journals = make_journals(tmp_path)
+
+    for commodity in ("Gold", "$gold_name;"):
+        traverser = JournalEventTraverser(
+            str(journals), JournalFilter(commodity=commodity)
+        )
+        tracker = IncompleteCargoTracker()
+        traverser.add_observer(tracker)
+        traverser.traverse()
+        assert list(tracker.missions) == [2]
+
+
+def test_mission_progress_is_kept_for_matching_missions(tmp_path):
+    journals = make_journals(tmp_path)
+
+    traverser = JournalEventTraverser(
+        str(journals), JournalFilter(faction="Sudz Jet Netcoms Industry")
+    )
+    tracker = IncompleteCargoTracker()
+    traverser.add_observer(tracker)
+    traverser.traverse()
+
+    assert tracker.missions[1].count == 15
+
+
+def test_system_filter_keeps_trades_at_markets_in_the_system(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-14T090000.01.log",
+        [
+            make_load_game("2025-02-14T09:00:00Z"),
+            make_market("2025-02-14T09:01:00Z", 5, system="Sudz"),
+            make_sell("2025-02-14T09:02:00Z", 3, market_id=5),
+            make_market("2025-02-14T09:03:00Z", 6, system="Aknandan"),
+            make_sell("2025-02-14T09:04:00Z", 4, market_id=6),
+            make_sell("2025-02-14T09:05:00Z", 9, market_id=7, good="gold"),
+        ],
+    )
+    event_filter = JournalFilter(system="Sudz", commodity="Fish")
+    traverser = JournalEventTraverser(str(journals), event_filter)
+    collector = VitalsCargoSessionCollector()
+    traverser.add_observer(collector)
+    traverser.traverse()
+
+    session = collector.sessions[0]
+    assert session.sold == {5: {"fish": 3}, 6: {"fish": 4}}
+    assert event_filter.restrict_trades(session, collector.markets).sold == {
+        5: {"fish": 3}
+    }
+    # Without a system every trade stays
+    assert JournalFilter(faction="Sudz").restrict_trades(session, {}) is session
+
+
+def test_market_filter_keeps_that_markets_trades_only(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-14T090000.01.log",
+        [
+            make_load_game("2025-02-14T09:00:00Z"),
+            make_mission_accepted("2025-02-14T09:01:00Z", 3228342528),
+            make_sell("2025-02-14T09:02:00Z", 3, market_id=3228342528),
+            make_sell("2025-02-14T09:04:00Z", 4, market_id=3228342529),
+        ],
+    )
+    traverser = JournalEventTraverser(str(journals), JournalFilter(market=3228342528))
+    collector = VitalsCargoSessionCollector()
+    traverser.add_observer(collector)
+    decoded = record_decoding(traverser)
+    traverser.traverse()
+
+    # The mission has the market's number in its line, but as its MissionID
+    assert collector.sessions[0].sold == {3228342528: {"fish": 3}}
+    assert collector.sessions[0].missions == {}
+    assert len(decoded) == 3
+
+
+# Test helpers
+def make_journals(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-14T090000.01.log",
+        [
+            make_load_game("2025-02-14T09:00:00Z"),
+            make_mission_accepted("2025-02-14T09:01:00Z", 1),
+            make_mission_accepted(
+                "2025-02-14T09:01:00Z", 2, "Aknandan Partnership", "Gold"
+            ),
+            make_sell("2025-02-14T09:02:00Z", 3),
+            make_depot("2025-02-14T09:03:00Z", 1, delivered=5),
+        ],
+    )
+    return journals
+
+
+def record_decoding(traverser) -> list[str]:
+    decoded: list[str] = []
+    decode = traverser.decode
+
+    def recording_decode(line):
+        decoded.append(line)
+        return decode(line)
+
+    traverser.decode = recording_decode
+    return decoded
@@ -9,6 +9,8 @@ from trademeds.journal.events import (
     MissionCompletedEvent,
     FactionEffect,
     FactionEffectGroup,
+    FactionInfluence,
+    LazyFactionEffects,
     MissionAcceptedEvent,
     MissionAbandonedEvent,
     CargoDepotEvent,
@@ -219,11 +221,11 @@ class TestJournalParser:
                         )
                     ],
                     influence=[
-                        {
-                            "SystemAddress": 9466779215257,
-                            "Trend": "UpGood",
-                            "Influence": "++",
-                        }
+                        FactionInfluence.model_construct(
+                            system_address=9466779215257,
+                            trend="UpGood",
+                            influence="++",
+                        )
                     ],
                     reputation_trend="UpGood",
                     reputation="+",
@@ -316,11 +318,11 @@ class TestJournalParser:
                         )
                     ],
                     influence=[
-                        {
-                            "SystemAddress": 2869978015193,
-                            "Trend": "UpGood",
-                            "Influence": "++",
-                        }
+                        FactionInfluence.model_construct(
+                            system_address=2869978015193,
+                            trend="UpGood",
+                            influence="++",
+                        )
                     ],
                     reputation_trend="UpGood",
                     reputation="+++++",
@@ -335,11 +337,11 @@ class TestJournalParser:
                         )
                     ],
                     influence=[
-                        {
-                            "SystemAddress": 9466779215257,
-                            "Trend": "UpGood",
-                            "Influence": "++",
-                        }
+                        FactionInfluence.model_construct(
+                            system_address=9466779215257,
+                            trend="UpGood",
+                            influence="++",
+                        )
                     ],
                     reputation_trend="UpGood",
                     reputation="+++++",
@@ -563,3 +565,42 @@ class TestJournalParser:
         assert isinstance(event, MarketSellEvent)
         assert event.type == "coffee"
         assert event.type_localised is None
+
+    def test_mission_completed_faction_effects_are_lazy(self, parser):
+        raw_event = {
+            "timestamp": "2025-02-14T18:48:59Z",
+            "event": "MissionCompleted",
+            "Faction": "Terran Colonial Forces",
+            "Name": "Mission_AltruismCredits_Outbreak_name",
+            "LocalisedName": "Donate 300,000 Cr to Prevent a Medical Emergency",
+            "MissionID": 1003255884,
+            "Donated": 300000,
+            "FactionEffects": [
+                {
+                    "Faction": "Terran Colonial Forces",
+                    "Effects": [
+                        {
+                            "Effect": "$MISSIONUTIL_Interaction_Summary_Outbreak_down;",
+                            "Effect_Localised": "With fewer reported cases of illness...",
+                            "Trend": "DownGood",
+                        }
+                    ],
+                    "Influence": [],
+                    "ReputationTrend": "UpGood",
+                    "Reputation": "+",
+                }
+            ],
+        }
+
+        event = parser.parse(raw_event)
+
+        assert isinstance(event, MissionCompletedEvent)
+        assert isinstance(event.faction_effects, LazyFactionEffects)
+        assert len(event.faction_effects) == 1
+        assert not event.faction_effects.is_materialized
+
+        group = event.faction_effects[0]
+        assert isinstance(group, FactionEffectGroup)
+        assert group.effects[0].trend == "DownGood"
+        assert event.faction_effects.is_materialized
+        assert event.faction_effects[0] is group
@@ -0,0 +1,86 @@
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+from trademeds.journal import traverser as traverser_module
+from trademeds.journal.scan import LineScan, parse_timestamp, scan_line
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.observers.cargo import VitalsCargoSessionCollector
+from ..helpers import make_load_game, make_sell, record_reads, write_journal
+
+
+def test_parse_timestamp():
+    parse_timestamp.cache_clear()
+    expected = datetime(2025, 2, 14, 18, 1, 2, tzinfo=timezone.utc)
+
+    assert parse_timestamp("2025-02-14T18:01:02Z") == expected
+    assert parse_timestamp("2025-02-14T18:01:02Z") is parse_timestamp(
+        "2025-02-14T18:01:02Z"
+    )
+    assert parse_timestamp.cache_info().hits == 2
+    assert parse_timestamp("2025-02-14T19:01:02+01:00") == expected
+    with pytest.raises(ValueError):
+        parse_timestamp("2025-02-30T18:01:02Z")
+    with pytest.raises(ValueError):
+        parse_timestamp("2025-02-14T18:01:02")
+
+
+def test_scan_line():
+    at = datetime(2025, 2, 14, 18, 1, tzinfo=timezone.utc)
+    game_line = '{ "timestamp":"2025-02-14T18:01:00Z", "event":"Music", "Track":"x" }'
+    assert scan_line(game_line) == LineScan(at, "Music")
+    assert scan_line(json.dumps(make_load_game("2025-02-14T18:01:00Z"))) == LineScan(
+        at, "LoadGame"
+    )
+    assert scan_line('{ "event":"Music" }') is None
+    assert scan_line('{ "timestamp":"soon", "event":"Music" }') is None
+
+
+def test_scan_and_newest_timestamp(tmp_path, monkeypatch):
+    start = datetime(2025, 2, 14, 9, tzinfo=timezone.utc)
+    name = "Journal.2025-02-14T090000.01.log"
+    write_journal(
+        tmp_path / name,
+        [make_load_game(timestamp(start))]
+        + [make_sell(timestamp(start + timedelta(minutes=i)), 1) for i in range(1, 60)],
+    )
+    traverser = JournalEventTraverser(str(tmp_path))
+
+    scanned = list(traverser.scan(name))
+    assert len(scanned) == 60
+    assert scanned[0] == LineScan(start + timedelta(minutes=59), "MarketSell")
+    assert scanned[-1] == LineScan(start, "LoadGame")
+
+    for tail_bytes in (16 * 1024, 300, 10):
+        monkeypatch.setattr(traverser_module, "TAIL_BYTES", tail_bytes)
+        assert traverser.newest_timestamp(name) == start + timedelta(minutes=59)
+
+
+def test_traverse_since_skips_older_journals_unread(tmp_path, monkeypatch):
+    for day in (12, 13, 14):
+        write_journal(
+            tmp_path / f"Journal.2025-02-{day}T090000.01.log",
+            [
+                make_load_game(f"2025-02-{day}T09:00:00Z"),
+                make_sell(f"2025-02-{day}T09:05:00Z", day),
+            ],
+        )
+    read = record_reads(monkeypatch)
+    collector = VitalsCargoSessionCollector()
+    traverser = JournalEventTraverser(str(tmp_path))
+    traverser.add_observer(collector)
+
+    traverser.traverse(
+        max_sessions=None, since=datetime(2025, 2, 13, 9, 1, tzinfo=timezone.utc)
+    )
+
+    # The 12th's journal ends before `since`, so it isn't even parsed
+    assert read == [
+        "Journal.2025-02-14T090000.01.log",
+        "Journal.2025-02-13T090000.01.log",
+    ]
+    assert len(collector.sessions) == 1
+
+
+# Test helpers
+def timestamp(at: datetime) -> str:
+    return at.strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -0,0 +1,125 @@
+import json
+from datetime import datetime, timezone
+import pytest
+from trademeds.journal.decoders import get_decoder
+from trademeds.journal.events import MarketBuyEvent
+from trademeds.journal.parser import JournalEventParser
+from trademeds.journal.shadow import ShadowVerifier, compare_events
+from trademeds.journal.traverser import JournalEventTraverser
+from ..helpers import (
+    make_buy,
+    make_depot,
+    make_load_game,
+    make_market,
+    make_mission_accepted,
+    write_journal,
+)
+
+
+def test_fast_path_parses_like_the_reference(tmp_path):
+    write_journal(
+        tmp_path / "Journal.2025-02-14T090000.01.log",
+        [
+            make_load_game("2025-02-14T09:00:00Z"),
+            {"timestamp": "2025-02-14T09:00:01Z", "event": "Music", "Track": "x"},
+            make_market("2025-02-14T09:01:00Z"),
+            make_mission_accepted("2025-02-14T09:02:00Z", 1, "Sudz"),
+            make_buy("2025-02-14T09:03:00Z", 5, "fish", 20, 100),
+            make_depot("2025-02-14T09:04:00Z", 1, 20),
+        ],
+    )
+    traverser = JournalEventTraverser(str(tmp_path))
+    name = "Journal.2025-02-14T090000.01.log"
+    reference = list(traverser.read_events(name))
+
+    traverser.parser = JournalEventParser("fast", ShadowVerifier(1, report=fail))
+    assert list(traverser.read_events(name)) == reference
+    assert traverser.parser.shadow is not None
+    assert traverser.parser.shadow.checked == 6
+
+
+def test_fast_path_skips_unknown_events_without_decoding():
+    decoded = []
+    _, loads = get_decoder()
+
+    def decode(line):
+        decoded.append(line)
+        return loads(line)
+
+    parser = JournalEventParser("fast", ShadowVerifier(0))
+    music = '{ "timestamp":"2025-02-14T09:00:01Z", "event":"Music", "Track":"x" }'
+    assert parser.parse_line(music, decode) is None
+    assert parser.parse_line(music.encode(), decode) is None
+    assert decoded == []
+
+
+def test_shadow_reports_mismatches_and_keeps_the_reference():
+    reported = []
+    parser = JournalEventParser("fast", ShadowVerifier(1, report=reported.append))
+    _, decode = get_decoder()
+    # An "event" key nested before the real one fools the fast path
+    line = json.dumps(
+        {"Inner": {"event": "Music"}}
+        | make_buy("2025-02-14T09:03:00Z", 5, "fish", 20, 100)
+    )
+
+    event = parser.parse_line(line, decode)
+
+    assert isinstance(event, MarketBuyEvent)
+    [mismatch] = reported
+    assert (mismatch.line, mismatch.event, mismatch.field) == (
+        line,
+        "MarketBuy",
+        "event",
+    )
+    assert (mismatch.fast, mismatch.reference) == ("None", "MarketBuyEvent")
+    assert parser.shadow is not None and parser.shadow.mismatched == 1
+
+
+def test_compare_events_field_by_field():
+    at = datetime(2025, 2, 14, 9, 3, tzinfo=timezone.utc)
+    fast = make_buy_event(at, count=20)
+    reference = make_buy_event(at, count=21)
+
+    assert compare_events(fast, fast) == []
+    assert compare_events(fast, reference) == [("count", 20, 21)]
+    assert compare_events(None, None) == []
+
+
+def test_sample_sets_the_share_of_lines_checked():
+    verifier = ShadowVerifier(0.1, report=fail, seed=1)
+    assert 800 <= sum(verifier.sampled() for _ in range(10000)) <= 1200
+    assert not any(ShadowVerifier(0).sampled() for _ in range(1000))
+    assert all(ShadowVerifier(1).sampled() for _ in range(1000))
+    with pytest.raises(ValueError):
+        ShadowVerifier(2)
+
+
+def test_configured_through_the_environment(monkeypatch):
+    monkeypatch.setenv("TRADEMEDS_PARSER", "fast")
+    monkeypatch.setenv("TRADEMEDS_SHADOW_SAMPLE", "0.25")
+    parser = JournalEventParser()
+    assert parser.mode == "fast"
+    assert parser.shadow is not None and parser.shadow.sample == 0.25
+
+    monkeypatch.setenv("TRADEMEDS_PARSER", "quick")
+    with pytest.raises(ValueError):
+        JournalEventParser()
+
+
+# Test helpers
+def fail(mismatch):
+    raise AssertionError(f"unexpected mismatch: {mismatch}")
+
+
+def make_buy_event(at: datetime, count: int):
+    return MarketBuyEvent.model_construct(
+        timestamp=at,
+        event="MarketBuy",
+        market_id=5,
+        type="fish",
+        type_localised=None,
+        count=count,
+        buy_price=100,
+        total_cost=2000,
+    )
@@ -0,0 +1,67 @@
+import json
+import os
+from trademeds.journal.status import StatusFile
+
+
+def test_rereads_only_when_the_file_changes(tmp_path):
+    path = tmp_path / "Cargo.json"
+    write_status(path, {"Count": 1}, mtime_ns=1_000)
+    status = StatusFile(str(path))
+    reads = record_decodes(status)
+
+    assert status.poll()
+    assert status.data == {"Count": 1}
+    assert not status.poll()
+    assert not status.poll()
+    assert len(reads) == 1
+
+    write_status(path, {"Count": 2}, mtime_ns=2_000)
+    assert status.poll()
+    assert status.data == {"Count": 2}
+    assert len(reads) == 2
+
+
+def test_half_written_file_is_read_again_later(tmp_path):
+    path = tmp_path / "Cargo.json"
+    write_status(path, {"Count": 1}, mtime_ns=1_000)
+    status = StatusFile(str(path))
+    status.poll()
+
+    path.write_text('{"Cou')
+    os.utime(path, ns=(2_000, 2_000))
+    assert not status.poll()
+    assert status.data == {"Count": 1}
+
+    write_status(path, {"Count": 2}, mtime_ns=3_000)
+    assert status.poll()
+    assert status.data == {"Count": 2}
+
+
+def test_missing_file_has_no_data(tmp_path):
+    path = tmp_path / "Market.json"
+    status = StatusFile(str(path))
+    assert not status.poll()
+
+    write_status(path, {"MarketID": 5}, mtime_ns=1_000)
+    assert status.poll()
+    path.unlink()
+    assert status.poll()
+    assert status.data is None
+
+
+# Test helpers
+def write_status(path, data, mtime_ns: int) -> None:
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def record_decodes(status: StatusFile) -> list[bytes]:
+    decodes: list[bytes] = []
+    decode = status.decode
+
+    def recording_decode(raw):
+        decodes.append(raw)
+        return decode(raw)
+
+    status.decode = recording_decode
+    return decodes
@@ -0,0 +1,38 @@
+import json
+from trademeds.journal.tail import JournalTail
+from ..helpers import make_load_game, make_sell, write_journal
+
+
+def test_returns_complete_lines_appended_since_last_poll(tmp_path):
+    live = tmp_path / "Journal.2025-02-14T090000.01.log"
+    write_journal(live, [make_load_game("2025-02-14T09:00:00Z")])
+    tail = JournalTail(str(tmp_path))
+    tail.seek_end()
+    assert tail.poll() == []
+
+    line = json.dumps(make_sell("2025-02-14T09:01:00Z", 3))
+    with open(live, "a") as f:
+        f.write(line[:20])
+    assert tail.poll() == []
+
+    with open(live, "a") as f:
+        f.write(line[20:] + "\n")
+    [event] = tail.poll()
+    assert event.event == "MarketSell"
+    assert tail.poll() == []
+
+
+def test_finishes_old_journal_before_following_new_one(tmp_path):
+    old = tmp_path / "Journal.2025-02-14T090000.01.log"
+    write_journal(old, [make_load_game("2025-02-14T09:00:00Z")])
+    tail = JournalTail(str(tmp_path))
+    tail.seek_end()
+
+    with open(old, "a") as f:
+        f.write(json.dumps(make_sell("2025-02-14T09:01:00Z", 3)) + "\n")
+    write_journal(
+        tmp_path / "Journal.2025-02-14T100000.01.log",
+        [make_load_game("2025-02-14T10:00:00Z")],
+    )
+
+    assert [event.event for event in tail.poll()] == ["MarketSell", "LoadGame"]
@@ -0,0 +1,88 @@
+from trademeds.models.hold import parse_cargo, parse_market, reconcile
+from trademeds.observers.incomplete_cargo import IncompleteMission
+
+
+def test_hold_is_shared_out_over_missions_needing_it():
+    missions = {
+        1: make_mission(1, "Fish", 300, "Sudz"),
+        2: make_mission(2, "Fish", 300, "Aknandan"),
+        3: make_mission(3, "Gold", 50, "Sudz"),
+    }
+    items = parse_cargo(
+        {
+            "Vessel": "Ship",
+            "Inventory": [
+                {"Name": "fish", "Count": 400, "Stolen": 0},
+                {"Name": "gold", "Count": 20, "Stolen": 0, "MissionID": 3},
+                {"Name": "tea", "Name_Localised": "Tea", "Count": 8, "Stolen": 0},
+            ],
+        }
+    )
+
+    report = reconcile(items, missions)
+
+    assert [
+        (d.system, d.good, d.owed, d.loaded, d.short) for d in report.deliveries
+    ] == [
+        ("Aknandan", "Fish", 300, 300, 0),
+        ("Sudz", "Fish", 300, 100, 200),
+        ("Sudz", "Gold", 50, 20, 30),
+    ]
+    assert report.spare == {"Tea": 8}
+
+
+def test_market_names_spare_goods_and_offers_short_ones():
+    missions = {1: make_mission(1, "Fish", 300, "Sudz")}
+    items = parse_cargo(
+        {"Inventory": [{"Name": "beer", "Count": 4}, {"Name": "fish", "Count": 100}]}
+    )
+    market = parse_market(
+        {
+            "MarketID": 5,
+            "StationName": "Houssay Ring",
+            "StarSystem": "Sudz",
+            "StationType": "Orbis",
+            "Items": [
+                make_item("$fish_name;", "Fish", buy_price=120, stock=5_000),
+                make_item("$beer_name;", "Beer", buy_price=0, stock=0),
+            ],
+        }
+    )
+
+    report = reconcile(items, missions, market)
+
+    assert report.spare == {"Beer": 4}
+    assert report.market is not None and report.market.station_name == "Houssay Ring"
+    assert report.available["Fish"].stock == 5_000
+    assert report.available["Fish"].buy_price == 120
+
+
+def test_srv_cargo_is_not_the_ship_hold():
+    assert (
+        parse_cargo({"Vessel": "SRV", "Inventory": [{"Name": "gold", "Count": 2}]})
+        == []
+    )
+
+
+# Test helpers
+def make_mission(mission_id: int, good: str, count: int, system: str):
+    return IncompleteMission(
+        mission_id=mission_id,
+        good=good,
+        count=count,
+        faction="Sudz Jet Netcoms Industry",
+        system=system,
+        commodity=f"${good}_Name;",
+    )
+
+
+def make_item(name: str, localised: str, buy_price: int, stock: int):
+    return {
+        "id": 128049152,
+        "Name": name,
+        "Name_Localised": localised,
+        "BuyPrice": buy_price,
+        "SellPrice": 90,
+        "Stock": stock,
+        "Demand": 0,
+    }
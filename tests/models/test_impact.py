@@ -0,0 +1,93 @@
+from trademeds.models.entities import (
+    CargoMission,
+    DonationMission,
+    MissionFactionEffect,
+)
+from trademeds.models.impact import (
+    ImpactAggregate,
+    CargoMissionSummary,
+    DonationMissionSummary,
+)
+
+
+def test_aggregates_missions_by_faction_and_type():
+    aggregate = ImpactAggregate.from_missions(
+        [
+            make_cargo_mission(1, count=36),
+            make_cargo_mission(2, count=20),
+            make_donation_mission(3, donated=1000),
+        ]
+    )
+
+    cargo = aggregate.factions["VITALS"]["Mission_Delivery"]
+    assert isinstance(cargo, CargoMissionSummary)
+    assert cargo.count == 2
+    assert cargo.goods == {"Fish": 56}
+    assert cargo.effects == {"$EP_up;": 2}
+    assert cargo.aux_effects == {"Other": {"$SP_up;": 2}}
+    assert cargo.influence == 4
+    assert cargo.aux_influence == {"Other": 2}
+
+    donation = aggregate.factions["VITALS"]["Mission_AltruismCredits"]
+    assert isinstance(donation, DonationMissionSummary)
+    assert donation.donated == 1000
+
+
+def test_merge_matches_single_pass():
+    missions = [make_cargo_mission(i, count=i) for i in range(1, 6)]
+    missions.append(make_donation_mission(10, donated=500))
+
+    merged = ImpactAggregate.from_missions(missions[:3])
+    merged.merge(ImpactAggregate.from_missions(missions[3:]))
+
+    assert merged.to_dict() == ImpactAggregate.from_missions(missions).to_dict()
+
+
+def test_round_trips_through_dict():
+    aggregate = ImpactAggregate.from_missions(
+        [make_cargo_mission(1, count=36), make_donation_mission(2, donated=1000)]
+    )
+
+    restored = ImpactAggregate.from_dict(aggregate.to_dict())
+
+    assert restored.to_dict() == aggregate.to_dict()
+    assert isinstance(
+        restored.factions["VITALS"]["Mission_Delivery"], CargoMissionSummary
+    )
+
+
+# Test helpers
+def make_effects() -> list[MissionFactionEffect]:
+    return [
+        MissionFactionEffect(
+            faction="VITALS", effect="$EP_up;", effect_localised="", trend="UpGood"
+        ),
+        MissionFactionEffect(
+            faction="Other", effect="$SP_up;", effect_localised="", trend="UpGood"
+        ),
+    ]
+
+
+def make_cargo_mission(mission_id: int, count: int) -> CargoMission:
+    return CargoMission(
+        mission_id=mission_id,
+        title="Deliver Fish",
+        technical_name="Mission_Delivery",
+        faction="VITALS",
+        effects=make_effects(),
+        influence={"VITALS": 2, "Other": 1},
+        good="Fish",
+        count=count,
+        system="Sol",
+    )
+
+
+def make_donation_mission(mission_id: int, donated: int) -> DonationMission:
+    return DonationMission(
+        mission_id=mission_id,
+        title="Donate",
+        technical_name="Mission_AltruismCredits",
+        faction="VITALS",
+        influence={"VITALS": 1},
+        donated=donated,
+    )
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta, timezone
+from trademeds.models.throughput import RollingSum
+
+
+def test_rolling_sum_drops_values_older_than_the_window():
+    start = datetime(2025, 2, 14, 9, 0, tzinfo=timezone.utc)
+    rolling = RollingSum(timedelta(minutes=10), buckets=10)
+
+    rolling.add(start, 5)
+    rolling.add(start + timedelta(minutes=4), 7)
+    assert rolling.total() == 12
+
+    assert rolling.total(start + timedelta(minutes=10)) == 7
+    rolling.add(start + timedelta(minutes=12), 1)
+    assert rolling.total() == 8
+    assert rolling.total(start + timedelta(hours=2)) == 0
+
+
+def test_rolling_sum_ignores_values_before_the_window():
+    start = datetime(2025, 2, 14, 9, 0, tzinfo=timezone.utc)
+    rolling = RollingSum(timedelta(minutes=10), buckets=10)
+
+    rolling.add(start + timedelta(minutes=30), 3)
+    rolling.add(start, 100)
+
+    assert rolling.total() == 3
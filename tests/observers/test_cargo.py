@@ -0,0 +1,61 @@
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.observers.cargo import VitalsCargoSessionCollector
+from ..helpers import make_buy, make_load_game, make_market, make_sell, write_journal
+
+
+def test_sessions_count_bought_and_sold_goods(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-14T090000.01.log",
+        [
+            make_load_game("2025-02-14T09:00:00Z"),
+            make_buy("2025-02-14T09:01:00Z", 5, "fish", count=30, price=50),
+            make_buy("2025-02-14T09:02:00Z", 5, "fish", count=20, price=50),
+            make_sell("2025-02-14T09:30:00Z", 50, market_id=6),
+        ],
+    )
+
+    traverser = JournalEventTraverser(str(journals))
+    collector = VitalsCargoSessionCollector()
+    traverser.add_observer(collector)
+    traverser.traverse()
+
+    [session] = collector.sessions
+    assert session.bought == {5: {"fish": 50}}
+    assert session.sold == {6: {"fish": 50}}
+
+
+def test_batched_and_single_events_build_the_same_sessions(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-14T090000.01.log",
+        [
+            make_load_game("2025-02-14T09:00:00Z"),
+            make_market("2025-02-14T09:00:30Z"),
+            make_buy("2025-02-14T09:01:00Z", 5, "fish", count=30, price=50),
+            make_sell("2025-02-14T09:30:00Z", 30, market_id=6),
+            make_load_game("2025-02-14T10:00:00Z"),
+            make_buy("2025-02-14T10:01:00Z", 5, "tea", count=10, price=50),
+            make_sell("2025-02-14T10:30:00Z", 10, market_id=6, good="tea"),
+        ],
+    )
+    events = list(
+        JournalEventTraverser(str(journals)).read_events(
+            "Journal.2025-02-14T090000.01.log"
+        )
+    )
+
+    single, batched = VitalsCargoSessionCollector(), VitalsCargoSessionCollector()
+    for event in events:
+        single.handle_event(event)
+    batched.handle_events(events[:2])
+    batched.handle_events(events[2:])
+
+    assert batched.sessions == single.sessions
+    assert [session.sold for session in batched.sessions] == [
+        {6: {"tea": 10}},
+        {6: {"fish": 30}},
+    ]
+    assert batched.markets == single.markets
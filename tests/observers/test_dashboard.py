@@ -0,0 +1,64 @@
+from datetime import datetime, timezone
+from trademeds.journal.parser import JournalEventParser
+from trademeds.observers.dashboard import DashboardState
+from trademeds.observers.incomplete_cargo import IncompleteMission
+from ..helpers import (
+    make_depot,
+    make_load_game,
+    make_market,
+    make_mission_accepted,
+    make_sell,
+)
+
+
+def test_events_only_touch_their_panels():
+    state = DashboardState({}, None, {})
+
+    assert state.handle_event(parse(make_market("2025-02-14T09:00:00Z"))) == set()
+    assert state.handle_event(parse(make_sell("2025-02-14T09:01:00Z", 3))) == {
+        "sales",
+        "throughput",
+    }
+    assert state.handle_event(
+        parse(make_mission_accepted("2025-02-14T09:02:00Z", 7))
+    ) == {"cargo"}
+    assert state.sold == {5: {"fish": 3}}
+    assert state.pending[7].count == 20
+
+
+def test_deliveries_update_pending_cargo():
+    mission = IncompleteMission(
+        mission_id=7, good="Fish", count=20, faction="Sudz", system="Sudz"
+    )
+    state = DashboardState({}, None, {7: mission})
+
+    state.handle_event(parse(make_depot("2025-02-14T09:00:00Z", 7, delivered=15)))
+    assert state.pending[7].count == 5
+    state.handle_event(parse(make_depot("2025-02-14T09:05:00Z", 7, delivered=20)))
+    assert state.pending == {}
+
+
+def test_new_session_resets_session_totals():
+    state = DashboardState({}, None, {})
+    state.handle_event(parse(make_sell("2025-02-14T09:01:00Z", 3)))
+
+    touched = state.handle_event(parse(make_load_game("2025-02-14T10:00:00Z")))
+
+    assert touched == {"sales", "missions", "cargo", "throughput"}
+    assert state.sold == {}
+
+
+def test_warns_once_about_missions_about_to_expire():
+    state = DashboardState({}, None, {})
+    state.handle_event(parse(make_mission_accepted("2025-02-14T09:00:00Z", 7)))
+
+    # The helper's missions expire on 2025-03-01
+    assert not state.check_expiries(datetime(2025, 2, 28, 23, 0, tzinfo=timezone.utc))
+    assert state.check_expiries(datetime(2025, 2, 28, 23, 50, tzinfo=timezone.utc))
+    assert list(state.notices) == ["Fish for Sudz expires in 10 min"]
+    assert not state.check_expiries(datetime(2025, 2, 28, 23, 55, tzinfo=timezone.utc))
+
+
+# Test helpers
+def parse(raw_event):
+    return JournalEventParser().parse(raw_event)
@@ -1,5 +1,9 @@
 from datetime import datetime, timezone
-from trademeds.observers.incomplete_cargo import IncompleteCargoTracker
+from trademeds.observers.incomplete_cargo import (
+    ExpiryQueue,
+    IncompleteCargoTracker,
+    IncompleteMission,
+)
 from trademeds.journal.events import (
     MissionAcceptedEvent,
     MissionCompletedEvent,
@@ -104,7 +108,75 @@ def test_respects_session_depth():
     assert len(tracker.missions) == 2  # Still 2, because session 1 is too old
 
 
+def test_batches_track_like_single_events():
+    events = [
+        make_cargo_depot(123, 40, 100),
+        make_mission_accepted(123),
+        make_mission_completed(124),
+        make_load_game(),
+        make_mission_accepted(124, good="Silver", count=50),
+        make_mission_accepted(125, good="Platinum", count=75),
+        make_load_game(),
+        make_mission_accepted(126),
+    ]
+    single, batched = IncompleteCargoTracker(depth=2), IncompleteCargoTracker(depth=2)
+    for event in events:
+        single.handle_event(event)
+    batched.handle_events(events[:3])
+    batched.handle_events(events[3:])
+
+    assert batched.missions == single.missions
+    assert set(batched.missions) == {123, 125}
+    assert batched.missions[123].count == 60
+    assert batched.snapshot() == single.snapshot()
+
+
+def test_tracker_lists_missions_expiring_soon():
+    tracker = IncompleteCargoTracker(depth=2)
+    tracker.handle_event(make_mission_accepted(123, expiry=at(3)))
+    tracker.handle_event(make_mission_accepted(124, expiry=at(1)))
+    tracker.handle_event(make_mission_accepted(125, expiry=at(9)))
+    tracker.handle_event(make_mission_completed(125))
+
+    due = tracker.expiries.due(tracker.missions, at(5))
+
+    assert [mission.mission_id for mission in due] == [124, 123]
+    assert tracker.missions[124].expiry == at(1)
+
+
+def test_expiry_queue_skips_missions_no_longer_pending():
+    pending = {
+        mission_id: make_mission(mission_id, at(day))
+        for mission_id, day in [(1, 4), (2, 2), (3, 6), (4, 1), (5, 3)]
+    }
+    queue = ExpiryQueue(pending.values())
+    del pending[2]
+    pending[5] = make_mission(5, at(8))  # accepted again, with a later expiry
+    queue.push(pending[5], pending)
+
+    assert [m.mission_id for m in queue.due(pending, at(5))] == [4, 1]
+    assert [m.mission_id for m in queue.due(pending, at(28))] == [4, 1, 3, 5]
+    # Listing doesn't take missions out of the queue, popping does
+    assert [m.mission_id for m in queue.pop_due(pending, at(5))] == [4, 1]
+    assert [m.mission_id for m in queue.due(pending, at(28))] == [3, 5]
+
+
 # Test helpers
+def at(day: int):
+    return datetime(2025, 2, day, tzinfo=timezone.utc)
+
+
+def make_mission(mission_id: int, expiry: datetime):
+    return IncompleteMission(
+        mission_id=mission_id,
+        good="Gold",
+        count=10,
+        faction="Federation",
+        system="Sol",
+        expiry=expiry,
+    )
+
+
 def make_load_game():
     return LoadGameEvent.model_construct(
         timestamp=datetime.now(timezone.utc),
@@ -112,9 +184,15 @@ def make_load_game():
     )
 
 
-def make_mission_accepted(mission_id: int, good: str = "Gold", count: int = 100):
+def make_mission_accepted(
+    mission_id: int,
+    good: str = "Gold",
+    count: int = 100,
+    expiry: datetime = datetime(2025, 2, 21, tzinfo=timezone.utc),
+):
     return MissionAcceptedEvent.model_construct(
         timestamp=datetime.now(timezone.utc),
+        expiry=expiry,
         event="MissionAccepted",
         mission_id=mission_id,
         name="some_mission",
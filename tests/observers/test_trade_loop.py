@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+from trademeds.journal.parser import JournalEventParser
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.observers.trade_loop import TradeLoopCollector, TradeLoopTracker
+from ..helpers import (
+    make_buy,
+    make_depot,
+    make_load_game,
+    make_sell,
+    write_journal,
+)
+
+
+def test_pairs_bought_cargo_with_sales_and_deliveries():
+    tracker = TradeLoopTracker()
+    for event in make_loop("2025-02-14T09"):
+        tracker.handle_event(parse(event))
+
+    rates = tracker.summary(at("2025-02-14T09:00:00Z"), at("2025-02-14T10:00:00Z"))
+    assert rates.tons == 100
+    # 60 t sold at a 30 cr margin, 40 t delivered at cost, then the reward
+    assert rates.credits == 60 * 30 - 40 * 50 + 10_000
+    assert rates.loops == 1
+    assert rates.loop_time == timedelta(minutes=20)
+    assert rates.tons_per_hour == 100
+
+
+def test_rolling_rates_only_count_the_window():
+    tracker = TradeLoopTracker(windows=[timedelta(minutes=15), timedelta(hours=1)])
+    for event in make_loop("2025-02-14T09"):
+        tracker.handle_event(parse(event))
+
+    short, hour = tracker.rates(at("2025-02-14T09:30:00Z"))
+
+    assert (short.tons, short.credits, short.loops) == (40, 10_000 - 40 * 50, 1)
+    assert short.tons_per_hour == 160
+    assert hour.duration == timedelta(minutes=30)  # since the first event
+    assert hour.tons == 100
+    assert tracker.rates(at("2025-02-14T12:00:00Z"))[1].tons == 0
+
+
+def test_collects_throughput_per_session(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-14T085900.01.log",
+        [make_load_game("2025-02-14T08:59:00Z")]
+        + make_loop("2025-02-14T09")
+        + [make_load_game("2025-02-14T10:59:00Z")]
+        + make_loop("2025-02-14T11")[:2],
+    )
+
+    traverser = JournalEventTraverser(str(journals))
+    collector = TradeLoopCollector()
+    traverser.add_observer(collector)
+    traverser.traverse()
+
+    live, older = collector.sessions
+    assert (live.rates.tons, live.rates.loops) == (60, 0)
+    assert (older.rates.tons, older.rates.loops) == (100, 1)
+    assert older.ended_at == at("2025-02-14T09:21:00Z")
+    assert collector.live is not None and collector.live.hold == 40
+
+
+# Test helpers
+def make_loop(hour: str):
+    return [
+        make_buy(f"{hour}:00:00Z", 5, "fish", count=100, price=50),
+        make_sell(f"{hour}:10:00Z", 60, market_id=6, price=80, paid=50),
+        make_depot(f"{hour}:20:00Z", 1, delivered=40, total=40),
+        make_mission_completed(f"{hour}:21:00Z", reward=10_000),
+    ]
+
+
+def make_mission_completed(timestamp: str, reward: int):
+    return {
+        "timestamp": timestamp,
+        "event": "MissionCompleted",
+        "Faction": "Sudz Jet Netcoms Industry",
+        "Name": "Mission_Delivery",
+        "LocalisedName": "Deliver Fish",
+        "MissionID": 1,
+        "Commodity": "$Fish_Name;",
+        "Commodity_Localised": "Fish",
+        "Count": 40,
+        "DestinationSystem": "Sudz",
+        "Reward": reward,
+        "FactionEffects": [],
+    }
+
+
+def parse(raw_event):
+    return JournalEventParser().parse(raw_event)
+
+
+def at(timestamp: str):
+    return datetime.fromisoformat(timestamp)
@@ -0,0 +1,172 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+import pytest
+from trademeds.journal.parser import JournalEventParser
+from trademeds.observers.dashboard import DashboardState
+from trademeds.overlay import LiveState, PendingEntry, StateReader
+from trademeds.overlay.layout import HEADER, VERSION, unpack_state
+from trademeds.overlay.publisher import StatePublisher, live_state
+from ..helpers import make_load_game, make_mission_accepted, make_sell
+
+
+def test_reads_what_was_published(segment):
+    state = make_state(3, faction="Sudz Jet Netcoms Industry " * 3 + "Ü")
+    with StatePublisher(segment) as publisher:
+        publisher.publish(state)
+        published = unpack_state(publisher.buffer)
+
+    assert published.seq == 2
+    assert published.pending[0].faction == state.pending[0].faction[:44]
+    assert published.pending[1].expiry is None
+    assert published == LiveState(
+        **(vars(state) | {"pending": published.pending, "seq": 2})
+    )
+
+
+def test_other_process_reads_every_update(segment):
+    with StatePublisher(segment) as publisher:
+        # A new reader each time, so the first one exiting mustn't remove it
+        for sold in (10, 20):
+            publisher.publish(make_state(sold))
+            output = run_python(READER, segment)
+            assert json.loads(output.stdout) == {"sold": sold, "pydantic": False}
+
+
+def test_reads_are_never_torn(segment):
+    writer = start_python(WRITER, segment, "2000")
+    try:
+        assert writer.stdout.readline() == "ready\n"
+        with StateReader(segment) as reader:
+            seen = set()
+            while 2000 not in seen:
+                state = reader.read()
+                assert state.seq % 2 == 0
+                assert state.missions == state.influence == state.sold
+                assert [entry.tons for entry in state.pending] == [state.sold, 0]
+                seen.add(state.sold)
+        assert len(seen) > 1
+    finally:
+        writer.stdin.close()
+        writer.wait(timeout=30)
+
+
+def test_refuses_other_layout_versions(segment):
+    with StatePublisher(segment) as publisher:
+        publisher.publish(make_state(1))
+        HEADER.pack_into(publisher.buffer, 0, b"TMDS", VERSION + 1, *([0] * 13))
+        with pytest.raises(ValueError, match="version"):
+            unpack_state(publisher.buffer)
+
+
+def test_live_state_of_the_dashboard():
+    parser = JournalEventParser()
+    state = DashboardState({}, None, {})
+    for raw_event in (
+        make_load_game("2025-02-14T09:00:00Z"),
+        make_sell("2025-02-14T09:01:00Z", 3),
+        make_mission_accepted("2025-02-14T09:02:00Z", 8, count=5),
+        make_mission_accepted("2025-02-14T09:03:00Z", 7, commodity="Tea"),
+    ):
+        state.handle_event(parser.parse(raw_event))
+
+    live = live_state(state, datetime(2025, 2, 14, 10, tzinfo=timezone.utc))
+
+    assert live.started_at == datetime(2025, 2, 14, 9, tzinfo=timezone.utc)
+    assert (live.sold, live.pending_tons, live.pending_missions) == (3, 25, 2)
+    # Same expiry, so by mission id
+    assert [(entry.mission_id, entry.good) for entry in live.pending] == [
+        (7, "Tea"),
+        (8, "Fish"),
+    ]
+
+
+# Test helpers
+# Scripts run from here, other processes import the package like an overlay
+ROOT = Path(__file__).parents[2]
+
+
+@pytest.fixture
+def segment():
+    return f"trademeds-test-{os.getpid()}"
+
+
+def make_state(sold: int, faction: str = "Sudz"):
+    at = datetime(2025, 2, 14, 9, tzinfo=timezone.utc)
+    return LiveState(
+        published_at=at,
+        started_at=at,
+        tons_per_hour=sold * 1.5,
+        sold=sold,
+        missions=sold,
+        influence=sold,
+        pending_tons=sold,
+        pending_missions=2,
+        pending=[
+            PendingEntry(
+                mission_id=1,
+                good="Fish",
+                tons=sold,
+                system="Sudz",
+                faction=faction,
+                expiry=datetime(2025, 2, 21, tzinfo=timezone.utc),
+            ),
+            PendingEntry(
+                mission_id=2,
+                good="Tea",
+                tons=0,
+                system="Sol",
+                faction=faction,
+                expiry=None,
+            ),
+        ],
+    )
+
+
+READER = """
+import json, sys
+from trademeds.overlay import read_state
+
+state = read_state(sys.argv[1])
+print(json.dumps({"sold": state.sold, "pydantic": "pydantic" in sys.modules}))
+"""
+
+# Publishes states whose totals all match, with pauses like a real publisher
+# has, then keeps the segment until its stdin is closed
+WRITER = """
+import sys, time
+from tests.overlay.test_publisher import make_state
+from trademeds.overlay.publisher import StatePublisher
+
+with StatePublisher(sys.argv[1]) as publisher:
+    for sold in range(int(sys.argv[2]) + 1):
+        publisher.publish(make_state(sold))
+        if sold == 0:
+            print("ready", flush=True)
+        time.sleep(0.0001)
+    sys.stdin.read()
+"""
+
+
+def run_python(script: str, *args: str):
+    return subprocess.run(
+        [sys.executable, "-c", script, *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+    )
+
+
+def start_python(script: str, *args: str):
+    return subprocess.Popen(
+        [sys.executable, "-c", script, *args],
+        cwd=ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
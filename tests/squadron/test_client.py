@@ -0,0 +1,59 @@
+import asyncio
+import json
+from trademeds.squadron.client import JournalPusher
+from ..helpers import make_load_game, make_sell, run_ingest_server, write_journal
+
+
+def test_pushes_known_events_of_changed_journals(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-14T090000.01.log",
+        [
+            make_load_game("2025-02-14T09:00:00Z") | {"Commander": "Ann"},
+            {"timestamp": "2025-02-14T09:01:00Z", "event": "Music"},
+            make_sell("2025-02-14T09:02:00Z", 3),
+        ],
+    )
+    live = journals / "Journal.2025-02-15T090000.01.log"
+    write_journal(live, [make_load_game("2025-02-15T09:00:00Z")])
+
+    async def scenario(url):
+        pusher = JournalPusher(str(journals), url, str(tmp_path / "push.json"))
+        assert pusher.commander() == "Ann"
+        first = await asyncio.to_thread(pusher.push, "CMDR Ann")
+
+        with open(live, "a") as f:
+            f.write(json.dumps(make_sell("2025-02-15T09:02:00Z", 4)) + "\n")
+        second = await asyncio.to_thread(pusher.push, "CMDR Ann")
+        return first, second
+
+    first, second = run_ingest_server(tmp_path / "server", scenario)
+
+    assert first == {"accepted": 3, "duplicates": 0, "ignored": 0, "rejected": 0}
+    # Only the live journal is sent again
+    assert second == {"accepted": 1, "duplicates": 1, "ignored": 0, "rejected": 0}
+
+
+def test_half_written_last_line_waits_for_the_next_push(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    live = journals / "Journal.2025-02-15T090000.01.log"
+    write_journal(live, [make_load_game("2025-02-15T09:00:00Z")])
+    sale = json.dumps(make_sell("2025-02-15T09:02:00Z", 4)) + "\n"
+    with open(live, "a") as f:
+        f.write(sale[:20])
+
+    async def scenario(url):
+        pusher = JournalPusher(str(journals), url, str(tmp_path / "push.json"))
+        first = await asyncio.to_thread(pusher.push, "CMDR Ann")
+
+        with open(live, "a") as f:
+            f.write(sale[20:])
+        second = await asyncio.to_thread(pusher.push, "CMDR Ann")
+        return first, second
+
+    first, second = run_ingest_server(tmp_path / "server", scenario)
+
+    assert first == {"accepted": 1, "duplicates": 0, "ignored": 0, "rejected": 0}
+    assert second == {"accepted": 1, "duplicates": 1, "ignored": 0, "rejected": 0}
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import urllib.error
+import urllib.request
+import pytest
+from trademeds.squadron.client import post_batch
+from ..helpers import (
+    make_depot,
+    make_load_game,
+    make_market,
+    make_mission_accepted,
+    make_sell,
+    run_ingest_server,
+)
+
+
+def test_uploads_are_deduplicated_per_commander(tmp_path):
+    lines = make_lines()
+
+    async def scenario(url):
+        first = await asyncio.to_thread(post_batch, url, "CMDR Ann", lines)
+        again = await asyncio.to_thread(post_batch, url, "CMDR Ann", lines[1:])
+        other = await asyncio.to_thread(post_batch, url, "CMDR Bob", lines)
+        return first, again, other
+
+    first, again, other = run_ingest_server(tmp_path, scenario)
+
+    assert first == {"accepted": 5, "duplicates": 0, "ignored": 1, "rejected": 1}
+    assert again["accepted"] == 0 and again["duplicates"] == 4
+    assert other["accepted"] == 5
+
+
+def test_concurrent_uploads_log_each_event_once(tmp_path):
+    batches = [
+        [json.dumps(make_sell(f"2025-02-14T09:{minute:02}:00Z", count))]
+        for minute in range(10)
+        for count in range(1, 6)
+    ]
+
+    async def scenario(url):
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(post_batch, url, "CMDR Ann", batch)
+                for batch in batches + batches
+            )
+        )
+        return sum(result["accepted"] for result in results)
+
+    assert run_ingest_server(tmp_path, scenario) == 50
+    with open(tmp_path / "ingest.wal", "rb") as f:
+        assert len(f.readlines()) == 50
+
+
+def test_reports_survive_a_restart(tmp_path):
+    async def upload(url):
+        await asyncio.to_thread(post_batch, url, "CMDR Ann", make_lines())
+        return await get(url, "/pending-cargo"), await get(url, "/sessions")
+
+    pending, sessions = run_ingest_server(tmp_path, upload)
+
+    async def report(url):
+        return await get(url, "/pending-cargo"), await get(url, "/sessions")
+
+    assert run_ingest_server(tmp_path, report) == (pending, sessions)
+    assert [(r["system"], r["good"], r["count"]) for r in pending] == [
+        ("Sudz", "Fish", 5)
+    ]
+    assert sessions[0]["commander"] == "CMDR Ann"
+    assert sessions[0]["sold"][0]["goods"] == {"fish": 3}
+
+
+def test_bad_requests(tmp_path):
+    async def scenario(url):
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            request = urllib.request.Request(url + "/ingest", data=b"{}", method="POST")
+            await asyncio.to_thread(urllib.request.urlopen, request)
+        with pytest.raises(urllib.error.HTTPError) as unknown:
+            await asyncio.to_thread(urllib.request.urlopen, url + "/nowhere")
+        return missing.value.code, unknown.value.code
+
+    assert run_ingest_server(tmp_path, scenario) == (400, 404)
+
+
+# Test helpers
+def make_lines() -> list[str]:
+    events = [
+        make_load_game("2025-02-14T09:00:00Z"),
+        make_market("2025-02-14T09:01:00Z"),
+        make_mission_accepted("2025-02-14T09:02:00Z", 7),
+        make_sell("2025-02-14T09:03:00Z", 3),
+        {"timestamp": "2025-02-14T09:04:00Z", "event": "Music", "MusicTrack": "x"},
+        make_depot("2025-02-14T09:05:00Z", 7, delivered=15),
+    ]
+    return [json.dumps(event) for event in events] + ["{not json"]
+
+
+async def get(url: str, path: str) -> list[dict]:
+    def read():
+        with urllib.request.urlopen(url + path) as response:
+            return [json.loads(line) for line in response]
+
+    return await asyncio.to_thread(read)
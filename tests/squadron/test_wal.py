@@ -0,0 +1,35 @@
+from trademeds.squadron.wal import WriteAheadLog
+
+
+def test_replays_entries_in_order(tmp_path):
+    wal = WriteAheadLog(str(tmp_path / "ingest.wal"))
+    wal.append([("CMDR Ann", b'{"event":"LoadGame"}'), ("CMDR \t Bob", b"{}")])
+    wal.append([("CMDR Ann", b'{"event":"Market"}')])
+    wal.close()
+
+    wal = WriteAheadLog(str(tmp_path / "ingest.wal"))
+    assert list(wal.replay()) == [
+        ("CMDR Ann", b'{"event":"LoadGame"}'),
+        ("CMDR \t Bob", b"{}"),
+        ("CMDR Ann", b'{"event":"Market"}'),
+    ]
+    assert wal.entries == 3
+
+
+def test_torn_last_entry_is_cut_off(tmp_path):
+    path = tmp_path / "ingest.wal"
+    wal = WriteAheadLog(str(path))
+    wal.append([("CMDR Ann", b'{"event":"LoadGame"}')])
+    wal.close()
+    with open(path, "ab") as f:
+        f.write(b'"CMDR Ann"\t{"eve')
+
+    wal = WriteAheadLog(str(path))
+    assert list(wal.replay()) == [("CMDR Ann", b'{"event":"LoadGame"}')]
+    wal.append([("CMDR Ann", b'{"event":"Market"}')])
+    wal.close()
+
+    assert [line for _, line in WriteAheadLog(str(path)).replay()] == [
+        b'{"event":"LoadGame"}',
+        b'{"event":"Market"}',
+    ]
@@ -0,0 +1,103 @@
+import json
+import os
+from datetime import date
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.store.influence import InfluenceIndex
+from ..helpers import write_journal
+
+
+def test_query_totals_by_system_and_date(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-14T180000.01.log",
+        [
+            make_jump("2025-02-14T18:01:00Z", "Aknandan", 1),
+            make_completed("2025-02-14T18:05:00Z", [(1, "UpGood", "++")]),
+        ],
+    )
+    write_journal(
+        journals / "Journal.2025-02-16T090000.01.log",
+        [
+            make_jump("2025-02-16T09:01:00Z", "Sudz", 2),
+            make_completed(
+                "2025-02-16T09:05:00Z", [(1, "UpGood", "+++"), (2, "UpGood", "+")]
+            ),
+            make_completed("2025-02-16T09:06:00Z", [(2, "DownBad", "+")]),
+        ],
+    )
+
+    index = InfluenceIndex(str(tmp_path / "cache" / "influence.sqlite3"))
+    assert index.update(JournalEventTraverser(str(journals))) == 2
+
+    totals = {row.system: row for row in index.query("VITALS")}
+    assert totals["Aknandan"].pluses == 5
+    assert totals["Aknandan"].missions == 2
+    assert totals["Sudz"].pluses == 0
+    assert totals["Sudz"].missions == 2
+
+    [since] = index.query("VITALS", system="Aknandan", since=date(2025, 2, 15))
+    assert since.pluses == 3
+
+    assert index.query("Someone else") == []
+    index.close()
+
+
+def test_update_reindexes_only_changed_journals(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    old = journals / "Journal.2025-02-14T180000.01.log"
+    live = journals / "Journal.2025-02-16T090000.01.log"
+    write_journal(old, [make_completed("2025-02-14T18:05:00Z", [(1, "UpGood", "+")])])
+    write_journal(live, [make_completed("2025-02-16T09:05:00Z", [(1, "UpGood", "+")])])
+
+    traverser = JournalEventTraverser(str(journals))
+    index = InfluenceIndex(str(tmp_path / "influence.sqlite3"))
+    assert index.update(traverser) == 2
+    assert index.update(traverser) == 0
+
+    with open(live, "a") as f:
+        f.write(
+            json.dumps(make_completed("2025-02-16T09:07:00Z", [(1, "UpGood", "++")]))
+            + "\n"
+        )
+    os.utime(live, ns=(0, os.stat(live).st_mtime_ns + 1))
+
+    assert index.update(traverser) == 1
+    [total] = index.query("VITALS")
+    assert total.pluses == 4
+    assert total.missions == 3
+    index.close()
+
+
+# Test helpers
+def make_jump(timestamp: str, system: str, address: int):
+    return {
+        "timestamp": timestamp,
+        "event": "FSDJump",
+        "StarSystem": system,
+        "SystemAddress": address,
+    }
+
+
+def make_completed(timestamp: str, influence: list[tuple[int, str, str]]):
+    return {
+        "timestamp": timestamp,
+        "event": "MissionCompleted",
+        "Faction": "VITALS",
+        "Name": "Mission_Delivery_name",
+        "LocalisedName": "Deliver",
+        "MissionID": 1,
+        "FactionEffects": [
+            {
+                "Faction": "VITALS",
+                "Effects": [],
+                "Influence": [
+                    {"SystemAddress": address, "Trend": trend, "Influence": pluses}
+                    for address, trend, pluses in influence
+                ],
+                "ReputationTrend": "UpGood",
+                "Reputation": "+",
+            }
+        ],
+    }
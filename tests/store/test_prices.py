@@ -0,0 +1,98 @@
+import json
+import os
+from datetime import datetime, timezone
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.store.prices import PriceIndex
+from ..helpers import make_buy, make_load_game, make_market, write_journal
+
+
+def test_sources_fold_journals_cheapest_first(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-14T180000.01.log",
+        [
+            make_market("2025-02-14T18:00:00Z", market_id=1, station="Cheap Port"),
+            make_buy("2025-02-14T18:01:00Z", 1, "$Fish_Name;", 100, 90),
+            make_buy("2025-02-14T18:02:00Z", 1, "fish", 50, 120),
+            make_market("2025-02-14T18:30:00Z", market_id=2, station="Dear Port"),
+            make_buy("2025-02-14T18:31:00Z", 2, "fish", 10, 150),
+        ],
+    )
+    write_journal(
+        journals / "Journal.2025-02-16T090000.01.log",
+        [
+            make_buy("2025-02-16T09:01:00Z", 1, "fish", 20, 110),
+            make_buy("2025-02-16T09:02:00Z", 2, "Fish", 30, 105),
+            make_buy("2025-02-16T09:03:00Z", 2, "gold", 1, 9000),
+        ],
+    )
+
+    index = PriceIndex(str(tmp_path / "cache" / "prices.sqlite3"))
+    assert index.update(JournalEventTraverser(str(journals))) == 2
+
+    dear, cheap = index.sources("fish")
+    assert dear.market is not None and dear.market.station_name == "Dear Port"
+    assert (dear.last_price, dear.best_price, dear.bought) == (105, 105, 40)
+    assert dear.last_at == datetime(2025, 2, 16, 9, 2, tzinfo=timezone.utc)
+    assert cheap.market is not None and cheap.market.station_name == "Cheap Port"
+    assert (cheap.last_price, cheap.best_price, cheap.bought) == (110, 90, 170)
+    assert cheap.best_at == datetime(2025, 2, 14, 18, 1, tzinfo=timezone.utc)
+
+    assert index.suggest(["fish", "gold", "tea"]).keys() == {"fish", "gold"}
+    assert index.suggest(["fish"])["fish"] == dear
+    assert index.sources("tea") == []
+    index.close()
+
+
+def test_update_reindexes_only_changed_journals(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    old = journals / "Journal.2025-02-14T180000.01.log"
+    live = journals / "Journal.2025-02-16T090000.01.log"
+    write_journal(old, [make_buy("2025-02-14T18:01:00Z", 1, "fish", 10, 100)])
+    write_journal(live, [make_buy("2025-02-16T09:01:00Z", 1, "fish", 10, 120)])
+
+    traverser = JournalEventTraverser(str(journals))
+    index = PriceIndex(str(tmp_path / "prices.sqlite3"))
+    assert index.update(traverser) == 2
+    assert index.update(traverser) == 0
+
+    with open(live, "a") as f:
+        f.write(json.dumps(make_buy("2025-02-16T09:05:00Z", 1, "fish", 5, 80)) + "\n")
+    os.utime(live, ns=(0, os.stat(live).st_mtime_ns + 1))
+
+    assert index.update(traverser) == 1
+    [source] = index.sources("fish")
+    assert (source.last_price, source.best_price, source.bought) == (80, 80, 25)
+    assert source.market is None
+    index.close()
+
+
+def test_update_drops_journals_no_longer_listed(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    old = journals / "Journal.2025-02-14T180000.01.log"
+    write_journal(old, [make_buy("2025-02-14T18:01:00Z", 1, "fish", 10, 100)])
+    write_journal(
+        journals / "Journal.2025-02-16T090000.01.log",
+        [
+            make_load_game("2025-02-16T09:00:00Z"),
+            make_buy("2025-02-16T09:01:00Z", 2, "fish", 10, 120),
+        ],
+    )
+
+    traverser = JournalEventTraverser(str(journals))
+    decoded: list[str] = []
+    decode = traverser.decode
+    traverser.decode = lambda line: decoded.append(line) or decode(line)
+    index = PriceIndex(str(tmp_path / "prices.sqlite3"))
+    assert index.update(traverser) == 2
+    assert len(decoded) == 2  # not the LoadGame
+    assert [source.market_id for source in index.sources("fish")] == [1, 2]
+
+    old.unlink()
+    assert index.update(traverser) == 0
+    assert [source.market_id for source in index.sources("fish")] == [2]
+    assert index.connection.execute("SELECT count(*) FROM journals").fetchone() == (1,)
+    index.close()
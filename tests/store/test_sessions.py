@@ -0,0 +1,127 @@
+import json
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.observers.cargo import VitalsCargoSessionCollector
+from trademeds.store.sessions import SessionStore, collect_sessions
+from ..helpers import (
+    make_load_game,
+    make_market,
+    make_sell,
+    record_reads,
+    write_journal,
+)
+
+
+def test_closed_sessions_are_read_from_store(tmp_path, monkeypatch):
+    journals = make_journals(tmp_path)
+    expected = build_directly(journals, count=3)
+
+    store = SessionStore(str(tmp_path / "sessions.sqlite3"), str(journals))
+    first, _ = collect_sessions(store, 3)
+    assert first == expected
+
+    read = record_reads(monkeypatch)
+    second, markets = collect_sessions(store, 3)
+
+    assert second == expected
+    assert "Journal.2025-02-14T090000.01.log" not in read
+    assert markets[5].station_name == "Houssay Ring"
+    store.close()
+
+
+def test_changed_journal_invalidates_stored_sessions(tmp_path, monkeypatch):
+    journals = make_journals(tmp_path)
+    store = SessionStore(str(tmp_path / "sessions.sqlite3"), str(journals))
+    collect_sessions(store, 3)
+
+    with open(journals / "Journal.2025-02-14T090000.01.log", "a") as f:
+        f.write(json.dumps(make_sell("2025-02-14T10:00:00Z", 3)) + "\n")
+
+    read = record_reads(monkeypatch)
+    sessions, _ = collect_sessions(store, 3)
+
+    assert read.count("Journal.2025-02-14T090000.01.log") == 1
+    assert sessions == build_directly(journals, count=3)
+    store.close()
+
+
+def test_sessions_over_memory_budget_spill_to_disk(tmp_path):
+    journals = make_journals(tmp_path)
+    expected = build_directly(journals, count=3)
+
+    store = SessionStore(str(tmp_path / "sessions.sqlite3"), str(journals))
+    sessions, _ = collect_sessions(store, 3, max_memory=1)
+
+    assert sessions.spilled == 3 and sessions.held == []
+    assert list(sessions) == expected
+    assert sessions[1] == expected[1]
+    assert sessions[-2:] == expected[-2:]
+    sessions.close()
+
+    # The stored sessions come back the same through the spool
+    sessions, _ = collect_sessions(store, 3, max_memory=1)
+    assert list(sessions) == expected
+    sessions.close()
+    store.close()
+
+
+def test_more_new_sessions_than_count_are_all_stored(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    for day in (10, 11):
+        write_day(journals, day, [0])
+    store = SessionStore(str(tmp_path / "sessions.sqlite3"), str(journals))
+    collect_sessions(store, 2)
+
+    for day in (12, 13):
+        write_day(journals, day, [0])
+    write_day(journals, 14, [0, 1, 2])
+    collect_sessions(store, 2)
+    # Long enough a chain to be served from the store without a rebuild
+    sessions, _ = collect_sessions(store, 4)
+
+    assert [session.started_at.strftime("%dT%H") for session in sessions] == [
+        "14T02",
+        "14T01",
+        "14T00",
+        "13T00",
+    ]
+    assert list(sessions) == build_directly(journals, count=4)
+    sessions.close()
+    sessions, _ = collect_sessions(store, 7)
+    assert list(sessions) == build_directly(journals, count=7)
+    store.close()
+
+
+# Test helpers
+def write_day(journals, day: int, hours: list[int]):
+    events = []
+    for hour in hours:
+        events += [
+            make_load_game(f"2025-02-{day}T{hour:02}:00:00Z"),
+            make_market(f"2025-02-{day}T{hour:02}:01:00Z"),
+            make_sell(f"2025-02-{day}T{hour:02}:02:00Z", day + hour),
+        ]
+    write_journal(journals / f"Journal.2025-02-{day}T000000.01.log", events)
+
+
+def make_journals(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    for day in (14, 15, 16):
+        write_journal(
+            journals / f"Journal.2025-02-{day}T090000.01.log",
+            [
+                make_load_game(f"2025-02-{day}T09:00:00Z"),
+                make_market(f"2025-02-{day}T09:01:00Z"),
+                make_sell(f"2025-02-{day}T09:02:00Z", day),
+            ],
+        )
+    return journals
+
+
+def build_directly(journals, count: int):
+    traverser = JournalEventTraverser(str(journals))
+    collector = VitalsCargoSessionCollector()
+    traverser.add_observer(collector)
+    traverser.traverse(max_sessions=count)
+    return collector.sessions[:count]
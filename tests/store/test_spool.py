@@ -0,0 +1,52 @@
+import pickle
+from datetime import datetime, timedelta, timezone
+from trademeds.models.entities import CargoSession
+from trademeds.store.spool import SessionSpool, footprint, parse_size
+
+
+def test_spool_keeps_held_sessions_under_budget():
+    sessions = make_sessions(20)
+    budget = 3 * footprint(sessions[0])
+    spool = SessionSpool(max_memory=budget)
+
+    for session in sessions:
+        spool.append(session)
+        assert spool.held_bytes <= budget
+
+    assert spool.spilled > 0
+    assert len(spool) == 20
+    assert list(spool) == sessions
+    assert spool[0] == sessions[0] and spool[-1] == sessions[-1]
+    assert spool[5:9] == sessions[5:9]
+    assert spool[::7] == sessions[::7]
+    spool.close()
+
+
+def test_spool_without_budget_never_touches_disk():
+    spool = SessionSpool()
+    spool.extend(make_sessions(5))
+
+    assert spool.spilled == 0
+    assert pickle.loads(pickle.dumps(spool))[4] == spool[4]
+
+
+def test_parse_size():
+    assert parse_size("65536") == 65536
+    assert parse_size("512k") == 512 * 1024
+    assert parse_size("1.5G") == 3 * 512 * 1024 * 1024
+    assert parse_size("64MB") == 64 * 1024 * 1024
+
+
+# Test helpers
+def make_sessions(count: int) -> list[CargoSession]:
+    started_at = datetime(2025, 2, 14, 9, tzinfo=timezone.utc)
+    return [
+        CargoSession(
+            started_at=started_at - timedelta(days=i),
+            ended_at=started_at - timedelta(days=i) + timedelta(hours=2),
+            bought={},
+            sold={5: {"fish": i}},
+            missions={},
+        )
+        for i in range(count)
+    ]
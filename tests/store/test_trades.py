@@ -0,0 +1,61 @@
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from trademeds.journal.traverser import JournalEventTraverser
+from trademeds.store.trades import TradeStore
+from ..helpers import make_buy, make_market, make_sell, write_journal
+
+
+def test_stats_group_trades(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    write_journal(
+        journals / "Journal.2025-02-15T230000.01.log",
+        [
+            make_market("2025-02-15T23:00:00Z", 1, "Sudz"),
+            make_buy("2025-02-15T23:10:31Z", 1, "fish", count=100, price=50),
+            make_buy("2025-02-15T23:11:00Z", 1, "tea", count=10, price=20),
+            make_market("2025-02-16T00:30:00Z", 2, "Aknandan"),
+            make_sell("2025-02-16T00:40:00Z", 100, 2, "fish", price=80, paid=50),
+        ],
+    )
+
+    store = TradeStore(str(tmp_path / "trades"))
+    assert store.update(JournalEventTraverser(str(journals))) == 3
+
+    stats = store.stats("commodity")
+    fish = store.commodities.index("fish")
+    [row] = np.flatnonzero(stats.keys == fish)
+    assert stats.bought[row] == 100
+    assert stats.cost[row] == 5000
+    assert stats.sold[row] == 100
+    assert stats.revenue[row] == 8000
+    assert stats.profit[row] == 3000
+
+    by_day = store.stats("day")
+    assert len(by_day.keys) == 2
+    assert list(by_day.sold) == [0, 100]
+
+    by_market = store.stats("market", since=1739664000)  # 2025-02-16
+    assert list(by_market.keys) == [2]
+
+
+def test_update_appends_only_new_trades(tmp_path):
+    journals = tmp_path / "journals"
+    journals.mkdir()
+    live = journals / "Journal.2025-02-15T230000.01.log"
+    write_journal(live, [make_buy("2025-02-15T23:10:31Z", 1, "fish", 10, 50)])
+
+    store = TradeStore(str(tmp_path / "trades"))
+    traverser = JournalEventTraverser(str(journals))
+    assert store.update(traverser) == 1
+
+    with open(live, "a") as f:
+        f.write(json.dumps(make_buy("2025-02-15T23:20:00Z", 1, "fish", 5, 60)) + "\n")
+
+    reopened = TradeStore(str(tmp_path / "trades"))
+    assert reopened.update(traverser) == 1
+    assert reopened.rows == 2
+    assert list(reopened.column("price")) == [50, 60]
@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("curses")
+
+from trademeds.viewers.dashboard import DashboardView, changed_rows
+
+
+def test_changed_rows():
+    assert changed_rows(["a", "b", "c"], ["a", "x", "c", "d"]) == [(1, "x"), (3, "d")]
+    assert changed_rows(["a", "b", "c"], ["a"]) == [(1, ""), (2, "")]
+
+
+def test_view_only_rewrites_changed_rows():
+    screen = FakeScreen()
+    view = DashboardView(screen)  # type: ignore[arg-type]
+    view.update({"sales": ["Sales", "Sudz > Ring", "  fish: 3"]})
+    screen.written.clear()
+
+    view.update({"sales": ["Sales", "Sudz > Ring", "  fish: 5"]})
+
+    assert [(row, text.strip()) for row, _, text in screen.written] == [(3, "fish: 5")]
+
+
+# Test helpers
+class FakeScreen:
+    def __init__(self) -> None:
+        self.written: list[tuple[int, int, str]] = []
+
+    def getmaxyx(self):
+        return 24, 90
+
+    def erase(self):
+        pass
+
+    def refresh(self):
+        pass
+
+    def addnstr(self, row, column, text, width):
+        self.written.append((row, column, text[:width]))
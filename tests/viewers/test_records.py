@@ -0,0 +1,191 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from trademeds.models.entities import CargoMission, CargoSession, Market
+from trademeds.observers.incomplete_cargo import IncompleteMission
+from trademeds.store.prices import PriceSource
+from trademeds.viewers.pending_cargo import PendingCargoView
+from trademeds.viewers.records import RecordWriter
+from trademeds.viewers.session import SessionView
+
+
+def test_ndjson_streams_in_buffer_sized_writes():
+    stream = RecordingStream()
+    with RecordWriter(stream, "ndjson", buffer_size=100) as writer:
+        writer.write_all({"type": "n", "i": i} for i in range(50))
+        assert 0 < len(stream.writes) < 50
+
+    lines = stream.getvalue().decode().splitlines()
+    assert [json.loads(line)["i"] for line in lines] == list(range(50))
+
+
+def test_json_output_is_one_array():
+    stream = io.BytesIO()
+    with RecordWriter(stream, "json") as writer:
+        writer.write_all(
+            {"at": datetime(2025, 2, 14, tzinfo=timezone.utc), "i": i} for i in range(3)
+        )
+    assert json.loads(stream.getvalue()) == [
+        {"at": "2025-02-14T00:00:00+00:00", "i": i} for i in range(3)
+    ]
+
+    empty = io.BytesIO()
+    RecordWriter(empty, "json").close()
+    assert json.loads(empty.getvalue()) == []
+
+
+def test_session_records():
+    started_at = datetime(2025, 2, 14, 9, tzinfo=timezone.utc)
+    session = CargoSession(
+        started_at=started_at,
+        ended_at=started_at,
+        sold={5: {"fish": 3}},
+        missions={1: make_cargo_mission()},
+    )
+    markets = {
+        5: Market(
+            market_id=5, station_name="Ring", system_name="Sudz", is_carrier=False
+        )
+    }
+
+    session_record, group = SessionView(markets).records([session])
+
+    assert session_record["sold"] == [
+        {
+            "market_id": 5,
+            "station": "Ring",
+            "system": "Sudz",
+            "is_carrier": False,
+            "goods": {"fish": 3},
+        }
+    ]
+    assert (group["type"], group["faction"], group["count"]) == (
+        "mission_group",
+        "Sudz",
+        1,
+    )
+    assert group["goods"] == {"Fish": 20}
+
+
+def test_pending_cargo_records_follow_display_order():
+    view = PendingCargoView(
+        {
+            1: IncompleteMission(
+                mission_id=1, good="Fish", count=5, faction="A", system="Sol"
+            ),
+            2: IncompleteMission(
+                mission_id=2, good="Gold", count=9, faction="A", system="Sol"
+            ),
+            3: IncompleteMission(
+                mission_id=3, good="Fish", count=4, faction="B", system="Sol"
+            ),
+            4: IncompleteMission(
+                mission_id=4, good="Tea", count=1, faction="A", system="Eta"
+            ),
+        }
+    )
+
+    assert [
+        (r["system"], r["good"], r["count"], r["faction"]) for r in view.records()
+    ] == [
+        ("Eta", "Tea", 1, "A"),
+        ("Sol", "Fish", 9, "Multiple factions"),
+        ("Sol", "Gold", 9, "A"),
+    ]
+
+
+def test_pending_cargo_records_carry_the_soonest_expiry():
+    soon = datetime(2025, 2, 15, tzinfo=timezone.utc)
+    view = PendingCargoView(
+        {
+            1: IncompleteMission(
+                mission_id=1,
+                good="Fish",
+                count=5,
+                faction="A",
+                system="Sol",
+                expiry=soon + timedelta(days=2),
+            ),
+            2: IncompleteMission(
+                mission_id=2,
+                good="Fish",
+                count=4,
+                faction="A",
+                system="Sol",
+                expiry=soon,
+            ),
+            3: IncompleteMission(
+                mission_id=3, good="Tea", count=1, faction="A", system="Sol"
+            ),
+        }
+    )
+
+    assert {r["good"]: r["expires"] for r in view.records()} == {
+        "Fish": soon,
+        "Tea": None,
+    }
+
+
+def test_pending_cargo_records_suggest_a_source():
+    fish = IncompleteMission(
+        mission_id=1,
+        good="Fish",
+        count=5,
+        faction="A",
+        system="Sol",
+        commodity="$Fish_Name;",
+    )
+    tea = IncompleteMission(
+        mission_id=2, good="Tea", count=1, faction="A", system="Sol"
+    )
+    bought = datetime(2025, 2, 14, 18, 1, tzinfo=timezone.utc)
+    source = PriceSource(
+        market_id=5,
+        market=Market(
+            market_id=5,
+            station_name="Houssay Ring",
+            system_name="Sudz",
+            is_carrier=False,
+        ),
+        last_at=bought,
+        last_price=110,
+        best_at=bought,
+        best_price=90,
+        bought=20,
+    )
+    view = PendingCargoView({1: fish, 2: tea}, {"fish": source})
+
+    records = {record["good"]: record for record in view.records()}
+    assert "source" not in records["Tea"]
+    assert records["Fish"]["source"] == {
+        "market_id": 5,
+        "station": "Houssay Ring",
+        "system": "Sudz",
+        "last_price": 110,
+        "last_at": bought,
+        "best_price": 90,
+        "best_at": bought,
+    }
+
+
+# Test helpers
+class RecordingStream(io.BytesIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes: list[int] = []
+
+    def write(self, data):  # type: ignore[override]
+        self.writes.append(len(data))
+        return super().write(data)
+
+
+def make_cargo_mission():
+    return CargoMission(
+        mission_id=1,
+        title="Deliver Fish",
+        technical_name="Mission_Delivery",
+        faction="Sudz",
+        good="Fish",
+        count=20,
+        system="Sudz",
+    )
@@ -4,10 +4,14 @@ from .events import (
     MissionAcceptedEvent,
     MissionCompletedEvent,
     MarketEvent,
+    LocationEvent,
+    FSDJumpEvent,
     MarketBuyEvent,
     MarketSellEvent,
     FactionEffect,
     FactionEffectGroup,
+    FactionInfluence,
+    LazyFactionEffects,
 )
 
 __all__ = [
@@ -16,8 +20,12 @@ __all__ = [
     "MissionAcceptedEvent",
     "MissionCompletedEvent",
     "MarketEvent",
+    "LocationEvent",
+    "FSDJumpEvent",
     "MarketBuyEvent",
     "MarketSellEvent",
     "FactionEffect",
     "FactionEffectGroup",
+    "FactionInfluence",
+    "LazyFactionEffects",
 ]
@@ -0,0 +1,150 @@
+import bz2
+import gzip
+import json
+import lzma
+import os
+import struct
+from datetime import datetime
+from types import TracebackType
+from typing import BinaryIO, Callable, Iterator, Literal, NamedTuple, Optional
+from .files import ARCHIVE_SUFFIX, is_archive, list_journal_files
+
+Codec = Literal["gzip", "lzma", "bz2"]
+
+CODECS: dict[str, tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "gzip": (gzip.compress, gzip.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+}
+
+MAGIC = b"TMJA\x01"
+_FOOTER = struct.Struct("<Q")  # offset of the block index
+BLOCK_SIZE = 256 * 1024
+
+
+class Block(NamedTuple):
+    offset: int
+    length: int
+    lines: int
+
+
+class JournalArchive:
+    """A journal compressed in independent blocks of whole lines.
+
+    Layout: magic and codec name, the compressed blocks, a JSON block index,
+    then the index offset and the magic again. Blocks can be decompressed on
+    their own, so the journal is read backwards one block at a time.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.file: BinaryIO = open(path, "rb")
+        try:
+            self._read_header()
+        except Exception:
+            self.file.close()
+            raise
+
+    def _read_header(self) -> None:
+        header = self.file.read(len(MAGIC) + 1)
+        if header[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.file.name} is not a journal archive")
+        self.codec = self.file.read(header[-1]).decode()
+        self._decompress = CODECS[self.codec][1]
+
+        footer_size = _FOOTER.size + len(MAGIC)
+        footer_offset = self.file.seek(-footer_size, os.SEEK_END)
+        footer = self.file.read(footer_size)
+        if footer[_FOOTER.size :] != MAGIC:
+            raise ValueError(f"{self.file.name} is truncated")
+        (index_offset,) = _FOOTER.unpack(footer[: _FOOTER.size])
+
+        self.file.seek(index_offset)
+        index = self.file.read(footer_offset - index_offset)
+        self.blocks = [Block(*block) for block in json.loads(index)]
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "JournalArchive":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def read_block(self, i: int) -> list[str]:
+        block = self.blocks[i]
+        self.file.seek(block.offset)
+        data = self._decompress(self.file.read(block.length))
+        # Only "\n" ends a line, str.splitlines would also split inside strings
+        # on characters like U+2028
+        return [line.decode() for line in data.removesuffix(b"\n").split(b"\n")]
+
+    def reversed_lines(self) -> Iterator[str]:
+        """Lines newest first, decompressing blocks only as they are reached."""
+        for i in reversed(range(len(self.blocks))):
+            yield from reversed(self.read_block(i))
+
+
+def write_archive(
+    source: str, destination: str, codec: Codec = "gzip", block_size: int = BLOCK_SIZE
+) -> None:
+    compress = CODECS[codec][0]
+    blocks: list[Block] = []
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        dst.write(MAGIC + bytes([len(codec)]) + codec.encode())
+
+        def flush(lines: list[bytes]) -> None:
+            data = compress(b"".join(lines))
+            blocks.append(Block(dst.tell(), len(data), len(lines)))
+            dst.write(data)
+
+        pending: list[bytes] = []
+        pending_size = 0
+        for line in src:
+            pending.append(line)
+            pending_size += len(line)
+            if pending_size >= block_size:
+                flush(pending)
+                pending, pending_size = [], 0
+        if pending:
+            flush(pending)
+
+        index_offset = dst.tell()
+        dst.write(json.dumps(blocks).encode())
+        dst.write(_FOOTER.pack(index_offset) + MAGIC)
+
+
+def archive_journals(
+    journal_path: str,
+    older_than: datetime,
+    codec: Codec = "gzip",
+    block_size: int = BLOCK_SIZE,
+) -> list[str]:
+    """Replace plain journals last written before `older_than` with archives.
+
+    The newest journal is never archived as the game may still append to it.
+    Returns the names of the archived journals.
+    """
+    archived = []
+    for name in list_journal_files(journal_path)[1:]:
+        source = os.path.join(journal_path, name)
+        if is_archive(name) or os.path.getmtime(source) >= older_than.timestamp():
+            continue
+
+        destination = source + ARCHIVE_SUFFIX
+        # Not listed as a journal while it is being written
+        partial = os.path.join(journal_path, f".{name}{ARCHIVE_SUFFIX}.tmp")
+        write_archive(source, partial, codec, block_size)
+        stat = os.stat(source)
+        os.utime(partial, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(partial, destination)
+        os.remove(source)
+        archived.append(name)
+
+    return archived
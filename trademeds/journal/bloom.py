@@ -0,0 +1,215 @@
+import hashlib
+import json
+import math
+import os
+import struct
+from typing import TYPE_CHECKING, Any, Iterator, NamedTuple, Optional
+from .files import JournalFingerprint, fingerprint
+from .filters import ALWAYS_PASS, TRADES, JournalFilter, commodity_key
+
+if TYPE_CHECKING:
+    from .traverser import JournalEventTraverser
+
+DEFAULT_FPR = 0.01
+BLOOM_FPR_ENV = "TRADEMEDS_BLOOM_FPR"
+
+_HEADER = struct.Struct("<qqIII")  # size, mtime_ns, bits, hashes, metadata size
+# Sidecars of another version are rebuilt
+_VERSION = 2
+
+
+def bloom_fpr_from_env() -> float:
+    """False-positive rate of `TRADEMEDS_BLOOM_FPR`, or the default."""
+    fpr = os.environ.get(BLOOM_FPR_ENV)
+    return float(fpr) if fpr else DEFAULT_FPR
+
+
+class BloomFilter:
+    """Set membership test with false positives but no false negatives."""
+
+    def __init__(self, bits: int, hashes: int, data: Optional[bytes] = None) -> None:
+        self.bits = bits
+        self.hashes = hashes
+        self.data = bytearray(data) if data is not None else bytearray(-(-bits // 8))
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fpr: float = DEFAULT_FPR) -> "BloomFilter":
+        """Filter sized for `capacity` keys at a false-positive rate of `fpr`."""
+        capacity = max(capacity, 1)
+        bits = max(8, math.ceil(-capacity * math.log(fpr) / math.log(2) ** 2))
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return cls(bits, hashes)
+
+    def _positions(self, hashes: tuple[int, int]) -> Iterator[int]:
+        # Double hashing: k positions out of two independent 64 bit hashes
+        h1, h2 = hashes
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, key: str) -> None:
+        for position in self._positions(_key_hashes(key)):
+            self.data[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.data[position >> 3] & (1 << (position & 7))
+            for position in self._positions(_key_hashes(key))
+        )
+
+
+def _key_hashes(key: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    return (
+        int.from_bytes(digest[:8], "little"),
+        int.from_bytes(digest[8:], "little") | 1,
+    )
+
+
+def journal_keys(raw_event: dict[str, Any]) -> Iterator[str]:
+    """Bloom filter keys for the missions, factions, markets and systems of an event."""
+    if "MissionID" in raw_event:
+        yield f"mission:{raw_event['MissionID']}"
+    for field in ("Faction", "TargetFaction"):
+        if raw_event.get(field):
+            yield f"faction:{raw_event[field]}"
+    for group in raw_event.get("FactionEffects") or ():
+        if group.get("Faction"):
+            yield f"faction:{group['Faction']}"
+    for field in ("MarketID", "StartMarketID", "EndMarketID"):
+        if field in raw_event:
+            yield f"market:{raw_event[field]}"
+    for field in ("StarSystem", "DestinationSystem"):
+        if raw_event.get(field):
+            yield f"system:{raw_event[field]}"
+    for field in (
+        "Commodity",
+        "Commodity_Localised",
+        "Type",
+        "Type_Localised",
+        "CargoType",
+    ):
+        if raw_event.get(field):
+            yield f"commodity:{commodity_key(raw_event[field])}"
+
+
+class JournalBloom(NamedTuple):
+    journal: JournalFingerprint
+    filter: BloomFilter
+    passing: list[str]  # raw lines of ALWAYS_PASS and TRADES events, newest first
+
+
+class BloomIndex:
+    """Sidecar Bloom filters of journal files, rebuilt when a journal changes.
+
+    Each journal gets a small file in `path` with a filter over the keys of
+    `journal_keys` and the raw lines of its `ALWAYS_PASS` and `TRADES`
+    events. A filtered traversal that skips the journal replays those lines,
+    through the filter, in place of it, so observers still see the sessions,
+    markets, mission progress and trades a filtered read of the journal
+    would have given them.
+
+    Filters are sized for a false-positive rate of `fpr`, by default that
+    of `TRADEMEDS_BLOOM_FPR`; sidecars built for another rate are rebuilt.
+    """
+
+    def __init__(self, path: str, fpr: Optional[float] = None) -> None:
+        fpr = bloom_fpr_from_env() if fpr is None else fpr
+        if not 0 < fpr < 1:
+            raise ValueError(f"Bloom filter FPR must be between 0 and 1, got {fpr}")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.fpr = fpr
+        self._loaded: dict[str, JournalBloom] = {}
+
+    def get(self, traverser: "JournalEventTraverser", name: str) -> JournalBloom:
+        journal = fingerprint(traverser.journal_path, name)
+        bloom = self._loaded.get(name)
+        if bloom is None or bloom.journal != journal:
+            bloom = self._read(journal)
+        if bloom is None:
+            bloom = self._build(traverser, journal)
+            self._write(bloom)
+        self._loaded[name] = bloom
+        return bloom
+
+    def may_contain(
+        self, traverser: "JournalEventTraverser", name: str, *keys: str
+    ) -> bool:
+        """False if the journal has none of the `journal_keys` in `keys`."""
+        bloom_filter = self.get(traverser, name).filter
+        return all(key in bloom_filter for key in keys)
+
+    def may_match(
+        self,
+        traverser: "JournalEventTraverser",
+        name: str,
+        event_filter: JournalFilter,
+    ) -> bool:
+        """False if no event of the journal can mention every filtered value."""
+        keys = []
+        if event_filter.faction is not None:
+            keys.append(f"faction:{event_filter.faction}")
+        if event_filter.system is not None:
+            keys.append(f"system:{event_filter.system}")
+        if event_filter.commodity is not None:
+            keys.append(f"commodity:{commodity_key(event_filter.commodity)}")
+        if event_filter.mission is not None:
+            keys.append(f"mission:{event_filter.mission}")
+        if event_filter.market is not None:
+            keys.append(f"market:{event_filter.market}")
+        return self.may_contain(traverser, name, *keys)
+
+    def _sidecar(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bloom")
+
+    def _build(
+        self, traverser: "JournalEventTraverser", journal: JournalFingerprint
+    ) -> JournalBloom:
+        keys: set[str] = set()
+        passing = []
+        for line in traverser.read_lines(journal.name):
+            raw_event = traverser.decode(line)
+            keys.update(journal_keys(raw_event))
+            if raw_event["event"] in ALWAYS_PASS or raw_event["event"] in TRADES:
+                passing.append(line.strip())
+
+        bloom_filter = BloomFilter.for_capacity(len(keys), self.fpr)
+        for key in keys:
+            bloom_filter.add(key)
+        return JournalBloom(journal, bloom_filter, passing)
+
+    def _read(self, journal: JournalFingerprint) -> Optional[JournalBloom]:
+        try:
+            with open(self._sidecar(journal.name), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        size, mtime_ns, bits, hashes, metadata_size = _HEADER.unpack_from(data)
+        if (size, mtime_ns) != (journal.size, journal.mtime_ns):
+            return None
+
+        metadata_end = _HEADER.size + metadata_size
+        metadata = json.loads(data[_HEADER.size : metadata_end])
+        if metadata.get("version") != _VERSION or metadata.get("fpr") != self.fpr:
+            return None  # written by an older version or for another rate
+        return JournalBloom(
+            journal, BloomFilter(bits, hashes, data[metadata_end:]), metadata["passing"]
+        )
+
+    def _write(self, bloom: JournalBloom) -> None:
+        metadata = json.dumps(
+            {"version": _VERSION, "fpr": self.fpr, "passing": bloom.passing}
+        ).encode()
+        header = _HEADER.pack(
+            bloom.journal.size,
+            bloom.journal.mtime_ns,
+            bloom.filter.bits,
+            bloom.filter.hashes,
+            len(metadata),
+        )
+
+        sidecar = self._sidecar(bloom.journal.name)
+        with open(sidecar + ".tmp", "wb") as f:
+            f.write(header + metadata + bloom.filter.data)
+        os.replace(sidecar + ".tmp", sidecar)
@@ -0,0 +1,72 @@
+import os
+import pickle
+import sqlite3
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+from .files import JournalFingerprint
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    journal TEXT NOT NULL,
+    observer TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    load_games INTEGER NOT NULL,
+    first_event_at TEXT,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (journal, observer)
+);
+"""
+
+
+class Checkpoint(NamedTuple):
+    load_games: int
+    first_event_at: Optional[datetime]  # oldest parsed event of the journal
+    snapshot: Any
+
+
+class CheckpointStore:
+    """Observer snapshots per journal file, valid while the file is unchanged."""
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def get(self, journal: JournalFingerprint, observer: str) -> Optional[Checkpoint]:
+        row = self.connection.execute(
+            "SELECT load_games, first_event_at, payload FROM checkpoints"
+            " WHERE journal = ? AND observer = ? AND size = ? AND mtime_ns = ?",
+            (journal.name, observer, journal.size, journal.mtime_ns),
+        ).fetchone()
+        if row is None:
+            return None
+        return Checkpoint(
+            load_games=row[0],
+            first_event_at=datetime.fromisoformat(row[1]) if row[1] else None,
+            snapshot=pickle.loads(row[2]),
+        )
+
+    def put(
+        self, journal: JournalFingerprint, observer: str, checkpoint: Checkpoint
+    ) -> None:
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    journal.name,
+                    observer,
+                    journal.size,
+                    journal.mtime_ns,
+                    checkpoint.load_games,
+                    (
+                        checkpoint.first_event_at.isoformat()
+                        if checkpoint.first_event_at
+                        else None
+                    ),
+                    pickle.dumps(checkpoint.snapshot, pickle.HIGHEST_PROTOCOL),
+                ),
+            )
@@ -0,0 +1,49 @@
+import importlib
+import json
+import os
+from typing import Any, Callable, Optional
+
+Decoder = Callable[[str | bytes], Any]
+
+DECODER_ENV = "TRADEMEDS_JSON_DECODER"
+
+# Fastest first, "auto" picks the first one installed
+BACKENDS = ("orjson", "simdjson", "ujson", "json")
+
+
+def _import_decoder(backend: str) -> Optional[Decoder]:
+    if backend == "json":
+        return json.loads
+    try:
+        module = importlib.import_module(backend)
+    except ImportError:
+        return None
+    return module.loads  # type: ignore[no-any-return]
+
+
+def available_decoders() -> list[str]:
+    return [backend for backend in BACKENDS if _import_decoder(backend) is not None]
+
+
+def get_decoder(name: Optional[str] = None) -> tuple[str, Decoder]:
+    """JSON decoder for journal lines and the name of its backend.
+
+    `name` defaults to the `TRADEMEDS_JSON_DECODER` environment variable,
+    and then to "auto": the fastest backend installed, falling back to the
+    standard library.
+    """
+    name = name or os.environ.get(DECODER_ENV) or "auto"
+    if name == "auto":
+        for backend in BACKENDS:
+            decoder = _import_decoder(backend)
+            if decoder is not None:
+                return backend, decoder
+
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown JSON decoder {name!r}, expected auto or one of {', '.join(BACKENDS)}"
+        )
+    decoder = _import_decoder(name)
+    if decoder is None:
+        raise ValueError(f"JSON decoder {name!r} is not installed")
+    return name, decoder
@@ -0,0 +1,89 @@
+import hashlib
+import os
+from datetime import timedelta
+from typing import Iterable, Optional
+from .files import is_archive
+from .scan import parse_duration, scan_line
+
+DEDUPE_ENV = "TRADEMEDS_DEDUPE_WINDOW"
+
+
+def dedupe_window_from_env() -> Optional[timedelta]:
+    """Window of `TRADEMEDS_DEDUPE_WINDOW` ("24h"), if it's set."""
+    window = os.environ.get(DEDUPE_ENV)
+    return parse_duration(window) if window else None
+
+
+def _digest(path: str) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def unique_journals(journal_path: str, names: Iterable[str]) -> list[str]:
+    """Journal files without copies of files listed before them.
+
+    Copies come from journal folders copied between machines or restored
+    from backups. Only files of the same size are compared, by a hash of
+    their contents, so a folder without copies costs one stat per file.
+    Archives are kept as they are; their lines are compressed differently.
+    """
+    unique = []
+    by_size: dict[int, list[str]] = {}
+    digests: dict[str, bytes] = {}
+
+    def digest(name: str) -> bytes:
+        if name not in digests:
+            digests[name] = _digest(os.path.join(journal_path, name))
+        return digests[name]
+
+    for name in names:
+        if is_archive(name):
+            unique.append(name)
+            continue
+        size = os.path.getsize(os.path.join(journal_path, name))
+        same_size = by_size.setdefault(size, [])
+        if any(digest(kept) == digest(name) for kept in same_size):
+            continue
+        same_size.append(name)
+        unique.append(name)
+    return unique
+
+
+class LineWindow:
+    """Hashes of recent journal lines, to drop lines read before.
+
+    Copies that aren't byte for byte the same file, like a journal cut
+    short by a backup next to the whole one, repeat lines. Hashes are kept
+    in buckets of `window` by the line's timestamp, and buckets more than
+    two windows newer than the oldest line seen are dropped: traversal goes
+    newest first, so memory follows the lines of the last couple of windows
+    rather than the whole history.
+    """
+
+    def __init__(self, window: timedelta) -> None:
+        self.window = window.total_seconds()
+        self.buckets: dict[int, set[bytes]] = {}
+        self.oldest: Optional[int] = None
+        self.duplicates = 0
+
+    def seen(self, line: str) -> bool:
+        """Whether the line was seen before, remembering it if not."""
+        scanned = scan_line(line)
+        if scanned is None:
+            return False
+        bucket = int(scanned.timestamp.timestamp() // self.window)
+        if self.oldest is None or bucket < self.oldest:
+            self.oldest = bucket
+            for newer in [b for b in self.buckets if b > bucket + 2]:
+                del self.buckets[newer]
+
+        key = hashlib.blake2b(line.strip().encode(), digest_size=16).digest()
+        hashes = self.buckets.setdefault(bucket, set())
+        if key in hashes:
+            self.duplicates += 1
+            return True
+        hashes.add(key)
+        return False
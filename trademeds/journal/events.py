@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Any, Iterator, List, Optional, Sequence, overload
+from pydantic import BaseModel, Field, ConfigDict, GetCoreSchemaHandler
+from pydantic_core import core_schema
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -24,14 +25,108 @@ class FactionEffect(BaseModel):
     trend: str = Field(alias="Trend")
 
 
+class FactionInfluence(BaseModel):
+    system_address: int = Field(alias="SystemAddress")
+    trend: str = Field(alias="Trend")
+    influence: str = Field(alias="Influence")
+
+
 class FactionEffectGroup(BaseModel):
     faction: str = Field(alias="Faction")
     effects: List[FactionEffect] = Field(alias="Effects")
-    influence: List[dict] = Field(alias="Influence")
+    influence: List[FactionInfluence] = Field(alias="Influence")
     reputation_trend: str = Field(alias="ReputationTrend")
     reputation: str = Field(alias="Reputation")
 
 
+class LazyFactionEffects(Sequence[FactionEffectGroup]):
+    """Raw FactionEffects slice that is validated into groups on first access.
+
+    Most observers never look at mission effects, so the raw list is kept
+    as-is and `FactionEffectGroup` instances are only built (once) when the
+    sequence is actually read.
+    """
+
+    __slots__ = ("_raw", "_groups")
+
+    def __init__(self, raw: list[Any]) -> None:
+        self._raw = raw
+        self._groups: Optional[list[FactionEffectGroup]] = None
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._groups is not None
+
+    @property
+    def raw(self) -> list[Any]:
+        return self._raw
+
+    def _materialize(self) -> list[FactionEffectGroup]:
+        if self._groups is None:
+            self._groups = [
+                (
+                    group
+                    if isinstance(group, FactionEffectGroup)
+                    else FactionEffectGroup.model_validate(group)
+                )
+                for group in self._raw
+            ]
+        return self._groups
+
+    @overload
+    def __getitem__(self, index: int) -> FactionEffectGroup: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[FactionEffectGroup]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> FactionEffectGroup | list[FactionEffectGroup]:
+        return self._materialize()[index]
+
+    def __iter__(self) -> Iterator[FactionEffectGroup]:
+        return iter(self._materialize())
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyFactionEffects):
+            return self._materialize() == other._materialize()
+        if isinstance(other, list):
+            return self._materialize() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        if self._groups is None:
+            return f"LazyFactionEffects(<{len(self._raw)} raw groups>)"
+        return f"LazyFactionEffects({self._groups!r})"
+
+    @classmethod
+    def _validate(cls, value: Any) -> "LazyFactionEffects":
+        if isinstance(value, cls):
+            return value
+        if not isinstance(value, list):
+            raise ValueError("FactionEffects must be a list")
+        return cls(value)
+
+    def _serialize(self) -> list[Any]:
+        if self._groups is None:
+            return self._raw
+        return [group.model_dump(by_alias=True) for group in self._groups]
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda value: value._serialize()
+            ),
+        )
+
+
 class MissionAcceptedEvent(GameEvent):
     faction: str = Field(alias="Faction")
     name: str = Field(alias="Name")
@@ -58,7 +153,7 @@ class MissionCompletedEvent(GameEvent):
     name: str = Field(alias="Name")
     localised_name: str = Field(alias="LocalisedName")
     mission_id: int = Field(alias="MissionID")
-    faction_effects: List[FactionEffectGroup] = Field(alias="FactionEffects")
+    faction_effects: LazyFactionEffects = Field(alias="FactionEffects")
     donation: Optional[str] = Field(None, alias="Donation")
     donated: Optional[int] = Field(None, alias="Donated")
     commodity: Optional[str] = Field(None, alias="Commodity")
@@ -77,6 +172,18 @@ class MarketEvent(GameEvent):
     star_system: str = Field(alias="StarSystem")
 
 
+class LocationEvent(GameEvent):
+    """Player position at login or after respawn."""
+
+    star_system: str = Field(alias="StarSystem")
+    system_address: int = Field(alias="SystemAddress")
+
+
+class FSDJumpEvent(GameEvent):
+    star_system: str = Field(alias="StarSystem")
+    system_address: int = Field(alias="SystemAddress")
+
+
 class MarketBuyEvent(GameEvent):
     market_id: int = Field(alias="MarketID")
     type: str = Field(alias="Type")
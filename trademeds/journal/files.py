@@ -0,0 +1,45 @@
+import os
+from typing import NamedTuple
+
+
+class JournalFingerprint(NamedTuple):
+    """Identity of a journal file's contents at the time it was read."""
+
+    name: str
+    size: int
+    mtime_ns: int
+
+
+ARCHIVE_SUFFIX = ".archive"
+
+
+def is_archive(name: str) -> bool:
+    return name.endswith(ARCHIVE_SUFFIX)
+
+
+def journal_name(name: str) -> str:
+    """Name of the journal a file holds, the same for its archive."""
+    return name.removesuffix(ARCHIVE_SUFFIX)
+
+
+def list_journal_files(journal_path: str) -> list[str]:
+    """Journal file names, newest first.
+
+    An archive is skipped while its plain journal still exists, which only
+    happens if archiving was interrupted.
+    """
+    names = {name for name in os.listdir(journal_path) if name.startswith("Journal.")}
+    return sorted(
+        (
+            name
+            for name in names
+            if not (is_archive(name) and journal_name(name) in names)
+        ),
+        key=journal_name,
+        reverse=True,
+    )
+
+
+def fingerprint(journal_path: str, name: str) -> JournalFingerprint:
+    stat = os.stat(os.path.join(journal_path, name))
+    return JournalFingerprint(name=name, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
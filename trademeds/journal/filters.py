@@ -0,0 +1,136 @@
+from dataclasses import dataclass, replace
+from functools import cached_property
+from typing import Optional
+from ..models.entities import CargoSession, Market
+from .events import GameEvent
+
+# Session boundaries, station names and mission progress never name the
+# faction or commodity a query is about, but observers still need them.
+ALWAYS_PASS = frozenset({"LoadGame", "Market", "CargoDepot", "MissionAbandoned"})
+# Trades only name a market and a commodity. They are kept whatever the
+# faction, system and mission, the system of their market is checked once the Market
+# events are known, see `JournalFilter.restrict_trades`.
+TRADES = frozenset({"MarketBuy", "MarketSell"})
+
+
+def raw_event_name(line: str) -> Optional[str]:
+    """The `event` value of a raw journal line, without decoding the JSON."""
+    start = line.find('"event":')
+    if start == -1:
+        return None
+    start = line.find('"', start + 8) + 1
+    end = line.find('"', start)
+    return line[start:end] if start and end != -1 else None
+
+
+def commodity_key(name: str) -> str:
+    # "$AgriculturalMedicines_Name;" and "agriculturalmedicines" name the same good
+    key = name.lower()
+    if key.startswith("$") and key.endswith("_name;"):
+        key = key[1:-6]
+    return key
+
+
+def _searchable(value: str) -> bool:
+    # Values JSON would escape can't be found in the raw line as they are
+    return (
+        value.isascii() and value.isprintable() and not ('"' in value or "\\" in value)
+    )
+
+
+@dataclass(frozen=True, kw_only=True)
+class JournalFilter:
+    """Restrict a traversal to events about a faction, system, commodity,
+    mission and/or market.
+
+    Lines are first rejected on their raw text, before JSON decoding, if they
+    can't mention every requested value; the parsed events that remain must
+    have a field equal to each of them. Events in `ALWAYS_PASS` are kept,
+    and `TRADES` only need to match the commodity and market.
+    """
+
+    faction: Optional[str] = None
+    system: Optional[str] = None
+    commodity: Optional[str] = None
+    mission: Optional[int] = None
+    market: Optional[int] = None
+
+    def __bool__(self) -> bool:
+        return any((self.faction, self.system, self.commodity)) or any(
+            value is not None for value in (self.mission, self.market)
+        )
+
+    @cached_property
+    def _needles(self) -> tuple[list[str], list[str], Optional[str]]:
+        # Values to look for in raw lines as is (for all events, and for all
+        # but trades), and lowercased
+        needles = [
+            value
+            for value in (self.faction, self.system)
+            if value is not None and _searchable(value)
+        ]
+        if self.mission is not None:
+            needles.append(str(self.mission))
+        trade_needles = [str(self.market)] if self.market is not None else []
+        if self.commodity is not None and _searchable(self.commodity):
+            return trade_needles, needles, commodity_key(self.commodity)
+        return trade_needles, needles, None
+
+    def accepts_line(self, line: str) -> bool:
+        name = raw_event_name(line)
+        if name in ALWAYS_PASS:
+            return True
+
+        trade_needles, needles, lowercase_needle = self._needles
+        for needle in trade_needles:
+            if needle not in line:
+                return False
+        if name not in TRADES:
+            for needle in needles:
+                if needle not in line:
+                    return False
+        if lowercase_needle is not None and lowercase_needle not in line.lower():
+            return False
+        return True
+
+    def accepts(self, event: GameEvent) -> bool:
+        if event.event in ALWAYS_PASS:
+            return True
+
+        fields = vars(event).values()
+        values = [value for value in fields if isinstance(value, str)]
+        if self.market is not None and self.market not in fields:
+            return False
+        if event.event not in TRADES:
+            if self.faction is not None and self.faction not in values:
+                return False
+            if self.system is not None and self.system not in values:
+                return False
+            if self.mission is not None and self.mission not in fields:
+                return False
+        if self.commodity is not None:
+            commodity = commodity_key(self.commodity)
+            if not any(commodity_key(value) == commodity for value in values):
+                return False
+        return True
+
+    def restrict_trades(
+        self, session: CargoSession, markets: dict[int, Market]
+    ) -> CargoSession:
+        """`session` with only the trades at markets in the filtered system.
+
+        Markets without a Market event in the traversed journals can't be
+        placed in a system, so their trades are dropped too.
+        """
+        if self.system is None:
+            return session
+
+        def in_system(market_id: int) -> bool:
+            market = markets.get(market_id)
+            return market is not None and market.system_name == self.system
+
+        return replace(
+            session,
+            sold={m: goods for m, goods in session.sold.items() if in_system(m)},
+            bought={m: goods for m, goods in session.bought.items() if in_system(m)},
+        )
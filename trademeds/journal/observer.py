@@ -1,5 +1,6 @@
-from typing import Protocol
+from typing import Any, Protocol, Sequence, runtime_checkable
 from .events import GameEvent
+from .files import JournalFingerprint
 
 
 class JournalObserver(Protocol):
@@ -10,3 +11,50 @@ class JournalObserver(Protocol):
     """
 
     def handle_event(self, event: GameEvent) -> None: ...
+
+
+@runtime_checkable
+class BatchObserver(Protocol):
+    """Optional extension for observers that take events a chunk at a time.
+
+    The traverser hands runs of events (newest first, all of one journal
+    file) to `handle_events` instead of calling `handle_event` for each.
+    It must have the same effect as `handle_event` on each event in order.
+    """
+
+    def handle_event(self, event: GameEvent) -> None: ...
+
+    def handle_events(self, events: Sequence[GameEvent]) -> None: ...
+
+
+@runtime_checkable
+class JournalFileObserver(Protocol):
+    """Optional extension for observers that need to know event sources.
+
+    The traverser calls handle_file before feeding the events of each journal
+    file to observers implementing it.
+    """
+
+    def handle_file(self, journal: JournalFingerprint) -> None: ...
+
+
+@runtime_checkable
+class CheckpointableObserver(Protocol):
+    """Optional extension for observers whose state can be saved and resumed.
+
+    `fresh` returns an empty observer of the same kind that is fed a single
+    journal file on its own; its `snapshot` must be picklable. `restore` then
+    continues this observer's (newest first) traversal with such a snapshot of
+    older journals, as if their events had been handled directly.
+    `checkpoint_key` names the snapshot format and changes with it.
+    """
+
+    checkpoint_key: str
+
+    def handle_event(self, event: GameEvent) -> None: ...
+
+    def fresh(self) -> "CheckpointableObserver": ...
+
+    def snapshot(self) -> Any: ...
+
+    def restore(self, snapshot: Any) -> None: ...
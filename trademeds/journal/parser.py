@@ -1,4 +1,6 @@
-from typing import Dict, Type, Optional, Any
+import os
+from typing import Dict, Type, Optional
+from .decoders import Decoder
 from .events import (
     GameEvent,
     LoadGameEvent,
@@ -6,25 +8,59 @@ from .events import (
     MissionCompletedEvent,
     MissionAbandonedEvent,
     MarketEvent,
+    LocationEvent,
+    FSDJumpEvent,
     MarketBuyEvent,
     MarketSellEvent,
     CargoDepotEvent,
 )
+from .filters import raw_event_name
+from .shadow import ShadowVerifier
+
+PARSER_ENV = "TRADEMEDS_PARSER"
+PARSE_MODES = ("validate", "fast")
 
 
 class JournalEventParser:
-    def __init__(self) -> None:
+    """Journal events the observers know, as pydantic models.
+
+    `parse_line` has two paths. "validate", the reference, decodes every
+    line and validates the events it knows. "fast" reads the event type
+    straight from the raw line and drops lines of other events, most of a
+    journal, without decoding them. With a `ShadowVerifier` the fast path
+    runs the reference path too on a sample of lines; where they disagree
+    the reference result is used.
+
+    `mode` and `shadow` default to the `TRADEMEDS_PARSER` and
+    `TRADEMEDS_SHADOW_SAMPLE` environment variables, so journal reading
+    worker processes parse the same way.
+    """
+
+    def __init__(
+        self, mode: Optional[str] = None, shadow: Optional[ShadowVerifier] = None
+    ) -> None:
+        self.mode = mode or os.environ.get(PARSER_ENV) or "validate"
+        if self.mode not in PARSE_MODES:
+            raise ValueError(
+                f"Unknown parser {self.mode!r}, expected one of {', '.join(PARSE_MODES)}"
+            )
+        self.shadow = shadow if shadow is not None else ShadowVerifier.from_env()
         self._event_parsers: Dict[str, Type[GameEvent]] = {
             "LoadGame": LoadGameEvent,
             "MissionAccepted": MissionAcceptedEvent,
             "MissionCompleted": MissionCompletedEvent,
             "MissionAbandoned": MissionAbandonedEvent,
             "Market": MarketEvent,
+            "Location": LocationEvent,
+            "FSDJump": FSDJumpEvent,
             "MarketBuy": MarketBuyEvent,
             "MarketSell": MarketSellEvent,
             "CargoDepot": CargoDepotEvent,
         }
 
+    def recognises(self, event_type: str) -> bool:
+        return event_type in self._event_parsers
+
     def parse(self, raw_event: dict) -> Optional[GameEvent]:
         event_type = raw_event["event"]
         if event_type not in self._event_parsers:
@@ -32,3 +68,30 @@ class JournalEventParser:
 
         event_class = self._event_parsers[event_type]
         return event_class.model_validate(raw_event)
+
+    def parse_line(self, line: str | bytes, decode: Decoder) -> Optional[GameEvent]:
+        """Parse a raw journal line, None for events that aren't known."""
+        if self.mode == "validate":
+            return self.parse(decode(line))
+
+        event = self._parse_fast(line, decode)
+        if self.shadow is None or not self.shadow.sampled():
+            return event
+        try:
+            reference = self.parse(decode(line))
+        except (ValueError, TypeError, KeyError) as error:
+            self.shadow.failed(line, event, error)
+            raise
+        self.shadow.verify(line, event, reference)
+        return reference
+
+    def _parse_fast(self, line: str | bytes, decode: Decoder) -> Optional[GameEvent]:
+        event_type = raw_event_name(
+            line.decode(errors="replace") if isinstance(line, bytes) else line
+        )
+        if event_type is None:
+            return self.parse(decode(line))
+        event_class = self._event_parsers.get(event_type)
+        if event_class is None:
+            return None
+        return event_class.model_validate_json(line)
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import NamedTuple, Optional
+from .filters import raw_event_name
+
+
+class LineScan(NamedTuple):
+    """Timestamp and event type of a raw journal line."""
+
+    timestamp: datetime
+    event: str
+
+
+@lru_cache(maxsize=1024)
+def parse_timestamp(value: str) -> datetime:
+    """Datetime of a journal timestamp, "2025-02-14T18:01:00Z".
+
+    Events written in the same second share a timestamp, so recent values
+    are memoised. Other ISO 8601 forms go through `datetime.fromisoformat`.
+    """
+    if len(value) == 20 and value[19] == "Z" and value[10] == "T":
+        try:
+            return datetime(
+                int(value[0:4]),
+                int(value[5:7]),
+                int(value[8:10]),
+                int(value[11:13]),
+                int(value[14:16]),
+                int(value[17:19]),
+                tzinfo=timezone.utc,
+            )
+        except ValueError:
+            pass
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        raise ValueError(f"Journal timestamp without a time zone: {value!r}")
+    return parsed
+
+
+def parse_duration(duration: str) -> timedelta:
+    """Time span like "90s", "45m", "2h" or "7d"."""
+    units = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+    duration = duration.strip().lower()
+    if duration[-1:] not in units:
+        raise ValueError(f"Expected a duration like 2h or 30m, got {duration!r}")
+    return timedelta(**{units[duration[-1]]: float(duration[:-1])})
+
+
+def raw_timestamp(line: str) -> Optional[str]:
+    """The `timestamp` value of a raw journal line, without decoding the JSON."""
+    start = line.find('"timestamp":')
+    if start == -1:
+        return None
+    start = line.find('"', start + 12) + 1
+    end = line.find('"', start)
+    return line[start:end] if start and end != -1 else None
+
+
+# How the game starts every line, with a 20 character timestamp
+_PREFIX = '{ "timestamp":"'
+_EVENT = '", "event":"'
+_EVENT_AT = len(_PREFIX) + 20
+_NAME_AT = _EVENT_AT + len(_EVENT)
+
+
+def scan_line(line: str) -> Optional[LineScan]:
+    """Timestamp and event type of a raw line, None if it doesn't have both.
+
+    Much cheaper than decoding the line, for range and session boundary
+    checks that don't need the rest of the event. Lines as the game writes
+    them are read at fixed offsets, others are searched.
+    """
+    if line.startswith(_PREFIX) and line.startswith(_EVENT, _EVENT_AT):
+        end = line.find('"', _NAME_AT)
+        timestamp: Optional[str] = line[len(_PREFIX) : _EVENT_AT]
+        event = line[_NAME_AT:end] if end != -1 else None
+    else:
+        timestamp, event = raw_timestamp(line), raw_event_name(line)
+    if timestamp is None or event is None:
+        return None
+    try:
+        return LineScan(parse_timestamp(timestamp), event)
+    except ValueError:
+        return None
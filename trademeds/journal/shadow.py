@@ -0,0 +1,142 @@
+import math
+import os
+import random
+import sys
+from typing import Any, Callable, NamedTuple, Optional
+from pydantic import BaseModel
+from .events import GameEvent, LazyFactionEffects
+
+SHADOW_ENV = "TRADEMEDS_SHADOW_SAMPLE"
+
+
+class ShadowMismatch(NamedTuple):
+    """A field the fast and the reference parsing path disagree on."""
+
+    line: str
+    event: str
+    field: str
+    fast: Any
+    reference: Any
+
+
+def compare_events(
+    fast: Optional[GameEvent], reference: Optional[GameEvent]
+) -> list[tuple[str, Any, Any]]:
+    """Fields, as (name, fast, reference), two parsed events differ in."""
+    if type(fast) is not type(reference):
+        return [("event", _type_name(fast), _type_name(reference))]
+    if fast is None or reference is None:
+        return []
+    differences = []
+    for name in type(reference).model_fields:
+        fast_value, reference_value = getattr(fast, name), getattr(reference, name)
+        if not _same(fast_value, reference_value):
+            differences.append((name, fast_value, reference_value))
+    return differences
+
+
+def _same(fast: Any, reference: Any) -> bool:
+    if isinstance(fast, LazyFactionEffects) and isinstance(
+        reference, LazyFactionEffects
+    ):
+        # Comparing the raw groups doesn't validate them as a side effect
+        return fast.raw == reference.raw
+    if isinstance(fast, BaseModel) or isinstance(reference, BaseModel):
+        return fast == reference
+    return type(fast) is type(reference) and fast == reference
+
+
+def _type_name(event: Optional[GameEvent]) -> str:
+    return type(event).__name__ if event is not None else "None"
+
+
+def _text(line: str | bytes) -> str:
+    return line.decode(errors="replace") if isinstance(line, bytes) else line
+
+
+def print_mismatch(mismatch: ShadowMismatch) -> None:
+    print(
+        f"Parser mismatch in {mismatch.event} {mismatch.field}:"
+        f" fast {mismatch.fast!r}, reference {mismatch.reference!r}\n"
+        f"  {mismatch.line.rstrip()}",
+        file=sys.stderr,
+    )
+
+
+class ShadowVerifier:
+    """Checks the fast parsing path against the reference one on a sample.
+
+    `sample` is the fraction of lines, from 0 to 1, that are parsed a second
+    time by the reference path and compared field by field; it is the
+    overhead traded for confidence. Each differing field is passed to
+    `report`, which prints it with the raw line to stderr by default.
+    """
+
+    def __init__(
+        self,
+        sample: float,
+        report: Callable[[ShadowMismatch], None] = print_mismatch,
+        seed: Optional[int] = None,
+    ) -> None:
+        if not 0 <= sample <= 1:
+            raise ValueError(f"Shadow sample must be between 0 and 1, got {sample}")
+        self.sample = sample
+        self.report = report
+        self._random = random.Random(seed).random
+        self._skip = self._gap()
+        self.checked = 0
+        self.mismatched = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ShadowVerifier"]:
+        """Verifier sampling `TRADEMEDS_SHADOW_SAMPLE` of lines, if it's set."""
+        sample = os.environ.get(SHADOW_ENV)
+        return cls(float(sample)) if sample else None
+
+    def _gap(self) -> int:
+        # Lines between samples are geometrically distributed; drawing the gap
+        # once per sample is cheaper than a random number for every line
+        if self.sample == 0:
+            return -1  # counts down forever without reaching 0
+        if self.sample == 1:
+            return 0
+        return int(math.log(1 - self._random()) / math.log(1 - self.sample))
+
+    def sampled(self) -> bool:
+        if self._skip:
+            self._skip -= 1
+            return False
+        self._skip = self._gap()
+        return True
+
+    def verify(
+        self,
+        line: str | bytes,
+        fast: Optional[GameEvent],
+        reference: Optional[GameEvent],
+    ) -> bool:
+        """Compare the two results of a line, reporting differences."""
+        self.checked += 1
+        differences = compare_events(fast, reference)
+        if not differences:
+            return True
+
+        self.mismatched += 1
+        event = reference.event if reference is not None else _type_name(fast)
+        for field, fast_value, reference_value in differences:
+            self.report(
+                ShadowMismatch(_text(line), event, field, fast_value, reference_value)
+            )
+        return False
+
+    def failed(
+        self, line: str | bytes, fast: Optional[GameEvent], error: Exception
+    ) -> None:
+        """Report a line the reference path can't parse but the fast one did."""
+        self.checked += 1
+        self.mismatched += 1
+        self.report(
+            ShadowMismatch(
+                _text(line), _type_name(fast), "error", _type_name(fast), repr(error)
+            )
+        )
@@ -0,0 +1,59 @@
+import os
+from typing import Any, Optional
+from .decoders import get_decoder
+
+CARGO_FILE = "Cargo.json"
+MARKET_FILE = "Market.json"
+
+
+class StatusFile:
+    """One of the small JSON files the game rewrites next to the journals.
+
+    `poll` stats the file and only reads it again when its size or
+    modification time changed, so it can run many times a second. The game
+    rewrites these files in place: a read that catches one half written is
+    dropped and retried on the next poll.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.data: Optional[dict[str, Any]] = None
+        self._stamp: Optional[tuple[int, int]] = None
+        _, self.decode = get_decoder()
+
+    def poll(self) -> bool:
+        """Re-read the file if it changed, returns whether `data` changed."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            changed = self.data is not None
+            self.data, self._stamp = None, None
+            return changed
+
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if stamp == self._stamp:
+            return False
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        try:
+            data = self.decode(raw)
+        except ValueError:
+            return False
+        self._stamp = stamp
+        if data == self.data:
+            return False
+        self.data = data
+        return True
+
+
+class StatusWatcher:
+    """Cargo.json (the ship's hold) and Market.json (the last market opened)."""
+
+    def __init__(self, journal_path: str) -> None:
+        self.cargo = StatusFile(os.path.join(journal_path, CARGO_FILE))
+        self.market = StatusFile(os.path.join(journal_path, MARKET_FILE))
+
+    def poll(self) -> bool:
+        cargo_changed = self.cargo.poll()
+        market_changed = self.market.poll()
+        return cargo_changed or market_changed
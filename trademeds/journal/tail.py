@@ -0,0 +1,76 @@
+import os
+from typing import Optional
+from .decoders import get_decoder
+from .events import GameEvent
+from .files import list_journal_files
+from .parser import JournalEventParser
+
+
+class JournalTail:
+    """Follows the newest journal file forward as the game appends to it.
+
+    `poll` returns the events of the complete lines written since the last
+    call, oldest first; a partly written line is kept until it is finished.
+    When the game starts a new journal file the rest of the old one is read
+    before switching over. Polling an unchanged journal costs one directory
+    listing and one stat.
+    """
+
+    def __init__(self, journal_path: str) -> None:
+        self.journal_path = journal_path
+        self.parser = JournalEventParser()
+        _, self.decode = get_decoder()
+        self.name: Optional[str] = None
+        self.offset = 0
+        self._partial = b""
+
+    def seek_end(self) -> None:
+        """Skip everything already written, e.g. after reading it by traversal."""
+        journals = list_journal_files(self.journal_path)
+        self.name = journals[0] if journals else None
+        self.offset = (
+            os.path.getsize(os.path.join(self.journal_path, self.name))
+            if self.name is not None
+            else 0
+        )
+        self._partial = b""
+
+    def poll(self) -> list[GameEvent]:
+        journals = list_journal_files(self.journal_path)
+        if not journals:
+            return []
+
+        events = []
+        if journals[0] != self.name:
+            if self.name is not None:
+                events.extend(self._read_new())
+            self.name, self.offset, self._partial = journals[0], 0, b""
+        events.extend(self._read_new())
+        return events
+
+    def _read_new(self) -> list[GameEvent]:
+        assert self.name is not None
+        path = os.path.join(self.journal_path, self.name)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return []
+        if size < self.offset:
+            self.offset, self._partial = 0, b""  # rewritten from the start
+        if size == self.offset:
+            return []
+
+        with open(path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        self.offset += len(data)
+
+        *lines, self._partial = (self._partial + data).split(b"\n")
+        events = []
+        for line in lines:
+            if not line.strip():
+                continue
+            parsed_event = self.parser.parse_line(line, self.decode)
+            if parsed_event is not None:
+                events.append(parsed_event)
+        return events
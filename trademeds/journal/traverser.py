@@ -1,36 +1,383 @@
 import os
-import json
+import pickle
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from datetime import datetime, timedelta
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+from .archive import JournalArchive
+from .bloom import BloomIndex
+from .checkpoints import Checkpoint, CheckpointStore
+from .decoders import get_decoder
+from .dedup import LineWindow, dedupe_window_from_env, unique_journals
+from .events import GameEvent
+from .filters import JournalFilter
+from .files import JournalFingerprint, fingerprint, is_archive, list_journal_files
 from .parser import JournalEventParser
-from .observer import JournalObserver
+from .scan import LineScan, scan_line
+from .observer import (
+    BatchObserver,
+    CheckpointableObserver,
+    JournalFileObserver,
+    JournalObserver,
+)
+
+# Events handed to observers at a time
+BATCH_SIZE = 256
+# Enough for the last line of a journal, unless it is a huge one
+TAIL_BYTES = 16 * 1024
 
 
 class JournalEventTraverser:
-    def __init__(self, journal_path: str) -> None:
+    def __init__(
+        self,
+        journal_path: str,
+        event_filter: Optional[JournalFilter] = None,
+        decoder: Optional[str] = None,
+        dedupe_window: Optional[timedelta] = None,
+    ) -> None:
         self.journal_path = journal_path
+        self.event_filter = event_filter if event_filter else None
+        self.decoder, self.decode = get_decoder(decoder)
         self.observers: list[JournalObserver] = []
         self.parser = JournalEventParser()
+        # Defaults to TRADEMEDS_DEDUPE_WINDOW like the parser's settings
+        self.dedupe_window = dedupe_window or dedupe_window_from_env()
 
     def add_observer(self, observer: JournalObserver) -> None:
         self.observers.append(observer)
 
-    def traverse(self, max_sessions: int = 5) -> None:
-        sessions_found = 0
+    def journal_files(self) -> list[str]:
+        """Journal file names, newest first, leaving out copies of a file."""
+        return unique_journals(self.journal_path, list_journal_files(self.journal_path))
+
+    def read_lines(self, name: str) -> Iterator[str]:
+        """Raw lines of a single journal file or archive, newest first."""
+        path = os.path.join(self.journal_path, name)
+        if is_archive(name):
+            with JournalArchive(path) as archive:
+                yield from archive.reversed_lines()
+        else:
+            with open(path) as f:
+                yield from reversed(f.readlines())
+
+    def scan(self, name: str) -> Iterator[LineScan]:
+        """Timestamps and event types of a journal's lines, newest first.
+
+        Lines aren't decoded, which makes this much cheaper than reading
+        events when only times or session boundaries matter.
+        """
+        for line in self.read_lines(name):
+            scanned = scan_line(line)
+            if scanned is not None:
+                yield scanned
+
+    def newest_timestamp(self, name: str) -> Optional[datetime]:
+        """Time of the last line written to a journal, None if it has none."""
+        if not is_archive(name):
+            # Plain journals: look at the end first, not the whole file
+            with open(os.path.join(self.journal_path, name), "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - TAIL_BYTES))
+                lines = f.read().split(b"\n")
+            if size > TAIL_BYTES:
+                lines = lines[1:]  # the first one is probably cut
+            for line in reversed(lines):
+                scanned = scan_line(line.decode(errors="replace"))
+                if scanned is not None:
+                    return scanned.timestamp
+        return next((scanned.timestamp for scanned in self.scan(name)), None)
 
-        for dr in sorted(os.listdir(self.journal_path), reverse=True):
-            if not dr.startswith("Journal."):
+    def read_events(self, name: str) -> Iterator[GameEvent]:
+        """Parsed events of a single journal file, newest first."""
+        return self.parse_lines(self.read_lines(name))
+
+    def parse_lines(self, lines: Iterable[str]) -> Iterator[GameEvent]:
+        """Parsed events of raw journal lines that pass the event filter."""
+        event_filter = self.event_filter
+        for line in lines:
+            if event_filter is not None and not event_filter.accepts_line(line):
                 continue
 
-            if sessions_found >= max_sessions:
+            parsed_event = self.parser.parse_line(line, self.decode)
+            if parsed_event and (
+                event_filter is None or event_filter.accepts(parsed_event)
+            ):
+                yield parsed_event
+
+    def traverse(
+        self,
+        max_sessions: Optional[int] = 5,
+        since: Optional[datetime] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        blooms: Optional[BloomIndex] = None,
+        jobs: int = 1,
+    ) -> None:
+        """Feed journal events to observers, newest first.
+
+        Stops after `max_sessions` LoadGame boundaries (checked between journal
+        files) or at the first event older than `since`, whichever comes first.
+        With `checkpoints`, and only checkpointable observers, journals that
+        are unchanged since an earlier run are restored instead of parsed;
+        filtered traversals don't use checkpoints. A filtered traversal with
+        `blooms` skips journals that can't match, feeding only the events
+        every filter lets through, which the Bloom index keeps.
+
+        With `jobs` > 1 and only checkpointable observers, journals are reduced
+        in parallel worker processes and their snapshots restored in order.
+
+        With a `dedupe_window`, lines seen before in the traversal are
+        skipped (see `LineWindow`). That makes what a journal contributes
+        depend on the others, so it is read in this process and not
+        checkpointed.
+        """
+        checkpointable = [
+            observer
+            for observer in self.observers
+            if isinstance(observer, CheckpointableObserver)
+        ]
+        window = None
+        if self.dedupe_window is not None:
+            window = LineWindow(self.dedupe_window)
+            checkpoints, jobs = None, 1
+        if self.event_filter is not None:
+            checkpoints = None
+        if checkpointable == self.observers and (checkpoints is not None or jobs > 1):
+            self._traverse_mapped(
+                checkpointable, checkpoints, max_sessions, since, jobs
+            )
+            return
+
+        sessions_found = 0
+        file_observers = [
+            observer
+            for observer in self.observers
+            if isinstance(observer, JournalFileObserver)
+        ]
+
+        for dr in self.journal_files():
+            if max_sessions is not None and sessions_found >= max_sessions:
                 break
+            if since is not None and self._older_than(dr, since):
+                return
+
+            if file_observers:
+                journal = fingerprint(self.journal_path, dr)
+                for file_observer in file_observers:
+                    file_observer.handle_file(journal)
+
+            events: Iterable[GameEvent]
+            if (
+                blooms is not None
+                and self.event_filter is not None
+                and not blooms.may_match(self, dr, self.event_filter)
+            ):
+                events = self.parse_lines(_unseen(window, blooms.get(self, dr).passing))
+            elif window is not None:
+                events = self.parse_lines(_unseen(window, self.read_lines(dr)))
+            else:
+                events = self.read_events(dr)
+
+            batch: list[GameEvent] = []
+            for parsed_event in events:
+                if since is not None and parsed_event.timestamp < since:
+                    feed_events(self.observers, batch)
+                    return
+
+                if parsed_event.event == "LoadGame":
+                    sessions_found += 1
+
+                batch.append(parsed_event)
+                if len(batch) == BATCH_SIZE:
+                    feed_events(self.observers, batch)
+                    batch = []
+            feed_events(self.observers, batch)
+
+    def _older_than(self, name: str, since: datetime) -> bool:
+        if is_archive(name):
+            # Reading one stops after its newest block anyway
+            return False
+        newest = self.newest_timestamp(name)
+        return newest is not None and newest < since
+
+    def _traverse_mapped(
+        self,
+        observers: Sequence[CheckpointableObserver],
+        checkpoints: Optional[CheckpointStore],
+        max_sessions: Optional[int],
+        since: Optional[datetime],
+        jobs: int,
+    ) -> None:
+        """Reduce each journal to snapshots of fresh observers, then restore them.
+
+        Snapshots come from `checkpoints` when possible, the rest are mapped
+        in up to `jobs` worker processes a few journals ahead of the newest
+        one not yet restored.
+        """
+        if max_sessions is not None and max_sessions <= 0:
+            return
+
+        pool = ProcessPoolExecutor(jobs) if jobs > 1 else None
+        submit = pool.submit if pool is not None else _run_inline
+        names = iter(self.journal_files())
+        pending: deque[_MappedJournal] = deque()
+
+        def schedule(name: str) -> None:
+            journal = fingerprint(self.journal_path, name)
+            restored: dict[str, Checkpoint] = {}
+            for observer in observers:
+                checkpoint = (
+                    checkpoints.get(journal, observer.checkpoint_key)
+                    if checkpoints is not None
+                    else None
+                )
+                if checkpoint is not None and (
+                    since is None
+                    or checkpoint.first_event_at is None
+                    or checkpoint.first_event_at >= since
+                ):
+                    restored[observer.checkpoint_key] = checkpoint
+
+            missing = [o for o in observers if o.checkpoint_key not in restored]
+            mapped = None
+            if missing:
+                # Pickled here so an unpicklable observer fails in this process
+                # instead of in the pool's feeder thread
+                fresh = pickle.dumps([observer.fresh() for observer in missing])
+                mapped = submit(
+                    map_journal,
+                    self.journal_path,
+                    self.event_filter,
+                    self.decoder,
+                    journal,
+                    fresh,
+                    since,
+                )
+            pending.append(_MappedJournal(journal, restored, missing, mapped))
+
+        failed = True
+        try:
+            for name in islice(names, 2 * jobs if pool is not None else 1):
+                schedule(name)
+
+            sessions_found = 0
+            while pending:
+                journal, restored, missing, mapped = pending.popleft()
+                stopped = False
+                if mapped is not None:
+                    mapped_checkpoints, stopped = mapped.result()
+                    for observer, checkpoint in zip(missing, mapped_checkpoints):
+                        restored[observer.checkpoint_key] = checkpoint
+                        if checkpoints is not None and not stopped:
+                            checkpoints.put(
+                                journal, observer.checkpoint_key, checkpoint
+                            )
+
+                for observer in observers:
+                    observer.restore(restored[observer.checkpoint_key].snapshot)
+                sessions_found += restored[observers[0].checkpoint_key].load_games
+
+                if stopped or (
+                    max_sessions is not None and sessions_found >= max_sessions
+                ):
+                    break
+                next_name = next(names, None)
+                if next_name is not None:
+                    schedule(next_name)
+            failed = False
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=not failed, cancel_futures=True)
+
+
+def feed_events(observers: Sequence[JournalObserver], events: list[GameEvent]) -> None:
+    """Hand a run of events to observers, in one call to those that batch."""
+    if not events:
+        return
+    for observer in observers:
+        if isinstance(observer, BatchObserver):
+            observer.handle_events(events)
+        else:
+            handle_event = observer.handle_event
+            for event in events:
+                handle_event(event)
+
+
+def _unseen(window: Optional[LineWindow], lines: Iterable[str]) -> Iterable[str]:
+    if window is None:
+        return lines
+    return (line for line in lines if not window.seen(line))
+
+
+class _MappedJournal(NamedTuple):
+    journal: JournalFingerprint
+    restored: dict[str, Checkpoint]
+    missing: list[CheckpointableObserver]
+    mapped: Optional["Future[tuple[list[Checkpoint], bool]]"]
+
+
+def _run_inline(
+    fn: Callable[..., tuple[list[Checkpoint], bool]], *args: Any
+) -> "Future[tuple[list[Checkpoint], bool]]":
+    future: Future[tuple[list[Checkpoint], bool]] = Future()
+    future.set_result(fn(*args))
+    return future
+
+
+def map_journal(
+    journal_path: str,
+    event_filter: Optional[JournalFilter],
+    decoder: str,
+    journal: JournalFingerprint,
+    fresh: bytes,
+    since: Optional[datetime],
+) -> tuple[list[Checkpoint], bool]:
+    """Feed one journal to pickled fresh observers and snapshot them.
+
+    Runs in worker processes, so it only takes picklable arguments. Returns
+    a checkpoint per observer and whether `since` cut the journal short.
+    """
+    observers: list[CheckpointableObserver] = pickle.loads(fresh)
+    traverser = JournalEventTraverser(journal_path, event_filter, decoder)
+    for observer in observers:
+        if isinstance(observer, JournalFileObserver):
+            observer.handle_file(journal)
+
+    load_games = 0
+    first_event_at: Optional[datetime] = None
+    # A journal entirely older than `since` isn't read at all
+    stopped = since is not None and traverser._older_than(journal.name, since)
+    events = iter(()) if stopped else traverser.read_events(journal.name)
+    batch: list[GameEvent] = []
+    for parsed_event in events:
+        if since is not None and parsed_event.timestamp < since:
+            stopped = True
+            break
 
-            with open(os.path.join(self.journal_path, dr)) as f:
-                for line in reversed(f.readlines()):
-                    raw_event = json.loads(line.strip())
+        if parsed_event.event == "LoadGame":
+            load_games += 1
+        first_event_at = parsed_event.timestamp
 
-                    parsed_event = self.parser.parse(raw_event)
-                    if parsed_event:
-                        if parsed_event.event == "LoadGame":
-                            sessions_found += 1
+        batch.append(parsed_event)
+        if len(batch) == BATCH_SIZE:
+            feed_events(observers, batch)
+            batch = []
+    feed_events(observers, batch)
 
-                        for observer in self.observers:
-                            observer.handle_event(parsed_event)
+    checkpoints = [
+        Checkpoint(
+            load_games=load_games,
+            first_event_at=first_event_at,
+            snapshot=observer.snapshot(),
+        )
+        for observer in observers
+    ]
+    return checkpoints, stopped
@@ -1,18 +1,93 @@
 import os
+import sys
 import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from itertools import chain, islice
+from urllib.parse import quote
+from typing import TYPE_CHECKING, Iterable, cast
 from .journal import JournalEventTraverser
-from .observers.cargo import VitalsCargoSessionCollector
-from .observers.incomplete_cargo import IncompleteCargoTracker
+from .journal.archive import CODECS, archive_journals
+from .journal.bloom import BLOOM_FPR_ENV, BloomIndex
+from .journal.checkpoints import CheckpointStore
+from .journal.decoders import BACKENDS, DECODER_ENV
+from .journal.dedup import DEDUPE_ENV
+from .journal.filters import JournalFilter
+from .journal.parser import PARSE_MODES, PARSER_ENV
+from .journal.scan import parse_duration
+from .journal.shadow import SHADOW_ENV
+from .journal.status import StatusWatcher
+from .journal.tail import JournalTail
+from .observers.cargo import VitalsCargoSessionCollector, merge_sessions
+from .observers.dashboard import DashboardState
+from .observers.incomplete_cargo import (
+    IncompleteCargoTracker,
+    advance_pending,
+    mission_commodity,
+)
+from .observers.trade_loop import TradeLoopCollector
+from .overlay import SEGMENT_NAME
+from .overlay.publisher import StatePublisher, live_state
 from .viewers.session import SessionView
 from .viewers.pending_cargo import PendingCargoView
+from .viewers.hold import HoldView
+from .models.hold import HoldReport, parse_cargo, parse_market, reconcile
+from .viewers.impact import ImpactView
+from .models.entities import CargoSession
+from .models.impact import ImpactAggregate
+from .store.impact import ImpactCache
+from .store.sessions import SessionStore, collect_sessions
+from .store.spool import parse_size
+from .squadron import IngestServer, JournalPusher
+from .store.influence import InfluenceIndex
+from .store.prices import PriceIndex
+from .viewers.influence import InfluenceView
+from .viewers.throughput import ThroughputView
+from .viewers.records import FORMATS, Record, RecordWriter
 
 journal_path = os.path.join(
     os.environ["USERPROFILE"], "Saved Games\\Frontier Developments\\Elite Dangerous\\"
 )
+cache_path = os.path.join(os.environ["LOCALAPPDATA"], "trademeds")
+
+if TYPE_CHECKING:
+    from .journal.archive import Codec
+    from .viewers.records import OutputFormat
+    from .store.trades import GroupBy
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Process Elite Dangerous sessions.")
+    parser.add_argument(
+        "--json-decoder",
+        choices=("auto",) + BACKENDS,
+        default=None,
+        help=f"JSON library decoding journal lines (default: ${DECODER_ENV} or auto, the fastest installed)",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=PARSE_MODES,
+        default=None,
+        help=f"How journal lines are parsed (default: ${PARSER_ENV} or validate)",
+    )
+    parser.add_argument(
+        "--shadow-sample",
+        type=float,
+        default=None,
+        help="Share of lines, 0 to 1, the fast parser checks against the validating one",
+    )
+    parser.add_argument(
+        "--dedupe-window",
+        default=None,
+        help="Skip journal lines repeated within this time window, like 24h (for copied journal folders)",
+    )
+    parser.add_argument(
+        "--bloom-fpr",
+        type=float,
+        default=None,
+        help=f"False-positive rate of the per-journal Bloom filters, 0 to 1 (default: ${BLOOM_FPR_ENV} or 0.01)",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     # Session summary command
@@ -29,6 +104,9 @@ def main() -> None:
         default=0,
         help="Number of sessions to combine into one (useful when you need to relog during a trading run)",
     )
+    add_filter_arguments(sessions_parser)
+    add_memory_argument(sessions_parser)
+    add_format_argument(sessions_parser)
 
     # Incomplete cargo command
     pending_cargo_parser = subparsers.add_parser(
@@ -40,32 +118,635 @@ def main() -> None:
         default=10,
         help="Number of recent sessions to analyze",
     )
+    pending_cargo_parser.add_argument(
+        "--expiring-within",
+        type=parse_duration,
+        default=None,
+        help="Only show missions expiring within this time, like 2h or 30m",
+    )
+    add_jobs_argument(pending_cargo_parser)
+    add_filter_arguments(pending_cargo_parser)
+    add_format_argument(pending_cargo_parser)
+
+    # Hold against pending cargo command
+    hold_parser = subparsers.add_parser(
+        "hold", help="Show loaded and still owed cargo per destination"
+    )
+    hold_parser.add_argument(
+        "--depth",
+        type=int,
+        default=10,
+        help="Number of recent sessions to look for pending cargo missions",
+    )
+    hold_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and show the hold again whenever it changes",
+    )
+    hold_parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between checks for changes with --watch",
+    )
+    add_format_argument(hold_parser)
+
+    # Hauling throughput command
+    throughput_parser = subparsers.add_parser(
+        "throughput", help="Show tons and credits per hour of trade loops"
+    )
+    throughput_parser.add_argument(
+        "--sessions",
+        type=int,
+        default=5,
+        help="Number of game sessions to show",
+    )
+    add_format_argument(throughput_parser)
+
+    # Live dashboard command
+    dashboard_parser = subparsers.add_parser(
+        "dashboard", help="Follow the live session in a terminal dashboard"
+    )
+    dashboard_parser.add_argument(
+        "--depth",
+        type=int,
+        default=10,
+        help="Number of recent sessions to look for pending cargo missions",
+    )
+
+    # Shared memory publisher command
+    publish_parser = subparsers.add_parser(
+        "publish",
+        help="Follow the live session and publish it to shared memory for overlays",
+    )
+    publish_parser.add_argument(
+        "--depth",
+        type=int,
+        default=10,
+        help="Number of recent sessions to look for pending cargo missions",
+    )
+    publish_parser.add_argument(
+        "--name",
+        default=SEGMENT_NAME,
+        help=f"Name of the shared memory segment (default: {SEGMENT_NAME})",
+    )
+    publish_parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between journal polls",
+    )
+
+    # Faction impact command
+    impact_parser = subparsers.add_parser(
+        "impact", help="Summarise VITALS faction impact over several weeks"
+    )
+    impact_parser.add_argument(
+        "--weeks",
+        type=int,
+        default=1,
+        help="Number of weeks of sessions to summarise",
+    )
+    add_jobs_argument(impact_parser)
+    add_memory_argument(impact_parser)
+    add_format_argument(impact_parser)
+
+    # System influence command
+    influence_parser = subparsers.add_parser(
+        "influence", help="Show influence delivered to a faction per system"
+    )
+    influence_parser.add_argument(
+        "--faction", required=True, help="Faction that received the influence"
+    )
+    influence_parser.add_argument(
+        "--system", default=None, help="Only show influence in this star system"
+    )
+    influence_parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        default=None,
+        help="Only count missions completed on or after this date (YYYY-MM-DD)",
+    )
+    add_format_argument(influence_parser)
+
+    # Market trade statistics command
+    stats_parser = subparsers.add_parser(
+        "stats", help="Show market trade volumes and profit from the trade history"
+    )
+    stats_parser.add_argument(
+        "--by",
+        choices=["day", "commodity", "market"],
+        default="commodity",
+        help="How to group the trades",
+    )
+    stats_parser.add_argument(
+        "--days",
+        type=int,
+        default=None,
+        help="Only include trades from the last N days",
+    )
+    add_format_argument(stats_parser)
+
+    # Squadron ingest server command
+    serve_parser = subparsers.add_parser(
+        "serve", help="Collect journal events uploaded by squadron members"
+    )
+    serve_parser.add_argument("--host", default="0.0.0.0", help="Address to listen on")
+    serve_parser.add_argument(
+        "--port", type=int, default=8765, help="Port to listen on"
+    )
+    serve_parser.add_argument(
+        "--data",
+        default=os.path.join(cache_path, "squadron"),
+        help="Directory of the write-ahead log of uploaded events",
+    )
+    serve_parser.add_argument(
+        "--depth",
+        type=int,
+        default=10,
+        help="Number of recent sessions to look for pending cargo missions",
+    )
+
+    # Upload journal events command
+    push_parser = subparsers.add_parser(
+        "push", help="Upload your journal events to a squadron ingest server"
+    )
+    push_parser.add_argument(
+        "url", help="Server address, e.g. http://192.168.1.10:8765"
+    )
+    push_parser.add_argument(
+        "--commander",
+        default=None,
+        help="Commander name to upload as (default: from the newest LoadGame)",
+    )
+
+    # Journal archive command
+    archive_parser = subparsers.add_parser(
+        "archive", help="Compress old journal files in place"
+    )
+    archive_parser.add_argument(
+        "--days",
+        type=int,
+        default=30,
+        help="Only archive journals last written more than N days ago",
+    )
+    archive_parser.add_argument(
+        "--codec",
+        choices=sorted(CODECS),
+        default="lzma",
+        help="Compression to use for the archived journals",
+    )
 
     args = parser.parse_args()
+    if args.json_decoder is not None:
+        # Through the environment so journal reading worker processes use it too
+        os.environ[DECODER_ENV] = args.json_decoder
+    if args.parser is not None:
+        os.environ[PARSER_ENV] = args.parser
+    if args.shadow_sample is not None:
+        os.environ[SHADOW_ENV] = str(args.shadow_sample)
+    if args.dedupe_window is not None:
+        os.environ[DEDUPE_ENV] = args.dedupe_window
+    if args.bloom_fpr is not None:
+        os.environ[BLOOM_FPR_ENV] = str(args.bloom_fpr)
 
     if args.command == "sessions":
-        show_sessions(args.sessions, args.merges)
+        show_sessions(
+            args.sessions,
+            args.merges,
+            filter_from_args(args),
+            args.max_memory,
+            args.output_format,
+        )
     elif args.command == "pending-cargo":
-        show_incomplete_cargo(args.depth)
+        show_incomplete_cargo(
+            args.depth,
+            args.expiring_within,
+            filter_from_args(args),
+            args.jobs,
+            args.output_format,
+        )
+    elif args.command == "hold":
+        show_hold(args.depth, args.watch, args.interval, args.output_format)
+    elif args.command == "throughput":
+        show_throughput(args.sessions, args.output_format)
+    elif args.command == "dashboard":
+        show_dashboard(args.depth)
+    elif args.command == "publish":
+        publish(args.depth, args.name, args.interval)
+    elif args.command == "impact":
+        show_impact(args.weeks, args.jobs, args.max_memory, args.output_format)
+    elif args.command == "influence":
+        show_influence(args.faction, args.system, args.since, args.output_format)
+    elif args.command == "stats":
+        show_stats(args.by, args.days, args.output_format)
+    elif args.command == "serve":
+        serve(args.host, args.port, args.data, args.depth)
+    elif args.command == "push":
+        push(args.url, args.commander)
+    elif args.command == "archive":
+        archive(args.days, args.codec)
 
 
-def show_sessions(sessions: int, merges: int) -> None:
-    traverser = JournalEventTraverser(journal_path)
-    collector = VitalsCargoSessionCollector(merges=merges)
+def add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--faction", default=None, help="Only include events about this faction"
+    )
+    parser.add_argument(
+        "--system", default=None, help="Only include events about this star system"
+    )
+    parser.add_argument(
+        "--commodity", default=None, help="Only include events about this commodity"
+    )
+    parser.add_argument(
+        "--mission",
+        type=int,
+        default=None,
+        help="Only include events about this mission ID",
+    )
+    parser.add_argument(
+        "--market", type=int, default=None, help="Only include events at this market ID"
+    )
+
+
+def add_jobs_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes reading journal files in parallel",
+    )
+
+
+def add_memory_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--max-memory",
+        type=parse_size,
+        default=None,
+        help="Move closed sessions to a temporary database beyond this size, e.g. 256M",
+    )
+
+
+def add_format_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=FORMATS,
+        default="text",
+        help="Output as text, one JSON record per line (ndjson) or one JSON array",
+    )
+
+
+def write_records(records: Iterable[Record], output_format: "OutputFormat") -> None:
+    assert output_format != "text"
+    with RecordWriter(sys.stdout.buffer, output_format) as writer:
+        writer.write_all(records)
+
+
+def filter_from_args(args: argparse.Namespace) -> JournalFilter:
+    return JournalFilter(
+        faction=args.faction,
+        system=args.system,
+        commodity=args.commodity,
+        mission=args.mission,
+        market=args.market,
+    )
+
+
+def show_sessions(
+    sessions: int,
+    merges: int,
+    event_filter: JournalFilter,
+    max_memory: int | None,
+    output_format: "OutputFormat",
+) -> None:
+    if event_filter:
+        # Stored sessions are unfiltered, filtered scans skip most lines anyway
+        traverser = JournalEventTraverser(journal_path, event_filter)
+        collector = VitalsCargoSessionCollector(max_memory=max_memory)
+        traverser.add_observer(collector)
+        traverser.traverse(
+            max_sessions=sessions + merges,
+            blooms=BloomIndex(os.path.join(cache_path, "blooms")),
+        )
+        recent, markets = collector.sessions, collector.markets
+    else:
+        store = SessionStore(os.path.join(cache_path, "sessions.sqlite3"), journal_path)
+        try:
+            recent, markets = collect_sessions(store, sessions + merges, max_memory)
+        finally:
+            store.close()
+
+    try:
+        # Streamed, spilled sessions are only read back one at a time
+        shown: Iterable[CargoSession] = islice(recent, sessions)
+        if merges:
+            shown = chain(
+                [merge_sessions(recent[: merges + 1])],
+                islice(recent, merges + 1, sessions + merges),
+            )
+
+        if event_filter.system is not None:
+            shown = (
+                event_filter.restrict_trades(session, markets) for session in shown
+            )
+
+        view = SessionView(markets)
+        if output_format == "text":
+            view.display_sessions(shown)
+        else:
+            write_records(view.records(shown), output_format)
+    finally:
+        recent.close()
+
+
+def show_incomplete_cargo(
+    depth: int,
+    expiring_within: timedelta | None,
+    event_filter: JournalFilter,
+    jobs: int,
+    output_format: "OutputFormat",
+) -> None:
+    traverser = JournalEventTraverser(journal_path, event_filter)
+    collector = IncompleteCargoTracker(depth=depth)
     traverser.add_observer(collector)
 
-    traverser.traverse(max_sessions=sessions)
+    checkpoints = CheckpointStore(os.path.join(cache_path, "checkpoints.sqlite3"))
+    try:
+        traverser.traverse(
+            max_sessions=depth,
+            checkpoints=checkpoints,
+            blooms=BloomIndex(os.path.join(cache_path, "blooms")),
+            jobs=jobs,
+        )
+    finally:
+        checkpoints.close()
+
+    now = datetime.now(timezone.utc)
+    missions = collector.missions
+    if expiring_within is not None:
+        missions = {
+            mission.mission_id: mission
+            for mission in collector.expiries.due(missions, now + expiring_within)
+        }
+
+    sources = {}
+    if missions:
+        # Suggestions come from the whole buy history; its index is only
+        # brought up to date when there's something to suggest
+        prices = PriceIndex(os.path.join(cache_path, "prices.sqlite3"))
+        try:
+            prices.update(JournalEventTraverser(journal_path))
+            sources = prices.suggest(
+                {mission_commodity(mission) for mission in missions.values()}
+            )
+        finally:
+            prices.close()
+
+    view = PendingCargoView(missions, sources)
+    if output_format == "text":
+        view.display(now)
+    else:
+        write_records(view.records(), output_format)
 
-    view = SessionView(collector.markets)
-    view.display_sessions(collector.sessions[:sessions])
 
+def hold_report(status: StatusWatcher, tracker: IncompleteCargoTracker) -> HoldReport:
+    cargo, market = status.cargo.data, status.market.data
+    return reconcile(
+        parse_cargo(cargo) if cargo is not None else [],
+        tracker.missions,
+        parse_market(market) if market is not None else None,
+    )
+
+
+def show_hold(
+    depth: int, watch: bool, interval: float, output_format: "OutputFormat"
+) -> None:
+    # Events written while the history is read are applied again, harmlessly
+    tail = JournalTail(journal_path)
+    tail.seek_end()
 
-def show_incomplete_cargo(depth: int) -> None:
     traverser = JournalEventTraverser(journal_path)
-    collector = IncompleteCargoTracker(depth=depth)
+    tracker = IncompleteCargoTracker(depth=depth)
+    traverser.add_observer(tracker)
+    checkpoints = CheckpointStore(os.path.join(cache_path, "checkpoints.sqlite3"))
+    try:
+        traverser.traverse(
+            max_sessions=depth,
+            checkpoints=checkpoints,
+            blooms=BloomIndex(os.path.join(cache_path, "blooms")),
+        )
+    finally:
+        checkpoints.close()
+
+    status = StatusWatcher(journal_path)
+    status.poll()
+    changed = True
+    try:
+        while True:
+            if changed:
+                view = HoldView(hold_report(status, tracker))
+                now = datetime.now(timezone.utc)
+                if output_format == "text":
+                    view.display(now.astimezone())
+                else:
+                    write_records(view.records(now), output_format)
+            if not watch:
+                return
+
+            # Only stats until the game writes something
+            time.sleep(interval)
+            changed = status.poll()
+            for event in tail.poll():
+                changed |= advance_pending(tracker.missions, event)
+    except KeyboardInterrupt:
+        pass
+
+
+def show_throughput(sessions: int, output_format: "OutputFormat") -> None:
+    traverser = JournalEventTraverser(journal_path)
+    collector = TradeLoopCollector()
     traverser.add_observer(collector)
+    traverser.traverse(max_sessions=sessions)
+
+    # Rolling rates only mean something while the newest session is running
+    now = datetime.now(timezone.utc)
+    live = collector.live.rates(now) if collector.live is not None else []
+    view = ThroughputView(collector.sessions, live)
+    if output_format == "text":
+        view.display(now)
+    else:
+        write_records(view.records(now), output_format)
+
+
+def show_dashboard(depth: int) -> None:
+    try:
+        import curses
+        from .viewers.dashboard import run_dashboard
+    except ImportError:
+        raise SystemExit(
+            "The dashboard command needs curses, on Windows install it with: pip install windows-curses"
+        )
+
+    state, tail = live_session(depth)
+    curses.wrapper(run_dashboard, state, tail)
 
+
+def live_session(depth: int) -> tuple[DashboardState, JournalTail]:
+    """State of the live session, and a tail to follow it with."""
+    traverser = JournalEventTraverser(journal_path)
+    sessions = VitalsCargoSessionCollector()
+    cargo = IncompleteCargoTracker(depth=depth)
+    trades = TradeLoopCollector()
+    for observer in (sessions, cargo, trades):
+        traverser.add_observer(observer)
     traverser.traverse(max_sessions=depth)
 
-    view = PendingCargoView(collector.missions)
-    view.display()
+    tail = JournalTail(journal_path)
+    tail.seek_end()
+    state = DashboardState(
+        sessions.markets,
+        sessions.sessions[0] if sessions.sessions else None,
+        cargo.missions,
+        trades.live,
+    )
+    return state, tail
+
+
+def publish(depth: int, name: str, interval: float) -> None:
+    state, tail = live_session(depth)
+    with StatePublisher(name) as publisher:
+        print(f"Publishing the live session to shared memory {name!r}, Ctrl+C to stop")
+        try:
+            while True:
+                # Published every poll, the throughput windows move with time
+                publisher.publish(live_state(state, datetime.now(timezone.utc)))
+                time.sleep(interval)
+                for event in tail.poll():
+                    state.handle_event(event)
+        except KeyboardInterrupt:
+            pass
+
+
+def show_impact(
+    weeks: int, jobs: int, max_memory: int | None, output_format: "OutputFormat"
+) -> None:
+    since = datetime.now(timezone.utc) - timedelta(weeks=weeks)
+    cache = ImpactCache(os.path.join(cache_path, "impact.json"))
+    cache.load()
+
+    # Closed sessions older than the resume point are already cached
+    resume_at = cache.resume_point(since)
+    traverser = JournalEventTraverser(journal_path)
+    collector = VitalsCargoSessionCollector(max_memory=max_memory)
+    traverser.add_observer(collector)
+
+    checkpoints = CheckpointStore(os.path.join(cache_path, "checkpoints.sqlite3"))
+    try:
+        traverser.traverse(
+            max_sessions=None, since=resume_at, checkpoints=checkpoints, jobs=jobs
+        )
+    finally:
+        checkpoints.close()
+
+    aggregate = ImpactAggregate()
+    for i, session in enumerate(collector.sessions):
+        if i == 0:  # the live session may still change, it isn't cached
+            aggregate.merge(ImpactAggregate.from_session(session))
+        else:
+            aggregate.merge(cache.aggregate(session))
+    collector.sessions.close()
+
+    cached = cache.aggregates_between(since, resume_at)
+    for cached_aggregate in cached:
+        aggregate.merge(cached_aggregate)
+
+    cache.mark_covered(since)
+    cache.save()
+
+    view = ImpactView(aggregate)
+    sessions = len(collector.sessions) + len(cached)
+    if output_format == "text":
+        view.display(since, sessions)
+    else:
+        write_records(view.records(since, sessions), output_format)
+
+
+def show_influence(
+    faction: str,
+    system: str | None,
+    since: date | None,
+    output_format: "OutputFormat",
+) -> None:
+    index = InfluenceIndex(os.path.join(cache_path, "influence.sqlite3"))
+    try:
+        index.update(JournalEventTraverser(journal_path))
+        totals = index.query(faction, system=system, since=since)
+    finally:
+        index.close()
+
+    view = InfluenceView(faction, totals)
+    if output_format == "text":
+        view.display(since)
+    else:
+        write_records(view.records(), output_format)
+
+
+def show_stats(by: str, days: int | None, output_format: "OutputFormat") -> None:
+    try:
+        from .store.trades import TradeStore
+        from .viewers.stats import TradeStatsView
+    except ImportError:
+        raise SystemExit(
+            "The stats command needs numpy, install it with: poetry install --extras stats"
+        )
+
+    store = TradeStore(os.path.join(cache_path, "trades"))
+    store.update(JournalEventTraverser(journal_path))
+
+    since = None
+    if days is not None:
+        since = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
+
+    group_by = cast("GroupBy", by)
+    view = TradeStatsView(store, store.stats(group_by, since=since), group_by)
+    if output_format == "text":
+        view.display()
+    else:
+        write_records(view.records(), output_format)
+
+
+def serve(host: str, port: int, data_path: str, depth: int) -> None:
+    server = IngestServer(data_path, depth=depth)
+    print(
+        f"Listening on {host}:{port}, {server.wal.entries:,} events"
+        f" of {len(server.state.commanders())} commanders logged"
+    )
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.wal.close()
+
+
+def push(url: str, commander: str | None) -> None:
+    pusher = JournalPusher(
+        journal_path,
+        url,
+        os.path.join(cache_path, "push", f"{quote(url, safe='')}.json"),
+    )
+    commander = commander or pusher.commander()
+    if commander is None:
+        raise SystemExit("No LoadGame event with a commander name, pass --commander")
+    totals = pusher.push(commander)
+    print(
+        f"Uploaded {totals['accepted']:,} new events as {commander}"
+        f" ({totals['duplicates']:,} already on the server)"
+    )
+
+
+def archive(days: int, codec: str) -> None:
+    older_than = datetime.now(timezone.utc) - timedelta(days=days)
+    archived = archive_journals(journal_path, older_than, cast("Codec", codec))
+    print(f"Archived {len(archived)} journal files")
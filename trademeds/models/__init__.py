@@ -5,6 +5,14 @@ from .entities import (
     DonationMission,
     Mission,
     MissionFactionEffect,
+    InfluenceRecord,
+)
+from .impact import (
+    ImpactAggregate,
+    MissionSummary,
+    CargoMissionSummary,
+    DonationMissionSummary,
+    GenericMissionSummary,
 )
 
 __all__ = [
@@ -14,4 +22,10 @@ __all__ = [
     "DonationMission",
     "Mission",
     "MissionFactionEffect",
+    "InfluenceRecord",
+    "ImpactAggregate",
+    "MissionSummary",
+    "CargoMissionSummary",
+    "DonationMissionSummary",
+    "GenericMissionSummary",
 ]
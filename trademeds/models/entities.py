@@ -20,6 +20,21 @@ class MissionFactionEffect:
     trend: str
 
 
+@dataclass(kw_only=True, frozen=True, slots=True)
+class InfluenceRecord:
+    """Influence delivered to a faction in one system by one completed mission."""
+
+    timestamp: datetime
+    system_address: int
+    faction: str
+    pluses: int
+    trend: str
+
+    @property
+    def signed_pluses(self) -> int:
+        return -self.pluses if self.trend.startswith("Down") else self.pluses
+
+
 @dataclass(kw_only=True, frozen=True)
 class Mission:
     mission_id: int
@@ -28,6 +43,9 @@ class Mission:
     faction: str
     complete: bool = False
     effects: List[MissionFactionEffect] = field(default_factory=list)
+    influence: Dict[str, int] = field(
+        default_factory=dict
+    )  # faction -> number of "+" delivered across all systems
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -43,16 +61,21 @@ class DonationMission(Mission):
     donated: int
 
 
+def goods_counter() -> defaultdict[str, int]:
+    """Per-market goods counts; a named factory keeps sessions picklable."""
+    return defaultdict(int)
+
+
 @dataclass(kw_only=True, frozen=True)
 class CargoSession:
     started_at: datetime
     ended_at: datetime
     missions: Dict[int, Mission] = field(default_factory=dict)
     sold: Dict[int, Dict[str, int]] = field(
-        default_factory=lambda: defaultdict(lambda: defaultdict(int))
+        default_factory=lambda: defaultdict(goods_counter)
     )
     bought: Dict[int, Dict[str, int]] = field(
-        default_factory=lambda: defaultdict(lambda: defaultdict(int))
+        default_factory=lambda: defaultdict(goods_counter)
     )
 
 
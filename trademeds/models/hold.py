@@ -0,0 +1,139 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+from ..journal.filters import commodity_key
+from ..observers.incomplete_cargo import IncompleteMission, mission_commodity
+from .entities import Market
+
+
+@dataclass(kw_only=True, frozen=True)
+class HoldItem:
+    commodity: str  # commodity_key of the good
+    name: str
+    count: int
+    mission_id: Optional[int] = None  # cargo handed out for a mission
+
+
+@dataclass(kw_only=True, frozen=True)
+class MarketGood:
+    commodity: str
+    name: str
+    buy_price: int
+    stock: int
+
+
+@dataclass(kw_only=True, frozen=True)
+class Delivery:
+    """Cargo owed to one destination system, and how much of it is loaded."""
+
+    system: str
+    good: str
+    owed: int
+    loaded: int
+
+    @property
+    def short(self) -> int:
+        return self.owed - self.loaded
+
+
+@dataclass(kw_only=True, frozen=True)
+class HoldReport:
+    deliveries: list[Delivery]  # by system, then good
+    spare: dict[str, int]  # good -> tons in the hold no pending mission needs
+    market: Optional[Market] = None  # where the game last opened the market
+    available: dict[str, MarketGood] = field(
+        default_factory=dict
+    )  # good -> what the market sells of the goods still short
+
+
+def parse_cargo(cargo: dict[str, Any]) -> list[HoldItem]:
+    """Items of the ship's hold from Cargo.json."""
+    if cargo.get("Vessel", "Ship") != "Ship":
+        return []  # the SRV's cargo
+    return [
+        HoldItem(
+            commodity=commodity_key(item["Name"]),
+            name=item.get("Name_Localised") or item["Name"],
+            count=item["Count"],
+            mission_id=item.get("MissionID"),
+        )
+        for item in cargo.get("Inventory", [])
+    ]
+
+
+def parse_market(market: dict[str, Any]) -> tuple[Market, dict[str, MarketGood]]:
+    """The market from Market.json and the goods it sells by commodity key."""
+    goods = {}
+    for item in market.get("Items", []):
+        key = commodity_key(item["Name"])
+        goods[key] = MarketGood(
+            commodity=key,
+            name=item.get("Name_Localised") or item["Name"],
+            buy_price=item.get("BuyPrice", 0),
+            stock=item.get("Stock", 0),
+        )
+    return (
+        Market(
+            market_id=market["MarketID"],
+            station_name=market["StationName"],
+            system_name=market["StarSystem"],
+            is_carrier=market.get("StationType") == "FleetCarrier",
+        ),
+        goods,
+    )
+
+
+def reconcile(
+    items: Iterable[HoldItem],
+    missions: dict[int, IncompleteMission],
+    market: Optional[tuple[Market, dict[str, MarketGood]]] = None,
+) -> HoldReport:
+    """Split the hold between the pending missions.
+
+    Cargo handed out for a mission counts towards that mission; the rest of
+    a good is shared out over the missions needing it, by destination name
+    and then mission ID.
+    """
+    for_mission: Counter[int] = Counter()
+    free: Counter[str] = Counter()
+    names: dict[str, str] = {}
+    for item in items:
+        names.setdefault(item.commodity, item.name)
+        if item.mission_id is not None and item.mission_id in missions:
+            for_mission[item.mission_id] += item.count
+        else:
+            free[item.commodity] += item.count
+
+    totals: dict[tuple[str, str], list[int]] = {}  # (system, good) -> owed, loaded
+    short: dict[str, str] = {}  # good -> commodity key
+    for mission in sorted(missions.values(), key=lambda m: (m.system, m.mission_id)):
+        key = mission_commodity(mission)
+        loaded = min(mission.count, for_mission[mission.mission_id])
+        shared = min(mission.count - loaded, free[key])
+        free[key] -= shared
+        loaded += shared
+
+        total = totals.setdefault((mission.system, mission.good), [0, 0])
+        total[0] += mission.count
+        total[1] += loaded
+        if loaded < mission.count:
+            short[mission.good] = key
+
+    market_goods = market[1] if market is not None else {}
+    return HoldReport(
+        deliveries=[
+            Delivery(system=system, good=good, owed=owed, loaded=loaded)
+            for (system, good), (owed, loaded) in sorted(totals.items())
+        ],
+        spare={
+            (market_goods[key].name if key in market_goods else names[key]): count
+            for key, count in sorted(free.items())
+            if count > 0
+        },
+        market=market[0] if market is not None else None,
+        available={
+            good: market_goods[key]
+            for good, key in sorted(short.items())
+            if key in market_goods and market_goods[key].stock > 0
+        },
+    )
@@ -0,0 +1,187 @@
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Type
+from .entities import (
+    CargoMission,
+    CargoSession,
+    DonationMission,
+    GenericMission,
+    Mission,
+)
+
+
+@dataclass
+class MissionSummary:
+    """Mergeable counters for every mission of one type given by one faction."""
+
+    kind = "generic"
+
+    count: int = 0
+    effects: Counter[str] = field(default_factory=Counter)
+    aux_effects: defaultdict[str, Counter[str]] = field(
+        default_factory=lambda: defaultdict(Counter)
+    )
+    influence: int = 0
+    aux_influence: Counter[str] = field(default_factory=Counter)
+
+    def add(self, mission: Mission) -> None:
+        self.count += 1
+
+        for faction_effect in mission.effects:
+            if faction_effect.faction == mission.faction:
+                self.effects[faction_effect.effect] += 1
+            else:
+                self.aux_effects[faction_effect.faction][faction_effect.effect] += 1
+
+        for faction, pluses in mission.influence.items():
+            if faction == mission.faction:
+                self.influence += pluses
+            else:
+                self.aux_influence[faction] += pluses
+
+    def merge(self, other: "MissionSummary") -> None:
+        self.count += other.count
+        self.effects.update(other.effects)
+        for faction, effects in other.aux_effects.items():
+            self.aux_effects[faction].update(effects)
+        self.influence += other.influence
+        self.aux_influence.update(other.aux_influence)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "count": self.count,
+            "effects": dict(self.effects),
+            "aux_effects": {f: dict(e) for f, e in self.aux_effects.items()},
+            "influence": self.influence,
+            "aux_influence": dict(self.aux_influence),
+        }
+
+    def _load(self, data: dict[str, Any]) -> None:
+        self.count = data["count"]
+        self.effects = Counter(data["effects"])
+        for faction, effects in data["aux_effects"].items():
+            self.aux_effects[faction] = Counter(effects)
+        self.influence = data["influence"]
+        self.aux_influence = Counter(data["aux_influence"])
+
+
+@dataclass
+class CargoMissionSummary(MissionSummary):
+    kind = "cargo"
+
+    goods: Counter[str] = field(default_factory=Counter)
+
+    def add(self, mission: Mission) -> None:
+        assert isinstance(mission, CargoMission)
+        super().add(mission)
+        self.goods[mission.good] += mission.count
+
+    def merge(self, other: MissionSummary) -> None:
+        assert isinstance(other, CargoMissionSummary)
+        super().merge(other)
+        self.goods.update(other.goods)
+
+    def to_dict(self) -> dict[str, Any]:
+        return super().to_dict() | {"goods": dict(self.goods)}
+
+    def _load(self, data: dict[str, Any]) -> None:
+        super()._load(data)
+        self.goods = Counter(data["goods"])
+
+
+@dataclass
+class DonationMissionSummary(MissionSummary):
+    kind = "donation"
+
+    donated: int = 0
+
+    def add(self, mission: Mission) -> None:
+        assert isinstance(mission, DonationMission)
+        super().add(mission)
+        self.donated += mission.donated
+
+    def merge(self, other: MissionSummary) -> None:
+        assert isinstance(other, DonationMissionSummary)
+        super().merge(other)
+        self.donated += other.donated
+
+    def to_dict(self) -> dict[str, Any]:
+        return super().to_dict() | {"donated": self.donated}
+
+    def _load(self, data: dict[str, Any]) -> None:
+        super()._load(data)
+        self.donated = data["donated"]
+
+
+@dataclass
+class GenericMissionSummary(MissionSummary):
+    pass
+
+
+_TYPE_TO_SUMMARY: dict[Type[Mission], Type[MissionSummary]] = {
+    CargoMission: CargoMissionSummary,
+    DonationMission: DonationMissionSummary,
+    GenericMission: GenericMissionSummary,
+}
+
+_KIND_TO_SUMMARY: dict[str, Type[MissionSummary]] = {
+    summary.kind: summary for summary in _TYPE_TO_SUMMARY.values()
+}
+
+
+class ImpactAggregate:
+    """Per-faction, per-mission-type counters that can be merged across sessions."""
+
+    def __init__(self) -> None:
+        self.factions: dict[str, dict[str, MissionSummary]] = defaultdict(dict)
+
+    @classmethod
+    def from_missions(cls, missions: Iterable[Mission]) -> "ImpactAggregate":
+        instance = cls()
+        for mission in missions:
+            instance.add_mission(mission)
+        return instance
+
+    @classmethod
+    def from_session(cls, session: CargoSession) -> "ImpactAggregate":
+        return cls.from_missions(session.missions.values())
+
+    def add_mission(self, mission: Mission) -> None:
+        summary_type = _TYPE_TO_SUMMARY.get(type(mission))
+        if summary_type is None:
+            raise ValueError("Unknown mission type")
+
+        mission_types = self.factions[mission.faction]
+        summary = mission_types.get(mission.technical_name)
+        if summary is None:
+            summary = mission_types[mission.technical_name] = summary_type()
+        summary.add(mission)
+
+    def merge(self, other: "ImpactAggregate") -> None:
+        for faction, mission_types in other.factions.items():
+            own_types = self.factions[faction]
+            for mission_type, summary in mission_types.items():
+                own = own_types.get(mission_type)
+                if own is None:
+                    own = own_types[mission_type] = type(summary)()
+                own.merge(summary)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            faction: {
+                mission_type: summary.to_dict()
+                for mission_type, summary in mission_types.items()
+            }
+            for faction, mission_types in self.factions.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ImpactAggregate":
+        instance = cls()
+        for faction, mission_types in data.items():
+            for mission_type, summary_data in mission_types.items():
+                summary = _KIND_TO_SUMMARY[summary_data["kind"]]()
+                summary._load(summary_data)
+                instance.factions[faction][mission_type] = summary
+        return instance
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class RollingSum:
+    """Sum of the values added during the last `window`, in a ring of buckets.
+
+    The window is cut into `buckets` slices of equal length; a value is added
+    to the slice of its timestamp and slices that fall out of the window are
+    subtracted from the running total as time advances. Adding and reading
+    never look at the history, so both are O(1) amortised. Timestamps must
+    not go backwards by more than a bucket.
+    """
+
+    def __init__(self, window: timedelta, buckets: int = 60) -> None:
+        self.window = window
+        self.buckets = buckets
+        self._width = window.total_seconds() / buckets
+        self._sums = [0] * buckets
+        self._total = 0
+        self._head: Optional[int] = None  # newest bucket number seen
+
+    def _bucket(self, timestamp: datetime) -> int:
+        return int(timestamp.timestamp() // self._width)
+
+    def advance(self, now: datetime) -> None:
+        bucket = self._bucket(now)
+        if self._head is None:
+            self._head = bucket
+            return
+        if bucket <= self._head:
+            return
+
+        # Only the buckets between the old and the new head expire
+        for expired in range(
+            self._head + 1, min(bucket, self._head + self.buckets) + 1
+        ):
+            slot = expired % self.buckets
+            self._total -= self._sums[slot]
+            self._sums[slot] = 0
+        self._head = bucket
+
+    def add(self, timestamp: datetime, value: int) -> None:
+        self.advance(timestamp)
+        bucket = self._bucket(timestamp)
+        assert self._head is not None
+        if bucket <= self._head - self.buckets:
+            return  # already outside the window
+        self._sums[bucket % self.buckets] += value
+        self._total += value
+
+    def total(self, now: Optional[datetime] = None) -> int:
+        if now is not None:
+            self.advance(now)
+        return self._total
+
+
+@dataclass(kw_only=True, frozen=True)
+class TradeRates:
+    """Hauling throughput over a stretch of time."""
+
+    duration: timedelta
+    tons: int
+    credits: int
+    loops: int
+    loop_time: Optional[timedelta]  # mean time from first buy to empty hold
+
+    @property
+    def tons_per_hour(self) -> float:
+        hours = self.duration.total_seconds() / 3600
+        return self.tons / hours if hours else 0.0
+
+    @property
+    def credits_per_hour(self) -> float:
+        hours = self.duration.total_seconds() / 3600
+        return self.credits / hours if hours else 0.0
+
+
+@dataclass(kw_only=True, frozen=True)
+class SessionThroughput:
+    started_at: datetime
+    ended_at: datetime
+    rates: TradeRates
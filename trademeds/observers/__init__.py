@@ -1,3 +1,3 @@
-from .cargo import VitalsCargoSessionCollector, CargoSessionBuilder
+from .cargo import VitalsCargoSessionCollector, CargoSessionBuilder, merge_sessions
 
-__all__ = ["VitalsCargoSessionCollector", "CargoSessionBuilder"]
+__all__ = ["VitalsCargoSessionCollector", "CargoSessionBuilder", "merge_sessions"]
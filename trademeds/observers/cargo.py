@@ -1,6 +1,7 @@
 from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, cast
+from typing import Any, Optional, Sequence, cast
 from ..models.entities import (
     Market,
     CargoMission,
@@ -9,16 +10,41 @@ from ..models.entities import (
     MissionFactionEffect,
     CargoSession,
     GenericMission,
+    goods_counter,
 )
 from ..journal.events import (
     GameEvent,
     MarketEvent,
+    MarketBuyEvent,
     MarketSellEvent,
     MissionCompletedEvent,
     LoadGameEvent,
     FactionEffectGroup,
     FactionEffect as JournalFactionEffect,
 )
+from ..journal.files import JournalFingerprint
+from ..store.spool import SessionSpool
+
+
+@dataclass(kw_only=True, frozen=True)
+class SessionFragment:
+    """Events collected for a session whose LoadGame has not been seen yet."""
+
+    sold: dict[int, dict[str, int]] = field(default_factory=dict)
+    bought: dict[int, dict[str, int]] = field(default_factory=dict)
+    missions: dict[int, Mission] = field(default_factory=dict)
+    sources: list[JournalFingerprint] = field(default_factory=list)
+    last_event_at: Optional[datetime] = None
+
+
+@dataclass(kw_only=True, frozen=True)
+class CollectorSnapshot:
+    """State of a `VitalsCargoSessionCollector` fed with one stretch of journals."""
+
+    markets: dict[int, Market]
+    sessions: list[CargoSession]
+    session_sources: list[list[JournalFingerprint]]
+    fragment: SessionFragment
 
 
 class CargoSessionBuilder:
@@ -26,9 +52,10 @@ class CargoSessionBuilder:
         self._init_vars()
 
     def _init_vars(self) -> None:
-        self.sold: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        self.bought: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.sold: dict[int, dict[str, int]] = defaultdict(goods_counter)
+        self.bought: dict[int, dict[str, int]] = defaultdict(goods_counter)
         self.missions: dict[int, Mission] = {}
+        self.sources: list[JournalFingerprint] = []
         self.last_event_at: Optional[datetime] = (
             None  # We see it first when traversing, but it's the last event chronologically
         )
@@ -37,6 +64,9 @@ class CargoSessionBuilder:
         if self.last_event_at is None:
             self.last_event_at = timestamp
 
+    def observe_file(self, journal: JournalFingerprint) -> None:
+        self.sources.append(journal)
+
     def sell(self, good: str, count: int, market_id: int = -1) -> None:
         self.sold[market_id][good] += count
 
@@ -46,6 +76,29 @@ class CargoSessionBuilder:
     def complete_mission(self, mission: Mission) -> None:
         self.missions[mission.mission_id] = mission
 
+    def absorb(self, fragment: SessionFragment) -> None:
+        """Add events of the same session that are older than everything seen."""
+        if fragment.last_event_at is not None:
+            self.observe_event_time(fragment.last_event_at)
+        for market_id, goods in fragment.sold.items():
+            for good, count in goods.items():
+                self.sold[market_id][good] += count
+        for market_id, goods in fragment.bought.items():
+            for good, count in goods.items():
+                self.bought[market_id][good] += count
+        for mission in fragment.missions.values():
+            self.complete_mission(mission)
+        self.sources.extend(fragment.sources)
+
+    def fragment(self) -> SessionFragment:
+        return SessionFragment(
+            sold={market_id: dict(goods) for market_id, goods in self.sold.items()},
+            bought={market_id: dict(goods) for market_id, goods in self.bought.items()},
+            missions=dict(self.missions),
+            sources=list(self.sources),
+            last_event_at=self.last_event_at,
+        )
+
     def build(self, started_at: datetime) -> CargoSession:
         instance = CargoSession(
             started_at=started_at,
@@ -58,13 +111,85 @@ class CargoSessionBuilder:
         return instance
 
 
+def merge_sessions(sessions: list[CargoSession]) -> CargoSession:
+    """Combine consecutive sessions (newest first) into one."""
+    sold: dict[int, dict[str, int]] = defaultdict(goods_counter)
+    bought: dict[int, dict[str, int]] = defaultdict(goods_counter)
+    missions: dict[int, Mission] = {}
+    for session in sessions:
+        for market_id, goods in session.sold.items():
+            for good, count in goods.items():
+                sold[market_id][good] += count
+        for market_id, goods in session.bought.items():
+            for good, count in goods.items():
+                bought[market_id][good] += count
+        missions.update(session.missions)
+
+    return CargoSession(
+        started_at=sessions[-1].started_at,
+        ended_at=sessions[0].ended_at,
+        sold=dict(sold),
+        bought=dict(bought),
+        missions=missions,
+    )
+
+
 class VitalsCargoSessionCollector:
-    def __init__(self, merges: int = 0) -> None:
+    checkpoint_key = "VitalsCargoSessionCollector:2"
+
+    def __init__(self, merges: int = 0, max_memory: Optional[int] = None) -> None:
         self.markets: dict[int, Market] = {}
         self.session_builder = CargoSessionBuilder()
-        self.sessions: list[CargoSession] = []
+        # Closed sessions, moved to a temporary database beyond max_memory bytes
+        self.sessions = SessionSpool(max_memory)
+        self.session_sources: list[list[JournalFingerprint]] = (
+            []
+        )  # Journal files each of self.sessions was built from
+        self.current_file: Optional[JournalFingerprint] = None
         self.merges_remain = merges
 
+    def fresh(self) -> "VitalsCargoSessionCollector":
+        return VitalsCargoSessionCollector()
+
+    def snapshot(self) -> CollectorSnapshot:
+        return CollectorSnapshot(
+            markets=dict(self.markets),
+            sessions=list(self.sessions),
+            session_sources=list(self.session_sources),
+            fragment=self.session_builder.fragment(),
+        )
+
+    def restore(self, snapshot: Any) -> None:
+        """Continue the traversal with a snapshot of older journals."""
+        assert isinstance(snapshot, CollectorSnapshot)
+        # Older Market events override newer ones, like in a plain traversal
+        self.markets.update(snapshot.markets)
+
+        for session, sources in zip(snapshot.sessions, snapshot.session_sources):
+            self.session_builder.absorb(
+                SessionFragment(
+                    sold=session.sold,
+                    bought=session.bought,
+                    missions=session.missions,
+                    sources=sources,
+                    last_event_at=session.ended_at,
+                )
+            )
+            if self.merges_remain:
+                self.merges_remain -= 1
+            else:
+                sources = self.session_builder.sources
+                self.sessions.append(
+                    self.session_builder.build(started_at=session.started_at)
+                )
+                self.session_sources.append(sources)
+
+        self.session_builder.absorb(snapshot.fragment)
+
+    def handle_file(self, journal: JournalFingerprint) -> None:
+        self.current_file = journal
+        self.session_builder.observe_file(journal)
+
     def handle_event(self, event: GameEvent) -> None:
         self.session_builder.observe_event_time(event.timestamp)
 
@@ -79,17 +204,40 @@ class VitalsCargoSessionCollector:
             if self.merges_remain:
                 self.merges_remain -= 1
             else:
+                sources = self.session_builder.sources
                 self.sessions.append(
                     self.session_builder.build(started_at=event.timestamp)
                 )
+                self.session_sources.append(sources)
+                # The next (older) session ends in the file this one started in
+                if self.current_file is not None:
+                    self.session_builder.observe_file(self.current_file)
         elif isinstance(event, MarketSellEvent):
             self.session_builder.sell(
                 market_id=event.market_id, good=event.type, count=event.count
             )
+        elif isinstance(event, MarketBuyEvent):
+            self.session_builder.buy(
+                market_id=event.market_id, good=event.type, count=event.count
+            )
         elif isinstance(event, MissionCompletedEvent):
             mission = self._create_mission(event)
             self.session_builder.complete_mission(mission)
 
+    def handle_events(self, events: Sequence[GameEvent]) -> None:
+        """`handle_event` for a run of events, with trades handled inline."""
+        builder = self.session_builder
+        for event in events:
+            if builder.last_event_at is None:
+                builder.last_event_at = event.timestamp
+            # Journals are mostly trades, the rest go through handle_event
+            if type(event) is MarketSellEvent:
+                builder.sold[event.market_id][event.type] += event.count
+            elif type(event) is MarketBuyEvent:
+                builder.bought[event.market_id][event.type] += event.count
+            else:
+                self.handle_event(event)
+
     def _create_mission(self, event: MissionCompletedEvent) -> Mission:
         if event.commodity is not None:
             assert (
@@ -108,6 +256,7 @@ class VitalsCargoSessionCollector:
                 system=event.destination_system,
                 station=event.destination_station,
                 effects=self._create_effects(event.faction_effects),
+                influence=self._create_influence(event.faction_effects),
                 good=event.commodity_localised,
                 count=event.count,
             )
@@ -118,6 +267,7 @@ class VitalsCargoSessionCollector:
                 technical_name=event.name,
                 faction=event.faction,
                 effects=self._create_effects(event.faction_effects),
+                influence=self._create_influence(event.faction_effects),
                 donated=event.donated,
             )
         # Any other mission type
@@ -129,10 +279,11 @@ class VitalsCargoSessionCollector:
             system=event.destination_system,
             station=event.destination_station,
             effects=self._create_effects(event.faction_effects),
+            influence=self._create_influence(event.faction_effects),
         )
 
     def _create_effects(
-        self, faction_effects: list[FactionEffectGroup]
+        self, faction_effects: Sequence[FactionEffectGroup]
     ) -> list[MissionFactionEffect]:
         return [
             MissionFactionEffect(
@@ -144,3 +295,12 @@ class VitalsCargoSessionCollector:
             for feffect in faction_effects
             for effect in feffect.effects
         ]
+
+    def _create_influence(
+        self, faction_effects: Sequence[FactionEffectGroup]
+    ) -> dict[str, int]:
+        influence: dict[str, int] = defaultdict(int)
+        for feffect in faction_effects:
+            for system_influence in feffect.influence:
+                influence[feffect.faction] += system_influence.influence.count("+")
+        return dict(influence)
@@ -0,0 +1,117 @@
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Optional
+from ..journal.events import (
+    GameEvent,
+    LoadGameEvent,
+    MarketEvent,
+    MarketSellEvent,
+    MissionAcceptedEvent,
+    MissionCompletedEvent,
+)
+from ..models.entities import CargoSession, Market
+from .incomplete_cargo import ExpiryQueue, IncompleteMission, advance_pending
+from .trade_loop import TRADE_EVENTS, TradeLoopTracker
+
+SALES = "sales"
+MISSIONS = "missions"
+CARGO = "cargo"
+THROUGHPUT = "throughput"
+PANELS = (SALES, MISSIONS, CARGO, THROUGHPUT)
+# How long before a pending mission expires to warn about it
+EXPIRY_WARNING = timedelta(minutes=30)
+
+
+class DashboardState:
+    """Live session sales, completed missions and pending cargo.
+
+    Seeded from a traversal of the journal history, then fed new events
+    oldest first by a journal tail. `handle_event` updates only the totals
+    the event touches and returns the panels they appear in, so a view can
+    leave the others alone.
+    """
+
+    def __init__(
+        self,
+        markets: dict[int, Market],
+        session: Optional[CargoSession],
+        pending: dict[int, IncompleteMission],
+        trades: Optional[TradeLoopTracker] = None,
+    ) -> None:
+        self.markets = dict(markets)
+        self.started_at: Optional[datetime] = None
+        self.sold: dict[int, Counter[str]] = {}
+        self.missions: Counter[str] = Counter()  # faction -> completed missions
+        self.influence: Counter[str] = Counter()  # faction -> "+" delivered
+        if session is not None:
+            self.started_at = session.started_at
+            for market_id, goods in session.sold.items():
+                self.sold[market_id] = Counter(goods)
+            for mission in session.missions.values():
+                self.missions[mission.faction] += 1
+                self.influence[mission.faction] += mission.influence.get(
+                    mission.faction, 0
+                )
+        self.pending = pending
+        self.expiries = ExpiryQueue(pending.values())
+        self.notices: deque[str] = deque(maxlen=5)
+        self.trades = trades if trades is not None else TradeLoopTracker()
+
+    def handle_event(self, event: GameEvent) -> set[str]:
+        touched = set()
+        if isinstance(event, TRADE_EVENTS):
+            self.trades.handle_event(event)
+            touched.add(THROUGHPUT)
+
+        if isinstance(event, LoadGameEvent):
+            self.started_at = event.timestamp
+            self.sold.clear()
+            self.missions.clear()
+            self.influence.clear()
+            self.trades = TradeLoopTracker()
+            touched.update(PANELS)
+        elif isinstance(event, MarketEvent):
+            self.markets[event.market_id] = Market(
+                market_id=event.market_id,
+                station_name=event.station_name,
+                system_name=event.star_system,
+                is_carrier=event.station_type == "FleetCarrier",
+            )
+            if event.market_id in self.sold:
+                touched.add(SALES)
+        elif isinstance(event, MarketSellEvent):
+            self.sold.setdefault(event.market_id, Counter())[event.type] += event.count
+            touched.add(SALES)
+        elif isinstance(event, MissionCompletedEvent):
+            self.missions[event.faction] += 1
+            self.influence[event.faction] += sum(
+                system_influence.influence.count("+")
+                for group in event.faction_effects
+                if group.faction == event.faction
+                for system_influence in group.influence
+            )
+            touched.add(MISSIONS)
+
+        if advance_pending(self.pending, event):
+            touched.add(CARGO)
+            if isinstance(event, MissionAcceptedEvent):
+                self.expiries.push(self.pending[event.mission_id], self.pending)
+        return touched
+
+    def check_expiries(self, now: datetime) -> bool:
+        """Add notices for missions expiring soon, returns whether there were any.
+
+        Only the missions at the front of the expiry queue are looked at, so
+        checking every tick costs nothing while none are due.
+        """
+        due = self.expiries.pop_due(self.pending, now + EXPIRY_WARNING)
+        for mission in due:
+            assert mission.expiry is not None
+            left = mission.expiry - now
+            when = (
+                f"expires in {int(left.total_seconds() // 60)} min"
+                if left > timedelta(0)
+                else "expired"
+            )
+            self.notices.append(f"{mission.good} for {mission.system} {when}")
+        return bool(due)
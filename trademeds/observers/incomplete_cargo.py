@@ -1,5 +1,8 @@
-from dataclasses import dataclass
-from typing import Dict
+import heapq
+import sys
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
 from ..journal.observer import JournalObserver
 from ..journal.events import (
     GameEvent,
@@ -10,6 +13,7 @@ from ..journal.events import (
     CargoDepotUpdateType,
     LoadGameEvent,
 )
+from ..journal.filters import commodity_key
 from ..models.entities import CargoMission
 
 
@@ -20,9 +24,154 @@ class IncompleteMission:
     count: int
     faction: str
     system: str
+    commodity: Optional[str] = None  # "$Fish_Name;", the hold names goods by it
+    expiry: Optional[datetime] = None
+
+
+def mission_commodity(mission: IncompleteMission) -> str:
+    """`commodity_key` of the good a mission asks for."""
+    if mission.commodity is not None:
+        return commodity_key(mission.commodity)
+    # Missions from older checkpoints only know the display name
+    return commodity_key(mission.good.replace(" ", ""))
+
+
+def advance_pending(pending: Dict[int, IncompleteMission], event: GameEvent) -> bool:
+    """Update pending missions with an event newer than all seen so far.
+
+    The tracker reads journals newest first; this keeps its missions up to
+    date with events that come in afterwards, oldest first. Returns whether
+    `pending` changed.
+    """
+    if isinstance(event, MissionAcceptedEvent):
+        if (
+            event.commodity_localised is not None
+            and event.count is not None
+            and event.destination_system is not None
+        ):
+            pending[event.mission_id] = IncompleteMission(
+                mission_id=event.mission_id,
+                good=event.commodity_localised,
+                count=event.count,
+                faction=event.faction,
+                system=event.destination_system,
+                commodity=event.commodity,
+                expiry=event.expiry,
+            )
+            return True
+    elif isinstance(event, (MissionCompletedEvent, MissionAbandonedEvent)):
+        return pending.pop(event.mission_id, None) is not None
+    elif isinstance(event, CargoDepotEvent):
+        mission = pending.get(event.mission_id)
+        if mission and event.update_type == CargoDepotUpdateType.DELIVER:
+            remaining = event.total_items_to_deliver - event.items_delivered
+            if remaining > 0:
+                mission.count = remaining
+            else:
+                del pending[event.mission_id]
+            return True
+    return False
+
+
+class ExpiryQueue:
+    """Pending missions in a heap by expiry, soonest first.
+
+    Entries aren't removed when a mission is completed or abandoned; they
+    are skipped once they no longer match a pending mission, and the heap
+    is rebuilt when they outnumber the live ones. Missions without an
+    expiry aren't queued.
+    """
+
+    def __init__(self, missions: Iterable[IncompleteMission] = ()) -> None:
+        self.heap = [
+            (mission.expiry, mission.mission_id)
+            for mission in missions
+            if mission.expiry is not None
+        ]
+        heapq.heapify(self.heap)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def push(
+        self, mission: IncompleteMission, pending: Mapping[int, IncompleteMission]
+    ) -> None:
+        if mission.expiry is None:
+            return
+        heapq.heappush(self.heap, (mission.expiry, mission.mission_id))
+        if len(self.heap) > 2 * len(pending) + 16:
+            self.heap = [
+                entry for entry in self.heap if _live(entry, pending) is not None
+            ]
+            heapq.heapify(self.heap)
+
+    def due(
+        self, pending: Mapping[int, IncompleteMission], until: datetime
+    ) -> list[IncompleteMission]:
+        """Pending missions expiring by `until`, soonest first.
+
+        Walks the heap without changing it: the next entry is always the
+        smallest among the children of those already taken, so listing k
+        missions costs O(k log k) however many are queued.
+        """
+        due: dict[int, IncompleteMission] = {}
+        candidates = [(self.heap[0], 0)] if self.heap else []
+        while candidates:
+            entry, index = heapq.heappop(candidates)
+            if entry[0] > until:
+                break
+            mission = _live(entry, pending)
+            if mission is not None:
+                due.setdefault(mission.mission_id, mission)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self.heap):
+                    heapq.heappush(candidates, (self.heap[child], child))
+        return list(due.values())
+
+    def pop_due(
+        self, pending: Mapping[int, IncompleteMission], until: datetime
+    ) -> list[IncompleteMission]:
+        """Like `due`, but takes the missions out of the queue."""
+        due: dict[int, IncompleteMission] = {}
+        while self.heap and self.heap[0][0] <= until:
+            mission = _live(heapq.heappop(self.heap), pending)
+            if mission is not None:
+                due.setdefault(mission.mission_id, mission)
+        return list(due.values())
+
+
+def _live(
+    entry: tuple[datetime, int], pending: Mapping[int, IncompleteMission]
+) -> IncompleteMission | None:
+    expiry, mission_id = entry
+    mission = pending.get(mission_id)
+    return mission if mission is not None and mission.expiry == expiry else None
+
+
+# Events that change pending missions, besides the session count
+_TRACKED = frozenset(
+    {
+        MissionAcceptedEvent,
+        MissionCompletedEvent,
+        MissionAbandonedEvent,
+        CargoDepotEvent,
+    }
+)
+
+
+@dataclass(kw_only=True, frozen=True)
+class TrackerSnapshot:
+    """State of an `IncompleteCargoTracker` fed with one stretch of journals."""
+
+    missions: list[tuple[IncompleteMission, int]]  # with sessions seen before accept
+    finished_missions: set[int]
+    pending_deliveries: Dict[int, int]
+    sessions_seen: int
 
 
 class IncompleteCargoTracker(JournalObserver):
+    checkpoint_key = "IncompleteCargoTracker:3"
+
     def __init__(self, depth: int = 10) -> None:
         self.depth = depth
         self.missions: Dict[int, IncompleteMission] = {}
@@ -30,7 +179,54 @@ class IncompleteCargoTracker(JournalObserver):
             set()
         )  # Includes completed, abandoned and fully delivered
         self.pending_deliveries: Dict[int, int] = {}  # mission_id -> remaining count
+        self.mission_sessions: Dict[int, int] = {}  # mission_id -> sessions seen
         self.sessions_seen = 0
+        self.expiries = ExpiryQueue()
+
+    def fresh(self) -> "IncompleteCargoTracker":
+        return IncompleteCargoTracker(depth=sys.maxsize)
+
+    def snapshot(self) -> TrackerSnapshot:
+        return TrackerSnapshot(
+            missions=[
+                (replace(mission), self.mission_sessions[mission_id])
+                for mission_id, mission in self.missions.items()
+            ],
+            finished_missions=set(self.finished_missions),
+            pending_deliveries=dict(self.pending_deliveries),
+            sessions_seen=self.sessions_seen,
+        )
+
+    def restore(self, snapshot: Any) -> None:
+        """Continue the traversal with a snapshot of older journals."""
+        assert isinstance(snapshot, TrackerSnapshot)
+        for mission, mission_sessions in snapshot.missions:
+            sessions_seen = self.sessions_seen + mission_sessions
+            if sessions_seen >= self.depth:
+                continue
+            if mission.mission_id in self.finished_missions:
+                continue
+
+            self.missions[mission.mission_id] = replace(
+                mission,
+                count=self.pending_deliveries.get(mission.mission_id, mission.count),
+            )
+            self.mission_sessions[mission.mission_id] = sessions_seen
+            self.expiries.push(mission, self.missions)
+
+        self.finished_missions |= snapshot.finished_missions
+        for mission_id, remaining in snapshot.pending_deliveries.items():
+            self.pending_deliveries.setdefault(mission_id, remaining)
+        self.sessions_seen += snapshot.sessions_seen
+
+    def handle_events(self, events: Sequence[GameEvent]) -> None:
+        """`handle_event` for a run of events, skipping the untracked ones."""
+        for event in events:
+            kind = type(event)
+            if kind is LoadGameEvent:
+                self.sessions_seen += 1
+            elif kind in _TRACKED and self.sessions_seen < self.depth:
+                self.handle_event(event)
 
     def handle_event(self, event: GameEvent) -> None:
         if isinstance(event, LoadGameEvent):
@@ -61,6 +257,12 @@ class IncompleteCargoTracker(JournalObserver):
                             count=remaining,
                             faction=event.faction,
                             system=event.destination_system,
+                            commodity=event.commodity,
+                            expiry=event.expiry,
+                        )
+                        self.mission_sessions[event.mission_id] = self.sessions_seen
+                        self.expiries.push(
+                            self.missions[event.mission_id], self.missions
                         )
         elif isinstance(event, (MissionCompletedEvent, MissionAbandonedEvent)):
             self.missions.pop(event.mission_id, None)
@@ -69,7 +271,8 @@ class IncompleteCargoTracker(JournalObserver):
             if event.update_type == CargoDepotUpdateType.DELIVER:
                 remaining = event.total_items_to_deliver - event.items_delivered
                 if remaining > 0:
-                    self.pending_deliveries[event.mission_id] = remaining
+                    # The newest delivery seen first has the current progress
+                    self.pending_deliveries.setdefault(event.mission_id, remaining)
                 else:
                     self.finished_missions.add(event.mission_id)
 
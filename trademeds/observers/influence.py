@@ -0,0 +1,31 @@
+from ..journal.events import (
+    GameEvent,
+    MissionCompletedEvent,
+    LocationEvent,
+    FSDJumpEvent,
+)
+from ..models.entities import InfluenceRecord
+
+
+class InfluenceCollector:
+    """Collects per-system influence records and system names from events."""
+
+    def __init__(self) -> None:
+        self.records: list[InfluenceRecord] = []
+        self.systems: dict[int, str] = {}
+
+    def handle_event(self, event: GameEvent) -> None:
+        if isinstance(event, MissionCompletedEvent):
+            for group in event.faction_effects:
+                for system_influence in group.influence:
+                    self.records.append(
+                        InfluenceRecord(
+                            timestamp=event.timestamp,
+                            system_address=system_influence.system_address,
+                            faction=group.faction,
+                            pluses=system_influence.influence.count("+"),
+                            trend=system_influence.trend,
+                        )
+                    )
+        elif isinstance(event, (LocationEvent, FSDJumpEvent)):
+            self.systems[event.system_address] = event.star_system
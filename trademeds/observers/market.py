@@ -0,0 +1,80 @@
+from dataclasses import dataclass
+from datetime import datetime
+from ..journal.events import (
+    GameEvent,
+    MarketEvent,
+    MarketBuyEvent,
+    MarketSellEvent,
+)
+from ..journal.filters import commodity_key
+from ..models.entities import Market
+
+
+class MarketTradeCollector:
+    """Collects market transactions and the markets they happened at."""
+
+    def __init__(self) -> None:
+        self.trades: list[MarketBuyEvent | MarketSellEvent] = []
+        self.markets: dict[int, Market] = {}
+
+    def handle_event(self, event: GameEvent) -> None:
+        if isinstance(event, (MarketBuyEvent, MarketSellEvent)):
+            self.trades.append(event)
+        elif isinstance(event, MarketEvent):
+            self.markets[event.market_id] = Market(
+                market_id=event.market_id,
+                station_name=event.station_name,
+                system_name=event.star_system,
+                is_carrier=event.station_type == "FleetCarrier",
+            )
+
+
+@dataclass
+class CommodityPrices:
+    """Purchases of one commodity at one market."""
+
+    last_at: datetime
+    last_price: int
+    best_at: datetime
+    best_price: int
+    bought: int
+
+
+class CommodityPriceCollector:
+    """Last and lowest buy price per commodity and market."""
+
+    def __init__(self) -> None:
+        self.prices: dict[tuple[str, int], CommodityPrices] = {}
+        self.names: dict[str, str] = {}  # commodity key -> display name
+        self.markets: dict[int, Market] = {}
+
+    def handle_event(self, event: GameEvent) -> None:
+        if isinstance(event, MarketBuyEvent):
+            key = commodity_key(event.type)
+            self.names.setdefault(key, event.type_localised or event.type)
+            prices = self.prices.get((key, event.market_id))
+            if prices is None:
+                self.prices[key, event.market_id] = CommodityPrices(
+                    last_at=event.timestamp,
+                    last_price=event.buy_price,
+                    best_at=event.timestamp,
+                    best_price=event.buy_price,
+                    bought=event.count,
+                )
+                return
+            # Events may come newest first, keep whichever is newer
+            if event.timestamp > prices.last_at:
+                prices.last_at, prices.last_price = event.timestamp, event.buy_price
+            if event.buy_price < prices.best_price:
+                prices.best_at, prices.best_price = event.timestamp, event.buy_price
+            prices.bought += event.count
+        elif isinstance(event, MarketEvent):
+            self.markets.setdefault(
+                event.market_id,
+                Market(
+                    market_id=event.market_id,
+                    station_name=event.station_name,
+                    system_name=event.star_system,
+                    is_carrier=event.station_type == "FleetCarrier",
+                ),
+            )
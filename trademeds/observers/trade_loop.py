@@ -0,0 +1,195 @@
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+from ..journal.events import (
+    CargoDepotEvent,
+    CargoDepotUpdateType,
+    GameEvent,
+    LoadGameEvent,
+    MarketBuyEvent,
+    MarketSellEvent,
+    MissionCompletedEvent,
+)
+from ..journal.filters import commodity_key
+from ..models.throughput import RollingSum, SessionThroughput, TradeRates
+
+DEFAULT_WINDOWS = (timedelta(minutes=15), timedelta(hours=1))
+
+TRADE_EVENTS = (MarketBuyEvent, MarketSellEvent, CargoDepotEvent, MissionCompletedEvent)
+
+
+class _WindowSums:
+    def __init__(self, window: timedelta) -> None:
+        self.window = window
+        self.tons = RollingSum(window)
+        self.credits = RollingSum(window)
+        self.loops = RollingSum(window)
+        self.loop_seconds = RollingSum(window)
+
+
+class TradeLoopTracker:
+    """Throughput of hauling loops, fed oldest first like a live journal tail.
+
+    Bought (or collected) cargo is paired first in, first out with the sales
+    and mission deliveries that unload it. A loop starts with a purchase into
+    an empty hold and ends when the paired cargo is all unloaded. Tons moved,
+    credits earned and loop times are summed for the whole feed and in a
+    `RollingSum` per window, so reading the current rates is O(1).
+
+    Credits are sale revenue minus the cost of the cargo sold or delivered,
+    plus the rewards of completed cargo missions. Sales of cargo bought
+    before the feed started are costed at the game's average price paid.
+    """
+
+    def __init__(self, windows: Sequence[timedelta] = DEFAULT_WINDOWS) -> None:
+        self.lots: dict[str, deque[list[int]]] = {}  # good -> [count, unit cost]
+        self.hold = 0
+        self.loop_started_at: Optional[datetime] = None
+        self.started_at: Optional[datetime] = None
+        self.last_event_at: Optional[datetime] = None
+        self.tons = 0
+        self.credits = 0
+        self.loops = 0
+        self.loop_seconds = 0
+        self._windows = [_WindowSums(window) for window in windows]
+
+    def handle_event(self, event: GameEvent) -> None:
+        if self.started_at is None:
+            self.started_at = event.timestamp
+        self.last_event_at = event.timestamp
+
+        if isinstance(event, MarketBuyEvent):
+            self._load(event.timestamp, event.type, event.count, event.buy_price)
+        elif isinstance(event, MarketSellEvent):
+            paired, cost = self._unload(event.timestamp, event.type, event.count)
+            cost += (event.count - paired) * event.avg_price_paid
+            self._record(
+                event.timestamp, tons=event.count, credits=event.total_sale - cost
+            )
+        elif isinstance(event, CargoDepotEvent):
+            if event.update_type == CargoDepotUpdateType.COLLECT:
+                self._load(event.timestamp, event.cargo_type, event.count, 0)
+            else:
+                _, cost = self._unload(event.timestamp, event.cargo_type, event.count)
+                self._record(event.timestamp, tons=event.count, credits=-cost)
+        elif isinstance(event, MissionCompletedEvent):
+            if event.commodity is not None and event.reward:
+                self._record(event.timestamp, credits=event.reward)
+
+    def _load(self, timestamp: datetime, good: str, count: int, unit_cost: int) -> None:
+        if self.hold == 0:
+            self.loop_started_at = timestamp
+        self.hold += count
+        self.lots.setdefault(commodity_key(good), deque()).append([count, unit_cost])
+
+    def _unload(self, timestamp: datetime, good: str, count: int) -> tuple[int, int]:
+        """Take `count` tons from the oldest lots of `good`, returns tons and cost."""
+        lots = self.lots.get(commodity_key(good))
+        paired = cost = 0
+        while lots and paired < count:
+            lot = lots[0]
+            taken = min(lot[0], count - paired)
+            paired += taken
+            cost += taken * lot[1]
+            lot[0] -= taken
+            if lot[0] == 0:
+                lots.popleft()
+
+        self.hold -= paired
+        if paired and self.hold == 0 and self.loop_started_at is not None:
+            loop_seconds = int((timestamp - self.loop_started_at).total_seconds())
+            self._record(timestamp, loops=1, loop_seconds=loop_seconds)
+            self.loop_started_at = None
+        return paired, cost
+
+    def _record(
+        self,
+        timestamp: datetime,
+        tons: int = 0,
+        credits: int = 0,
+        loops: int = 0,
+        loop_seconds: int = 0,
+    ) -> None:
+        self.tons += tons
+        self.credits += credits
+        self.loops += loops
+        self.loop_seconds += loop_seconds
+        for sums in self._windows:
+            sums.tons.add(timestamp, tons)
+            sums.credits.add(timestamp, credits)
+            sums.loops.add(timestamp, loops)
+            sums.loop_seconds.add(timestamp, loop_seconds)
+
+    def rates(self, now: datetime) -> list[TradeRates]:
+        """Throughput over each window ending at `now`, shortest window first."""
+        rates = []
+        for sums in self._windows:
+            elapsed = now - self.started_at if self.started_at else timedelta(0)
+            loops = sums.loops.total(now)
+            rates.append(
+                TradeRates(
+                    duration=min(sums.window, max(elapsed, timedelta(0))),
+                    tons=sums.tons.total(now),
+                    credits=sums.credits.total(now),
+                    loops=loops,
+                    loop_time=(
+                        timedelta(seconds=sums.loop_seconds.total(now) / loops)
+                        if loops
+                        else None
+                    ),
+                )
+            )
+        return rates
+
+    def summary(self, started_at: datetime, ended_at: datetime) -> TradeRates:
+        return TradeRates(
+            duration=ended_at - started_at,
+            tons=self.tons,
+            credits=self.credits,
+            loops=self.loops,
+            loop_time=(
+                timedelta(seconds=self.loop_seconds / self.loops)
+                if self.loops
+                else None
+            ),
+        )
+
+
+class TradeLoopCollector:
+    """Per-session hauling throughput from a newest first traversal.
+
+    The trade events of a session are kept until its LoadGame is reached and
+    then fed oldest first to a `TradeLoopTracker`. The tracker of the newest
+    (live) session is kept in `live` so a journal tail can continue it.
+    """
+
+    def __init__(self, windows: Sequence[timedelta] = DEFAULT_WINDOWS) -> None:
+        self.windows = windows
+        self.sessions: list[SessionThroughput] = []
+        self.live: Optional[TradeLoopTracker] = None
+        self._events: list[GameEvent] = []
+        self._last_event_at: Optional[datetime] = None
+
+    def handle_event(self, event: GameEvent) -> None:
+        if self._last_event_at is None:
+            self._last_event_at = event.timestamp
+
+        if isinstance(event, TRADE_EVENTS):
+            self._events.append(event)
+        elif isinstance(event, LoadGameEvent):
+            tracker = TradeLoopTracker(self.windows)
+            tracker.handle_event(event)
+            for trade_event in reversed(self._events):
+                tracker.handle_event(trade_event)
+
+            self.sessions.append(
+                SessionThroughput(
+                    started_at=event.timestamp,
+                    ended_at=self._last_event_at,
+                    rates=tracker.summary(event.timestamp, self._last_event_at),
+                )
+            )
+            if self.live is None:
+                self.live = tracker
+            self._events = []
+            self._last_event_at = None
@@ -0,0 +1,13 @@
+# Only the standard library is imported here, so overlay tools can read the
+# live state without pydantic; the publisher is in .publisher
+from .layout import SEGMENT_NAME, VERSION, LiveState, PendingEntry
+from .reader import StateReader, read_state
+
+__all__ = [
+    "SEGMENT_NAME",
+    "VERSION",
+    "LiveState",
+    "PendingEntry",
+    "StateReader",
+    "read_state",
+]
@@ -0,0 +1,184 @@
+"""Binary layout of the live state segment.
+
+All fields are little-endian. The segment starts with a fixed header and is
+followed by `MAX_PENDING` pending mission slots, of which the header's
+`entries` are filled in, soonest expiry first:
+
+    offset  size  header field
+         0     4  magic, b"TMDS"
+         4     2  layout version
+         6     2  size of a pending mission slot
+         8     8  sequence number, odd while the state is being written
+        16     8  published at, unix seconds
+        24     8  session started at, unix seconds, NaN without a session
+        32     8  tons per hour over the shortest throughput window
+        40     8  credits per hour over the shortest throughput window
+        48     8  tons sold this session
+        56     4  missions completed this session
+        60     4  influence delivered this session
+        64     4  tons of pending cargo
+        68     4  pending missions
+        72     4  pending mission slots filled
+        76     4  reserved
+
+    offset  size  pending mission slot
+         0     8  mission id
+         8     8  expiry, unix seconds, NaN without one
+        16     4  tons left to deliver
+        20    32  good, UTF-8, NUL padded
+        52    32  system
+        84    44  faction
+
+A layout change bumps `VERSION`; readers refuse versions they don't know.
+"""
+
+import math
+import struct
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+
+MAGIC = b"TMDS"
+VERSION = 1
+SEGMENT_NAME = "trademeds"
+MAX_PENDING = 64
+
+HEADER = struct.Struct("<4sHHQddddQIIIIII")
+ENTRY = struct.Struct("<QdI32s32s44s")
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 8
+SIZE = HEADER.size + MAX_PENDING * ENTRY.size
+
+
+class PendingEntry(NamedTuple):
+    mission_id: int
+    good: str
+    tons: int
+    system: str
+    faction: str
+    expiry: Optional[datetime]
+
+
+@dataclass(kw_only=True, frozen=True)
+class LiveState:
+    """What an overlay shows: the live session's totals and pending cargo."""
+
+    published_at: datetime
+    started_at: Optional[datetime]
+    tons_per_hour: float = 0.0
+    credits_per_hour: float = 0.0
+    sold: int = 0
+    missions: int = 0
+    influence: int = 0
+    pending_tons: int = 0
+    pending_missions: int = 0  # may be more than `pending` holds
+    pending: list[PendingEntry] = field(default_factory=list)
+    seq: int = 0  # sequence number the state was read at
+
+
+def pack_state(buffer: memoryview, state: LiveState, seq: int) -> None:
+    entries = state.pending[:MAX_PENDING]
+    HEADER.pack_into(
+        buffer,
+        0,
+        MAGIC,
+        VERSION,
+        ENTRY.size,
+        seq,
+        state.published_at.timestamp(),
+        _timestamp(state.started_at),
+        state.tons_per_hour,
+        state.credits_per_hour,
+        state.sold,
+        state.missions,
+        state.influence,
+        state.pending_tons,
+        state.pending_missions,
+        len(entries),
+        0,
+    )
+    for i, entry in enumerate(entries):
+        ENTRY.pack_into(
+            buffer,
+            HEADER.size + i * ENTRY.size,
+            entry.mission_id,
+            _timestamp(entry.expiry),
+            entry.tons,
+            _text(entry.good, 32),
+            _text(entry.system, 32),
+            _text(entry.faction, 44),
+        )
+
+
+def unpack_state(buffer: memoryview) -> LiveState:
+    """Decode the state in `buffer`, which may be torn if it's being written."""
+    (
+        magic,
+        version,
+        entry_size,
+        seq,
+        published_at,
+        started_at,
+        tons_per_hour,
+        credits_per_hour,
+        sold,
+        missions,
+        influence,
+        pending_tons,
+        pending_missions,
+        entries,
+        _,
+    ) = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("not a trademeds live state segment")
+    if version != VERSION or entry_size != ENTRY.size:
+        raise ValueError(f"live state layout version {version}, expected {VERSION}")
+
+    pending = []
+    # A torn header can claim any number of slots, the seqlock discards it
+    for i in range(min(entries, MAX_PENDING)):
+        mission_id, expiry, tons, good, system, faction = ENTRY.unpack_from(
+            buffer, HEADER.size + i * ENTRY.size
+        )
+        pending.append(
+            PendingEntry(
+                mission_id=mission_id,
+                good=_untext(good),
+                tons=tons,
+                system=_untext(system),
+                faction=_untext(faction),
+                expiry=_datetime(expiry),
+            )
+        )
+    return LiveState(
+        published_at=datetime.fromtimestamp(published_at, timezone.utc),
+        started_at=_datetime(started_at),
+        tons_per_hour=tons_per_hour,
+        credits_per_hour=credits_per_hour,
+        sold=sold,
+        missions=missions,
+        influence=influence,
+        pending_tons=pending_tons,
+        pending_missions=pending_missions,
+        pending=pending,
+        seq=seq,
+    )
+
+
+def _timestamp(at: Optional[datetime]) -> float:
+    return at.timestamp() if at is not None else math.nan
+
+
+def _datetime(timestamp: float) -> Optional[datetime]:
+    if math.isnan(timestamp):
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def _text(text: str, size: int) -> bytes:
+    # Cut at a character boundary, so a long name still decodes
+    return text.encode()[:size].decode(errors="ignore").encode()
+
+
+def _untext(data: bytes) -> str:
+    return data.rstrip(b"\0").decode(errors="replace")
@@ -0,0 +1,99 @@
+import os
+from datetime import datetime, timezone
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Optional
+from ..observers.dashboard import DashboardState
+from .layout import (
+    SEGMENT_NAME,
+    SEQ,
+    SEQ_OFFSET,
+    SIZE,
+    LiveState,
+    PendingEntry,
+    pack_state,
+)
+
+# Missions without an expiry sort after all the others
+_NEVER = datetime.max.replace(tzinfo=timezone.utc)
+
+
+class StatePublisher:
+    """Keeps the latest `LiveState` in a named shared memory segment.
+
+    Writes are guarded by a sequence lock: the sequence number is made odd
+    before the state is written and even again after, so readers never
+    block the publisher and retry the rare read that overlapped a write.
+    There must be only one publisher per segment. A segment left behind by
+    a publisher that crashed is taken over.
+    """
+
+    def __init__(self, name: str = SEGMENT_NAME) -> None:
+        try:
+            self.memory = SharedMemory(name, create=True, size=SIZE)
+        except FileExistsError:
+            self.memory = SharedMemory(name)
+            if self.memory.size < SIZE:
+                self.memory.close()
+                self.memory.unlink()
+                self.memory = SharedMemory(name, create=True, size=SIZE)
+        buffer = self.memory.buf
+        assert buffer is not None
+        self.buffer = buffer
+        self.seq = SEQ.unpack_from(buffer, SEQ_OFFSET)[0] & ~1
+
+    def publish(self, state: LiveState) -> None:
+        buffer = self.buffer
+        self.seq += 1
+        SEQ.pack_into(buffer, SEQ_OFFSET, self.seq)
+        pack_state(buffer, state, self.seq)
+        self.seq += 1
+        SEQ.pack_into(buffer, SEQ_OFFSET, self.seq)
+
+    def close(self) -> None:
+        self.memory.close()
+        # Windows removes the segment with its last handle by itself
+        if os.name == "posix":
+            self.memory.unlink()
+
+    def __enter__(self) -> "StatePublisher":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def live_state(state: DashboardState, now: datetime) -> LiveState:
+    """Session totals and pending cargo of the dashboard's state."""
+    rates = state.trades.rates(now)
+    missions = sorted(
+        state.pending.values(),
+        key=lambda mission: (mission.expiry or _NEVER, mission.mission_id),
+    )
+    return LiveState(
+        published_at=now,
+        started_at=state.started_at,
+        tons_per_hour=rates[0].tons_per_hour if rates else 0.0,
+        credits_per_hour=rates[0].credits_per_hour if rates else 0.0,
+        sold=sum(sum(goods.values()) for goods in state.sold.values()),
+        missions=sum(state.missions.values()),
+        influence=sum(state.influence.values()),
+        pending_tons=sum(mission.count for mission in missions),
+        pending_missions=len(missions),
+        pending=[
+            PendingEntry(
+                mission_id=mission.mission_id,
+                good=mission.good,
+                tons=mission.count,
+                system=mission.system,
+                faction=mission.faction,
+                expiry=mission.expiry,
+            )
+            for mission in missions
+        ],
+    )
@@ -0,0 +1,78 @@
+import os
+import sys
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Optional
+from .layout import SEGMENT_NAME, SEQ, SEQ_OFFSET, LiveState, unpack_state
+
+# Attempts at a consistent read before giving up on a busy publisher
+MAX_RETRIES = 10_000
+
+
+class StateReader:
+    """Reads the live state a `StatePublisher` keeps in shared memory.
+
+    Only needs the standard library. Values are unpacked straight from the
+    mapped segment; the sequence number read before and after tells whether
+    the publisher wrote in between, in which case the read is retried.
+    Raises `FileNotFoundError` when nothing is published under `name`.
+
+    Meant for other processes: before Python 3.13 a reader and the
+    publisher in one process share a resource tracker registration.
+    """
+
+    def __init__(self, name: str = SEGMENT_NAME) -> None:
+        if sys.version_info >= (3, 13):
+            self.memory = SharedMemory(name, track=False)
+        else:
+            self.memory = SharedMemory(name)
+            if os.name == "posix":
+                # Attaching registers the segment too, and the resource
+                # tracker would remove it from under the publisher on exit
+                resource_tracker.unregister(
+                    self.memory._name, "shared_memory"  # type: ignore[attr-defined]
+                )
+        buffer = self.memory.buf
+        assert buffer is not None
+        self.buffer = buffer
+
+    def seq(self) -> int:
+        """Sequence number, it changes whenever a new state is published."""
+        return int(SEQ.unpack_from(self.buffer, SEQ_OFFSET)[0])
+
+    def read(self) -> LiveState:
+        for _ in range(MAX_RETRIES):
+            before = self.seq()
+            if before % 2:
+                continue
+            try:
+                state = unpack_state(self.buffer)
+            except (ValueError, OverflowError, OSError):
+                # Garbage from a torn read, unless nothing was written
+                if self.seq() == before:
+                    raise
+                continue
+            if self.seq() == before:
+                return state
+        raise TimeoutError("the live state kept changing while being read")
+
+    def close(self) -> None:
+        self.memory.close()
+
+    def __enter__(self) -> "StateReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def read_state(name: str = SEGMENT_NAME) -> LiveState:
+    """The live state published under `name`, for one-off reads."""
+    with StateReader(name) as reader:
+        return reader.read()
@@ -0,0 +1,5 @@
+from .client import JournalPusher, post_batch
+from .server import IngestServer
+from .wal import WriteAheadLog
+
+__all__ = ["IngestServer", "JournalPusher", "WriteAheadLog", "post_batch"]
@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+import urllib.request
+from collections import Counter
+from typing import Iterator, Optional
+from urllib.parse import quote
+from ..journal.decoders import get_decoder
+from ..journal.files import fingerprint
+from ..journal.parser import JournalEventParser
+from ..journal.traverser import JournalEventTraverser
+
+BATCH_SIZE = 2000
+
+
+def post_batch(
+    url: str, commander: str, lines: list[str], timeout: float = 30
+) -> dict[str, int]:
+    """Upload journal lines to an ingest server, returns its counts."""
+    request = urllib.request.Request(
+        url.rstrip("/") + "/ingest",
+        data=gzip.compress("\n".join(lines).encode(), compresslevel=6),
+        method="POST",
+        headers={
+            "Content-Type": "application/x-ndjson",
+            "Content-Encoding": "gzip",
+            "X-Commander": quote(commander),
+        },
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.load(response)  # type: ignore[no-any-return]
+
+
+class JournalPusher:
+    """Uploads the events of a journal directory the ingest server keeps.
+
+    Only lines of events `JournalEventParser` knows are sent. Journals that
+    were fully uploaded and haven't changed since are remembered in a small
+    state file and skipped; the live journal is sent again whole and the
+    server drops the lines it already has.
+    """
+
+    def __init__(
+        self, journal_path: str, url: str, state_path: str, batch_size: int = BATCH_SIZE
+    ) -> None:
+        self.traverser = JournalEventTraverser(journal_path)
+        self.parser = JournalEventParser()
+        _, self.decode = get_decoder()
+        self.url = url
+        self.state_path = state_path
+        self.batch_size = batch_size
+
+    def commander(self) -> Optional[str]:
+        """Commander of the newest LoadGame in the journals."""
+        for name in self.traverser.journal_files():
+            for line in self.traverser.read_lines(name):
+                if '"LoadGame"' in line:
+                    raw_event = self.decode(line)
+                    if raw_event["event"] == "LoadGame" and "Commander" in raw_event:
+                        return str(raw_event["Commander"])
+        return None
+
+    def _load_state(self) -> dict[str, list[int]]:
+        try:
+            with open(self.state_path) as f:
+                return json.load(f)  # type: ignore[no-any-return]
+        except FileNotFoundError:
+            return {}
+
+    def _save_state(self, state: dict[str, list[int]]) -> None:
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+    def batches(self, name: str, live: bool = False) -> Iterator[list[str]]:
+        """Lines of known events of one journal, oldest first, in batches.
+
+        The last line of the `live` journal is left out if it doesn't decode:
+        the game is still writing it, and it's sent with the next push.
+        """
+        batch = []
+        lines = list(self.traverser.read_lines(name))
+        for position, line in enumerate(reversed(lines), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                raw_event = self.decode(line)
+            except ValueError:
+                if live and position == len(lines):
+                    break
+                raise
+            if self.parser.recognises(raw_event.get("event", "")):
+                batch.append(line)
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def push(self, commander: str) -> Counter[str]:
+        state = self._load_state()
+        totals: Counter[str] = Counter()
+        listed = self.traverser.journal_files()
+        for name in reversed(listed):
+            current = list(fingerprint(self.traverser.journal_path, name)[1:])
+            if state.get(name) == current:
+                continue
+            for batch in self.batches(name, live=name == listed[0]):
+                totals.update(post_batch(self.url, commander, batch))
+            state[name] = current
+            self._save_state(state)
+        return totals
@@ -0,0 +1,219 @@
+import asyncio
+import io
+import json
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+from urllib.parse import unquote
+from ..viewers.pending_cargo import PendingCargoView
+from ..viewers.records import Record, RecordWriter
+from ..viewers.session import SessionView
+from .state import IngestBatch, SquadronState
+from .wal import WriteAheadLog
+
+# Uncompressed size of one upload
+MAX_BATCH_BYTES = 32 * 1024 * 1024
+WAL_FILE = "ingest.wal"
+
+
+class HTTPError(Exception):
+    def __init__(self, status: str) -> None:
+        super().__init__(status)
+        self.status = status
+
+
+class IngestServer:
+    """HTTP service collecting the journal events of a whole squadron.
+
+    `POST /ingest` takes newline separated journal lines, gzip compressed
+    with `Content-Encoding: gzip`, for the commander in the URL-quoted
+    `X-Commander` header. Lines are checked against what was seen before,
+    new events are appended to the write-ahead log and only then added to
+    the squadron state and acknowledged. Uploads arriving while the log is
+    being written are written together with one fsync.
+
+    `GET /sessions` and `GET /pending-cargo` return the squadron's sessions
+    and pending cargo as NDJSON records, like the commands' `--format
+    ndjson`.
+    """
+
+    def __init__(self, data_path: str, depth: int = 10) -> None:
+        self.state = SquadronState(depth)
+        self.wal = WriteAheadLog(os.path.join(data_path, WAL_FILE))
+        self._recover()
+        self._queue: list[tuple[IngestBatch, asyncio.Future[None]]] = []
+        self._writer: Optional[asyncio.Task[None]] = None
+        # Its own thread, so busy default executor threads never hold up acks
+        self._log_thread = ThreadPoolExecutor(max_workers=1)
+        self.server: Optional[asyncio.Server] = None
+
+    def _recover(self) -> None:
+        logged: dict[str, list[bytes]] = {}
+        for commander, line in self.wal.replay():
+            logged.setdefault(commander, []).append(line)
+        for commander, lines in logged.items():
+            self.state.add(self.state.check(commander, lines))
+
+    async def start(self, host: str, port: int) -> int:
+        """Start listening, returns the port (useful with port 0)."""
+        self.server = await asyncio.start_server(self._handle, host, port)
+        return int(self.server.sockets[0].getsockname()[1])
+
+    async def serve(self, host: str, port: int) -> None:
+        await self.start(host, port)
+        assert self.server is not None
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self._writer is not None:
+            await self._writer
+        self._log_thread.shutdown()
+        self.wal.close()
+
+    async def ingest(self, commander: str, lines: list[bytes]) -> IngestBatch:
+        batch = self.state.check(commander, lines)
+        if batch.lines:
+            try:
+                await self._log(batch)
+            except OSError:
+                self.state.forget(batch)
+                raise
+            self.state.add(batch)
+        return batch
+
+    async def _log(self, batch: IngestBatch) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((batch, future))
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_queued())
+        await future
+
+    async def _write_queued(self) -> None:
+        while self._queue:
+            queued, self._queue = self._queue, []
+            entries = [
+                (batch.commander, line) for batch, _ in queued for line in batch.lines
+            ]
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    self._log_thread, self.wal.append, entries
+                )
+            except OSError as error:
+                for _, future in queued:
+                    future.set_exception(error)
+            else:
+                for _, future in queued:
+                    future.set_result(None)
+        self._writer = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        content_type = "application/json"
+        try:
+            status = "200 OK"
+            body, content_type = await self._respond(reader)
+        except HTTPError as error:
+            status, body = error.status, json.dumps({"error": error.status}).encode()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except OSError:
+            status = "503 Service Unavailable"
+            body = json.dumps({"error": "write-ahead log failed"}).encode()
+
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode() + body
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _respond(self, reader: asyncio.StreamReader) -> tuple[bytes, str]:
+        request_line = (await reader.readline()).decode("latin-1")
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            raise HTTPError("400 Bad Request")
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        path = target.partition("?")[0]
+        if path == "/ingest":
+            if method != "POST":
+                raise HTTPError("405 Method Not Allowed")
+            batch = await self.ingest(
+                self._commander(headers), await self._read_lines(reader, headers)
+            )
+            counts = {
+                "accepted": len(batch.lines),
+                "duplicates": batch.duplicates,
+                "ignored": batch.ignored,
+                "rejected": batch.rejected,
+            }
+            return json.dumps(counts).encode(), "application/json"
+        if path in ("/sessions", "/pending-cargo"):
+            if method != "GET":
+                raise HTTPError("405 Method Not Allowed")
+            records = (
+                self._session_records()
+                if path == "/sessions"
+                else PendingCargoView(self.state.pending()).records()
+            )
+            return _ndjson(records), "application/x-ndjson"
+        raise HTTPError("404 Not Found")
+
+    def _commander(self, headers: dict[str, str]) -> str:
+        commander = unquote(headers.get("x-commander", ""))
+        if not commander:
+            raise HTTPError("400 Bad Request")
+        return commander
+
+    async def _read_lines(
+        self, reader: asyncio.StreamReader, headers: dict[str, str]
+    ) -> list[bytes]:
+        try:
+            length = int(headers["content-length"])
+        except (KeyError, ValueError):
+            raise HTTPError("411 Length Required")
+        if length > MAX_BATCH_BYTES:
+            raise HTTPError("413 Content Too Large")
+        body = await reader.readexactly(length)
+
+        encoding = headers.get("content-encoding", "identity")
+        if encoding == "gzip":
+            decompressor = zlib.decompressobj(wbits=31)
+            try:
+                body = decompressor.decompress(body, MAX_BATCH_BYTES)
+            except zlib.error:
+                raise HTTPError("400 Bad Request")
+            if decompressor.unconsumed_tail:
+                raise HTTPError("413 Content Too Large")
+        elif encoding != "identity":
+            raise HTTPError("415 Unsupported Media Type")
+        return body.split(b"\n")
+
+    def _session_records(self) -> Iterable[Record]:
+        view = SessionView(self.state.markets())
+        for commander in self.state.commanders():
+            for record in view.records(self.state.report(commander).sessions):
+                yield {"commander": commander} | record
+
+
+def _ndjson(records: Iterable[Record]) -> bytes:
+    stream = io.BytesIO()
+    with RecordWriter(stream, "ndjson") as writer:
+        writer.write_all(records)
+    return stream.getvalue()
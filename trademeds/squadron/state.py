@@ -0,0 +1,131 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import NamedTuple
+from pydantic import ValidationError
+from ..journal.decoders import get_decoder
+from ..journal.events import GameEvent
+from ..journal.parser import JournalEventParser
+from ..models.entities import CargoSession, Market
+from ..observers.cargo import VitalsCargoSessionCollector
+from ..observers.incomplete_cargo import IncompleteCargoTracker, IncompleteMission
+
+LineKey = tuple[str, bytes]  # commander, hash of the journal line
+
+
+@dataclass
+class IngestBatch:
+    """Uploaded lines sorted into new events and the ones dropped."""
+
+    commander: str
+    lines: list[bytes] = field(default_factory=list)  # new, to be logged
+    events: list[GameEvent] = field(default_factory=list)  # parsed `lines`
+    keys: list[LineKey] = field(default_factory=list)
+    duplicates: int = 0
+    ignored: int = 0  # events the parser doesn't know
+    rejected: int = 0  # lines that aren't valid journal events
+
+
+class CommanderReport(NamedTuple):
+    sessions: list[CargoSession]
+    markets: dict[int, Market]
+    pending: dict[int, IncompleteMission]
+
+
+def line_key(commander: str, line: bytes) -> LineKey:
+    return commander, hashlib.blake2b(line, digest_size=16).digest()
+
+
+class SquadronState:
+    """Journal events of every commander of the squadron.
+
+    Uploads can arrive in any order, so the events are kept and, when a
+    report is asked for, replayed newest first through the same observers
+    a journal traversal feeds. Reports are cached per commander until new
+    events for that commander come in.
+    """
+
+    def __init__(self, depth: int = 10) -> None:
+        self.depth = depth
+        self.parser = JournalEventParser()
+        _, self.decode = get_decoder()
+        self.seen: set[LineKey] = set()
+        self.events: dict[str, list[GameEvent]] = {}
+        self._reports: dict[str, CommanderReport] = {}
+
+    def check(self, commander: str, lines: list[bytes]) -> IngestBatch:
+        """Sort uploaded lines, marking the new ones as seen.
+
+        Marking them right away makes a concurrent upload of the same lines
+        count them as duplicates; `forget` undoes it if the batch can't be
+        logged.
+        """
+        batch = IngestBatch(commander)
+        new: set[LineKey] = set()
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            key = line_key(commander, line)
+            if key in self.seen or key in new:
+                batch.duplicates += 1
+                continue
+
+            try:
+                raw_event = self.decode(line)
+                if not self.parser.recognises(raw_event["event"]):
+                    batch.ignored += 1
+                    continue
+                event = self.parser.parse(raw_event)
+            except (ValueError, TypeError, KeyError, ValidationError):
+                batch.rejected += 1
+                continue
+            assert event is not None
+
+            batch.lines.append(line)
+            batch.events.append(event)
+            batch.keys.append(key)
+            new.add(key)
+        self.seen |= new
+        return batch
+
+    def forget(self, batch: IngestBatch) -> None:
+        self.seen.difference_update(batch.keys)
+
+    def add(self, batch: IngestBatch) -> None:
+        """Add the new events of a logged batch."""
+        if batch.events:
+            self.events.setdefault(batch.commander, []).extend(batch.events)
+            self._reports.pop(batch.commander, None)
+
+    def report(self, commander: str) -> CommanderReport:
+        if commander not in self._reports:
+            collector = VitalsCargoSessionCollector()
+            tracker = IncompleteCargoTracker(depth=self.depth)
+            # Newest first like a traversal; the sort is stable, so events
+            # with the same timestamp come in reverse upload order too
+            events = sorted(self.events.get(commander, []), key=lambda e: e.timestamp)
+            for event in reversed(events):
+                collector.handle_event(event)
+                tracker.handle_event(event)
+            self._reports[commander] = CommanderReport(
+                sessions=list(collector.sessions),
+                markets=collector.markets,
+                pending=tracker.missions,
+            )
+        return self._reports[commander]
+
+    def commanders(self) -> list[str]:
+        return sorted(self.events)
+
+    def markets(self) -> dict[int, Market]:
+        markets: dict[int, Market] = {}
+        for commander in self.commanders():
+            markets.update(self.report(commander).markets)
+        return markets
+
+    def pending(self) -> dict[int, IncompleteMission]:
+        """Pending cargo missions of the whole squadron."""
+        pending: dict[int, IncompleteMission] = {}
+        for commander in self.commanders():
+            pending.update(self.report(commander).pending)
+        return pending
@@ -0,0 +1,47 @@
+import json
+import os
+from typing import Iterator
+
+
+class WriteAheadLog:
+    """Append-only log of the journal lines the ingest server accepted.
+
+    Each entry is one line: the commander as a JSON string, a tab and the
+    journal line as uploaded. `append` writes a whole batch and fsyncs it
+    before returning, so an acknowledged upload survives a crash. A torn
+    last entry from a crash mid-write is cut off by `replay`.
+    """
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.entries = 0
+        self._file = open(path, "ab")
+
+    def close(self) -> None:
+        self._file.close()
+
+    def replay(self) -> Iterator[tuple[str, bytes]]:
+        """Entries as (commander, line) in the order they were appended."""
+        complete = 0
+        with open(self.path, "rb") as f:
+            for entry in f:
+                if not entry.endswith(b"\n"):
+                    break
+                commander, _, line = entry[:-1].partition(b"\t")
+                yield json.loads(commander), line
+                complete += len(entry)
+                self.entries += 1
+        if complete < os.path.getsize(self.path):
+            os.truncate(self.path, complete)
+
+    def append(self, entries: list[tuple[str, bytes]]) -> None:
+        self._file.write(
+            b"".join(
+                json.dumps(commander).encode() + b"\t" + line + b"\n"
+                for commander, line in entries
+            )
+        )
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.entries += len(entries)
@@ -0,0 +1,4 @@
+from .impact import ImpactCache
+from .influence import InfluenceIndex, InfluenceTotal
+
+__all__ = ["ImpactCache", "InfluenceIndex", "InfluenceTotal"]
@@ -0,0 +1,92 @@
+import json
+import os
+from datetime import datetime
+from typing import Optional
+from ..models.entities import CargoSession
+from ..models.impact import ImpactAggregate
+
+
+class ImpactCache:
+    """On-disk cache of impact aggregates for closed sessions.
+
+    A session is closed once a newer LoadGame exists, so its aggregate never
+    changes. `covered_since` records how far back the cache holds every
+    closed session, which lets callers only traverse journals newer than the
+    newest cached session.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.covered_since: Optional[datetime] = None
+        self._sessions: dict[datetime, ImpactAggregate] = {}
+        self._dirty = False
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path) as f:
+            data = json.load(f)
+
+        covered_since = data.get("covered_since")
+        self.covered_since = (
+            datetime.fromisoformat(covered_since) if covered_since else None
+        )
+        self._sessions = {
+            datetime.fromisoformat(started_at): ImpactAggregate.from_dict(aggregate)
+            for started_at, aggregate in data["sessions"].items()
+        }
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            "covered_since": (
+                self.covered_since.isoformat() if self.covered_since else None
+            ),
+            "sessions": {
+                started_at.isoformat(): aggregate.to_dict()
+                for started_at, aggregate in self._sessions.items()
+            },
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def resume_point(self, since: datetime) -> datetime:
+        """Oldest timestamp journals must still be traversed back to."""
+        if (
+            self.covered_since is None
+            or self.covered_since > since
+            or not self._sessions
+        ):
+            return since
+        return max(since, max(self._sessions))
+
+    def mark_covered(self, since: datetime) -> None:
+        if self.covered_since is None or since < self.covered_since:
+            self.covered_since = since
+            self._dirty = True
+
+    def aggregate(self, session: CargoSession) -> ImpactAggregate:
+        """Aggregate for a closed session, computed once and cached."""
+        aggregate = self._sessions.get(session.started_at)
+        if aggregate is None:
+            aggregate = ImpactAggregate.from_session(session)
+            self._sessions[session.started_at] = aggregate
+            self._dirty = True
+        return aggregate
+
+    def aggregates_between(
+        self, since: datetime, until: datetime
+    ) -> list[ImpactAggregate]:
+        """Cached aggregates for sessions started in [since, until)."""
+        return [
+            aggregate
+            for started_at, aggregate in self._sessions.items()
+            if since <= started_at < until
+        ]
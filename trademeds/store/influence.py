@@ -0,0 +1,139 @@
+import os
+import sqlite3
+from collections import defaultdict
+from datetime import date
+from typing import NamedTuple, Optional
+from ..journal.files import fingerprint, journal_name
+from ..journal.traverser import JournalEventTraverser
+from ..observers.influence import InfluenceCollector
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journals (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS systems (
+    address INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS influence (
+    journal TEXT NOT NULL,
+    system_address INTEGER NOT NULL,
+    faction TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    pluses INTEGER NOT NULL,
+    missions INTEGER NOT NULL,
+    PRIMARY KEY (journal, system_address, faction, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS influence_by_faction
+    ON influence (faction, system_address, day);
+"""
+
+
+class InfluenceTotal(NamedTuple):
+    system_address: int
+    system: Optional[str]
+    pluses: int
+    missions: int
+
+
+class InfluenceIndex:
+    """Daily influence totals keyed by system and faction, kept in sqlite.
+
+    Rows are stored per journal file so a journal that changed (the live one
+    grows during play) can be re-indexed without touching the rest of the
+    history. Journals deleted from disk keep their rows, archived journals
+    are re-indexed under their plain name.
+    """
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def update(self, traverser: JournalEventTraverser) -> int:
+        """Index journals that are new or changed since the last update.
+
+        Returns the number of journal files (re)indexed.
+        """
+        indexed = {
+            name: (size, mtime_ns)
+            for name, size, mtime_ns in self.connection.execute(
+                "SELECT name, size, mtime_ns FROM journals"
+            )
+        }
+
+        updated = 0
+        for name in traverser.journal_files():
+            journal = fingerprint(traverser.journal_path, name)
+            if indexed.get(journal_name(name)) == (journal.size, journal.mtime_ns):
+                continue
+
+            collector = InfluenceCollector()
+            for event in traverser.read_events(name):
+                collector.handle_event(event)
+
+            self._store(journal_name(name), journal.size, journal.mtime_ns, collector)
+            updated += 1
+
+        return updated
+
+    def _store(
+        self, name: str, size: int, mtime_ns: int, collector: InfluenceCollector
+    ) -> None:
+        daily: dict[tuple[int, str, int], list[int]] = defaultdict(lambda: [0, 0])
+        for record in collector.records:
+            key = (
+                record.system_address,
+                record.faction,
+                record.timestamp.date().toordinal(),
+            )
+            daily[key][0] += record.signed_pluses
+            daily[key][1] += 1
+
+        with self.connection:
+            self.connection.execute("DELETE FROM influence WHERE journal = ?", (name,))
+            self.connection.executemany(
+                "INSERT INTO influence VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (name, address, faction, day, pluses, missions)
+                    for (address, faction, day), (pluses, missions) in daily.items()
+                ],
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO systems VALUES (?, ?)",
+                collector.systems.items(),
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO journals VALUES (?, ?, ?)",
+                (name, size, mtime_ns),
+            )
+
+    def query(
+        self,
+        faction: str,
+        system: Optional[str] = None,
+        since: Optional[date] = None,
+    ) -> list[InfluenceTotal]:
+        """Influence delivered to `faction` per system, optionally narrowed."""
+        sql = """
+            SELECT i.system_address, s.name, SUM(i.pluses), SUM(i.missions)
+            FROM influence i LEFT JOIN systems s ON s.address = i.system_address
+            WHERE i.faction = ?
+        """
+        params: list[object] = [faction]
+        if system is not None:
+            sql += (
+                " AND i.system_address IN (SELECT address FROM systems WHERE name = ?)"
+            )
+            params.append(system)
+        if since is not None:
+            sql += " AND i.day >= ?"
+            params.append(since.toordinal())
+        sql += " GROUP BY i.system_address ORDER BY SUM(i.pluses) DESC"
+
+        return [InfluenceTotal(*row) for row in self.connection.execute(sql, params)]
@@ -0,0 +1,208 @@
+import json
+import os
+import sqlite3
+from dataclasses import asdict
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+from ..journal.files import fingerprint, journal_name
+from ..journal.filters import raw_event_name
+from ..journal.traverser import JournalEventTraverser
+from ..models.entities import Market
+from ..observers.market import CommodityPriceCollector
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journals (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS markets (
+    market_id INTEGER PRIMARY KEY,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prices (
+    journal TEXT NOT NULL,
+    commodity TEXT NOT NULL,
+    market_id INTEGER NOT NULL,
+    last_at TEXT NOT NULL,
+    last_price INTEGER NOT NULL,
+    best_at TEXT NOT NULL,
+    best_price INTEGER NOT NULL,
+    bought INTEGER NOT NULL,
+    PRIMARY KEY (journal, commodity, market_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS prices_by_commodity ON prices (commodity, market_id);
+"""
+
+# The only events `CommodityPriceCollector` uses, other lines aren't decoded
+_PRICED = frozenset({"MarketBuy", "Market"})
+
+
+class PriceSource(NamedTuple):
+    """Where a commodity was bought, with the last and the lowest price paid."""
+
+    market_id: int
+    market: Optional[Market]
+    last_at: datetime
+    last_price: int
+    best_at: datetime
+    best_price: int
+    bought: int
+
+
+class PriceIndex:
+    """Buy prices per commodity and market, kept in sqlite.
+
+    Like `InfluenceIndex`, rows are stored per journal file and only new or
+    changed journals are read on `update`, and of those only the lines of
+    `_PRICED` events are decoded. Looking up a commodity reads its few rows
+    through an index instead of the buy history.
+    """
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def update(self, traverser: JournalEventTraverser) -> int:
+        """Index journals that are new or changed since the last update.
+
+        Rows of journals that are no longer listed are removed. Returns the
+        number of journal files (re)indexed.
+        """
+        indexed = {
+            name: (size, mtime_ns)
+            for name, size, mtime_ns in self.connection.execute(
+                "SELECT name, size, mtime_ns FROM journals"
+            )
+        }
+        listed = traverser.journal_files()
+        self._prune(set(indexed) - {journal_name(name) for name in listed})
+
+        updated = 0
+        for name in listed:
+            journal = fingerprint(traverser.journal_path, name)
+            if indexed.get(journal_name(name)) == (journal.size, journal.mtime_ns):
+                continue
+
+            collector = CommodityPriceCollector()
+            lines = traverser.read_lines(name)
+            for event in traverser.parse_lines(
+                line for line in lines if raw_event_name(line) in _PRICED
+            ):
+                collector.handle_event(event)
+
+            self._store(journal_name(name), journal.size, journal.mtime_ns, collector)
+            updated += 1
+
+        return updated
+
+    def _prune(self, names: set[str]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM prices WHERE journal = ?", [(name,) for name in names]
+            )
+            self.connection.executemany(
+                "DELETE FROM journals WHERE name = ?", [(name,) for name in names]
+            )
+
+    def _store(
+        self, name: str, size: int, mtime_ns: int, collector: CommodityPriceCollector
+    ) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM prices WHERE journal = ?", (name,))
+            self.connection.executemany(
+                "INSERT INTO prices VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        name,
+                        commodity,
+                        market_id,
+                        prices.last_at.isoformat(),
+                        prices.last_price,
+                        prices.best_at.isoformat(),
+                        prices.best_price,
+                        prices.bought,
+                    )
+                    for (commodity, market_id), prices in collector.prices.items()
+                ],
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO markets VALUES (?, ?)",
+                [
+                    (market_id, json.dumps(asdict(market)))
+                    for market_id, market in collector.markets.items()
+                ],
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO journals VALUES (?, ?, ?)",
+                (name, size, mtime_ns),
+            )
+
+    def sources(self, commodity: str) -> list[PriceSource]:
+        """Markets `commodity` (a `commodity_key`) was bought at, cheapest first.
+
+        Ordered by the last price paid, which is what the market most
+        likely still asks, and then by how recently it was paid.
+        """
+        merged: dict[int, PriceSource] = {}
+        for row in self.connection.execute(
+            "SELECT market_id, last_at, last_price, best_at, best_price, bought"
+            " FROM prices WHERE commodity = ? ORDER BY last_at DESC",
+            (commodity,),
+        ):
+            source = PriceSource(
+                market_id=row[0],
+                market=None,
+                last_at=datetime.fromisoformat(row[1]),
+                last_price=row[2],
+                best_at=datetime.fromisoformat(row[3]),
+                best_price=row[4],
+                bought=row[5],
+            )
+            # Rows of a market from several journals fold into its newest one
+            newer = merged.get(source.market_id)
+            if newer is None:
+                merged[source.market_id] = source
+            elif source.best_price < newer.best_price:
+                merged[source.market_id] = newer._replace(
+                    best_at=source.best_at,
+                    best_price=source.best_price,
+                    bought=newer.bought + source.bought,
+                )
+            else:
+                merged[source.market_id] = newer._replace(
+                    bought=newer.bought + source.bought
+                )
+
+        markets = self.markets(merged)
+        return sorted(
+            (
+                source._replace(market=markets.get(market_id))
+                for market_id, source in merged.items()
+            ),
+            key=lambda source: (source.last_price, -source.last_at.timestamp()),
+        )
+
+    def suggest(self, commodities: Iterable[str]) -> dict[str, PriceSource]:
+        """The first of `sources` for each commodity bought anywhere yet."""
+        suggested = {}
+        for commodity in commodities:
+            sources = self.sources(commodity)
+            if sources:
+                suggested[commodity] = sources[0]
+        return suggested
+
+    def markets(self, market_ids: Iterable[int]) -> dict[int, Market]:
+        market_ids = list(market_ids)
+        return {
+            market_id: Market(**json.loads(payload))
+            for market_id, payload in self.connection.execute(
+                "SELECT market_id, payload FROM markets WHERE market_id IN"
+                f" ({', '.join('?' * len(market_ids))})",
+                market_ids,
+            )
+        }
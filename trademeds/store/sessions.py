@@ -0,0 +1,251 @@
+import json
+import os
+import pickle
+import sqlite3
+import zlib
+from dataclasses import asdict
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional
+from ..journal.files import JournalFingerprint, fingerprint, list_journal_files
+from ..journal.traverser import JournalEventTraverser
+from ..models.entities import CargoSession, Market
+from ..observers.cargo import VitalsCargoSessionCollector
+from .spool import SessionSpool
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    started_at TEXT PRIMARY KEY,
+    ended_at TEXT NOT NULL,
+    older_started_at TEXT,
+    sources TEXT NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS markets (
+    market_id INTEGER PRIMARY KEY,
+    payload TEXT NOT NULL
+);
+"""
+
+# Bumped when VitalsCargoSessionCollector builds sessions differently, which
+# drops the stored sessions
+_VERSION = 2
+
+
+class StoredSession(NamedTuple):
+    started_at: datetime
+    ended_at: datetime
+    older_started_at: Optional[datetime]
+    sources: list[JournalFingerprint]
+
+
+class SessionStore:
+    """Closed `CargoSession` results persisted between runs.
+
+    Sessions are keyed by their start timestamp and remember the journal
+    files they were built from. Each one links to the next older session it
+    was built together with, so a run can walk back through stored history
+    without touching the journals. A stored session is only trusted while its
+    journal files are unchanged; the newest journal may keep growing because
+    new events are only ever appended to it.
+    """
+
+    def __init__(self, path: str, journal_path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != _VERSION:
+            with self.connection:
+                self.connection.execute("DELETE FROM sessions")
+                self.connection.execute(f"PRAGMA user_version = {_VERSION}")
+        self.journal_path = journal_path
+        self._fingerprints: dict[str, Optional[JournalFingerprint]] = {}
+        self._newest_journal: Optional[str] = None
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _current(self, name: str) -> Optional[JournalFingerprint]:
+        if name not in self._fingerprints:
+            try:
+                self._fingerprints[name] = fingerprint(self.journal_path, name)
+            except FileNotFoundError:
+                self._fingerprints[name] = None
+        return self._fingerprints[name]
+
+    def _is_valid(self, session: StoredSession) -> bool:
+        if self._newest_journal is None:
+            journals = list_journal_files(self.journal_path)
+            self._newest_journal = journals[0] if journals else ""
+
+        for source in session.sources:
+            current = self._current(source.name)
+            if current is None:
+                return False
+            if current == source:
+                continue
+            if source.name != self._newest_journal or current.size < source.size:
+                return False
+        return True
+
+    def _stored(self, row: tuple[str, str, Optional[str], str]) -> StoredSession:
+        started_at, ended_at, older_started_at, sources = row
+        return StoredSession(
+            started_at=datetime.fromisoformat(started_at),
+            ended_at=datetime.fromisoformat(ended_at),
+            older_started_at=(
+                datetime.fromisoformat(older_started_at) if older_started_at else None
+            ),
+            sources=[JournalFingerprint(*source) for source in json.loads(sources)],
+        )
+
+    def newest(self) -> Optional[StoredSession]:
+        """Newest stored session, if its journals are unchanged."""
+        row = self.connection.execute(
+            "SELECT started_at, ended_at, older_started_at, sources FROM sessions"
+            " ORDER BY started_at DESC LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        session = self._stored(row)
+        return session if self._is_valid(session) else None
+
+    def chain(self, session: StoredSession, limit: int) -> Iterator[CargoSession]:
+        """Up to `limit` valid sessions starting at `session`, newest first."""
+        started_at: Optional[datetime] = session.started_at
+        while limit > 0 and started_at is not None:
+            row = self.connection.execute(
+                "SELECT started_at, ended_at, older_started_at, sources, payload"
+                " FROM sessions WHERE started_at = ?",
+                (started_at.isoformat(),),
+            ).fetchone()
+            if row is None:
+                return
+
+            stored = self._stored(row[:4])
+            if not self._is_valid(stored):
+                return
+
+            yield pickle.loads(zlib.decompress(row[4]))
+            started_at = stored.older_started_at
+            limit -= 1
+
+    def put(
+        self,
+        sessions: Iterable[CargoSession],
+        sources: Iterable[list[JournalFingerprint]],
+        older_started_at: Optional[datetime] = None,
+    ) -> None:
+        """Store consecutive closed sessions, newest first.
+
+        `older_started_at` links the oldest one to an already stored session;
+        without it that session keeps any link it got in an earlier run.
+        """
+
+        def row(
+            session: CargoSession,
+            sources: list[JournalFingerprint],
+            older: Optional[datetime],
+        ) -> tuple[str, str, Optional[str], str, bytes]:
+            return (
+                session.started_at.isoformat(),
+                session.ended_at.isoformat(),
+                older.isoformat() if older else None,
+                json.dumps(sources),
+                zlib.compress(pickle.dumps(session, pickle.HIGHEST_PROTOCOL)),
+            )
+
+        def rows() -> Iterator[tuple[str, str, Optional[str], str, bytes]]:
+            # One session at a time, the link of each is the next one's start
+            newer: Optional[tuple[CargoSession, list[JournalFingerprint]]] = None
+            for session, session_sources in zip(sessions, sources):
+                if newer is not None:
+                    yield row(*newer, session.started_at)
+                newer = session, session_sources
+            if newer is not None:
+                yield row(*newer, older_started_at)
+
+        with self.connection:
+            self.connection.executemany(
+                """
+                INSERT INTO sessions VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (started_at) DO UPDATE SET
+                    ended_at = excluded.ended_at,
+                    older_started_at = COALESCE(
+                        excluded.older_started_at, sessions.older_started_at
+                    ),
+                    sources = excluded.sources,
+                    payload = excluded.payload
+                """,
+                rows(),
+            )
+
+    def markets(self) -> dict[int, Market]:
+        return {
+            market_id: Market(**json.loads(payload))
+            for market_id, payload in self.connection.execute(
+                "SELECT market_id, payload FROM markets"
+            )
+        }
+
+    def put_markets(self, markets: dict[int, Market]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO markets VALUES (?, ?)",
+                [
+                    (market_id, json.dumps(asdict(market)))
+                    for market_id, market in markets.items()
+                ],
+            )
+
+
+def collect_sessions(
+    store: SessionStore, count: int, max_memory: Optional[int] = None
+) -> tuple[SessionSpool, dict[int, Market]]:
+    """Newest `count` sessions, reading closed ones from the store when possible.
+
+    Only journal events newer than the newest stored session are traversed,
+    and every session found there is returned and stored, even beyond `count`.
+    If the stored history is too short or no longer matches the journals,
+    the sessions are rebuilt from the journals and stored again. Beyond
+    `max_memory` bytes the sessions are spilled to disk, see `SessionSpool`;
+    the caller closes the spool.
+    """
+    anchor = store.newest()
+    if anchor is not None:
+        sessions, markets = traverse_sessions(store, count, anchor, max_memory)
+        sessions.extend(store.chain(anchor, count - len(sessions)))
+        if len(sessions) >= count:
+            return sessions, store.markets() | markets
+        sessions.close()
+
+    sessions, markets = traverse_sessions(store, count, max_memory=max_memory)
+    return sessions, store.markets() | markets
+
+
+def traverse_sessions(
+    store: SessionStore,
+    count: int,
+    anchor: Optional[StoredSession] = None,
+    max_memory: Optional[int] = None,
+) -> tuple[SessionSpool, dict[int, Market]]:
+    """Build sessions from the journals, newer than `anchor` if given."""
+    traverser = JournalEventTraverser(store.journal_path)
+    collector = VitalsCargoSessionCollector(max_memory=max_memory)
+    traverser.add_observer(collector)
+    if anchor is not None:
+        # All the way to the anchor, however many sessions were played since,
+        # or the oldest new session would be linked past the ones in between
+        traverser.traverse(max_sessions=None, since=anchor.ended_at)
+    else:
+        traverser.traverse(max_sessions=count)
+
+    # The first session is the live one and may still change
+    store.put(
+        islice(collector.sessions, 1, None),
+        collector.session_sources[1:],
+        older_started_at=anchor.started_at if anchor is not None else None,
+    )
+    store.put_markets(collector.markets)
+
+    return collector.sessions, collector.markets
@@ -0,0 +1,162 @@
+import gc
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import zlib
+from collections.abc import Sequence
+from itertools import islice
+from typing import Iterable, Iterator, Optional, overload
+from ..models.entities import CargoSession
+
+_SCHEMA = """
+CREATE TABLE sessions (
+    position INTEGER PRIMARY KEY,
+    payload BLOB NOT NULL
+);
+"""
+
+
+def parse_size(size: str) -> int:
+    """Bytes in a size like "512M", "2G" or "65536"."""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    size = size.strip().upper().removesuffix("B")
+    if size[-1:] in units:
+        return int(float(size[:-1]) * units[size[-1]])
+    return int(size)
+
+
+def footprint(obj: object) -> int:
+    """Bytes of `obj` and everything it holds, up to classes and functions."""
+    seen = set()
+    size = 0
+    pending = [obj]
+    while pending:
+        item = pending.pop()
+        # A defaultdict's factory would otherwise lead into whole modules
+        if id(item) in seen or isinstance(item, type) or callable(item):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        pending.extend(gc.get_referents(item))
+    return size
+
+
+class SessionSpool(Sequence[CargoSession]):
+    """Sessions in the order they were appended, kept under a memory budget.
+
+    Without `max_memory` this is a plain list. With it, the `footprint` of
+    the sessions held in memory is counted, and once it goes over the budget
+    they all move to a temporary sqlite database. Iterating streams them
+    back one at a time, so a long history can be rendered without loading
+    it. The database is created on the first spill and removed by `close`.
+    """
+
+    def __init__(self, max_memory: Optional[int] = None) -> None:
+        self.max_memory = max_memory
+        self.held: list[CargoSession] = []
+        self.held_bytes = 0
+        self.spilled = 0
+        self._directory: Optional[tempfile.TemporaryDirectory[str]] = None
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def append(self, session: CargoSession) -> None:
+        self.held.append(session)
+        if self.max_memory is None:
+            return
+        self.held_bytes += footprint(session)
+        if self.held_bytes > self.max_memory:
+            self._spill()
+
+    def extend(self, sessions: Iterable[CargoSession]) -> None:
+        for session in sessions:
+            self.append(session)
+
+    def _spill(self) -> None:
+        if self._connection is None:
+            self._directory = tempfile.TemporaryDirectory(prefix="trademeds-")
+            self._connection = sqlite3.connect(
+                os.path.join(self._directory.name, "spool.sqlite3")
+            )
+            self._connection.executescript(_SCHEMA)
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO sessions VALUES (?, ?)",
+                (
+                    (
+                        self.spilled + i,
+                        zlib.compress(pickle.dumps(session, pickle.HIGHEST_PROTOCOL)),
+                    )
+                    for i, session in enumerate(self.held)
+                ),
+            )
+        self.spilled += len(self.held)
+        self.held = []
+        self.held_bytes = 0
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+    def __len__(self) -> int:
+        return self.spilled + len(self.held)
+
+    def __iter__(self) -> Iterator[CargoSession]:
+        if self._connection is not None:
+            # Fetched in pages, so the cursor stays valid if the spool grows
+            position = 0
+            while position < self.spilled:
+                rows = self._connection.execute(
+                    "SELECT payload FROM sessions WHERE position >= ?"
+                    " ORDER BY position LIMIT 64",
+                    (position,),
+                ).fetchall()
+                for (payload,) in rows:
+                    yield pickle.loads(zlib.decompress(payload))
+                position += len(rows)
+        yield from self.held
+
+    def __eq__(self, other: object) -> bool:
+        # Compares like the list it stands in for
+        if isinstance(other, (SessionSpool, list)):
+            return len(self) == len(other) and all(
+                session == other_session for session, other_session in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @overload
+    def __getitem__(self, index: int) -> CargoSession: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[CargoSession]: ...
+
+    def __getitem__(self, index: int | slice) -> CargoSession | list[CargoSession]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(islice(self, start, stop))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("session index out of range")
+        if index >= self.spilled:
+            return self.held[index - self.spilled]
+        assert self._connection is not None
+        (payload,) = self._connection.execute(
+            "SELECT payload FROM sessions WHERE position = ?", (index,)
+        ).fetchone()
+        return pickle.loads(zlib.decompress(payload))  # type: ignore[no-any-return]
+
+    def __getstate__(self) -> dict[str, object]:
+        # Collectors travel to worker processes, always before they spill
+        assert self._connection is None, "a spilled spool can't be pickled"
+        return self.__dict__
@@ -0,0 +1,234 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Literal
+import numpy as np
+from ..journal.events import MarketBuyEvent, MarketSellEvent
+from ..journal.files import fingerprint, journal_name
+from ..journal.traverser import JournalEventTraverser
+from ..models.entities import Market
+from ..observers.market import MarketTradeCollector
+
+BUY = 1
+SELL = -1
+
+COLUMNS: dict[str, type[np.generic]] = {
+    "timestamp": np.int64,  # unix seconds
+    "market_id": np.int64,
+    "commodity_id": np.int32,
+    "side": np.int8,  # BUY or SELL
+    "count": np.int32,
+    "price": np.int32,
+    "total": np.int64,
+    "avg_paid": np.int32,  # average price paid for sold goods, buy price for buys
+}
+
+GroupBy = Literal["day", "commodity", "market"]
+
+
+@dataclass(frozen=True)
+class TradeStats:
+    """Per-group totals, one array element per group key."""
+
+    keys: np.ndarray
+    bought: np.ndarray
+    cost: np.ndarray
+    sold: np.ndarray
+    revenue: np.ndarray
+    profit: np.ndarray
+
+
+class TradeStore:
+    """Append-only columnar store of market transactions.
+
+    Every column lives in its own raw file that is memory-mapped for reading.
+    `meta.json` holds the committed row count, commodity and market
+    dictionaries and how many trades were taken from each journal, so a
+    journal that grew since the last update only has its new trades appended.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.rows = 0
+        self.commodities: list[str] = []
+        self.commodity_names: dict[str, str] = {}
+        self.markets: dict[int, Market] = {}
+        self.journals: dict[str, dict[str, int]] = {}
+        self._commodity_ids: dict[str, int] = {}
+        self._load_meta()
+
+    def _column_path(self, column: str) -> str:
+        return os.path.join(self.path, f"{column}.bin")
+
+    def _load_meta(self) -> None:
+        meta_path = os.path.join(self.path, "meta.json")
+        if not os.path.exists(meta_path):
+            return
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        self.rows = meta["rows"]
+        self.commodities = meta["commodities"]
+        self.commodity_names = meta["commodity_names"]
+        self.markets = {
+            int(market_id): Market(**market)
+            for market_id, market in meta["markets"].items()
+        }
+        self.journals = meta["journals"]
+        self._commodity_ids = {name: i for i, name in enumerate(self.commodities)}
+
+    def _save_meta(self) -> None:
+        meta = {
+            "rows": self.rows,
+            "commodities": self.commodities,
+            "commodity_names": self.commodity_names,
+            "markets": {
+                market_id: {
+                    "market_id": market.market_id,
+                    "station_name": market.station_name,
+                    "system_name": market.system_name,
+                    "is_carrier": market.is_carrier,
+                }
+                for market_id, market in self.markets.items()
+            },
+            "journals": self.journals,
+        }
+        meta_path = os.path.join(self.path, "meta.json")
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def _commodity_id(self, event: MarketBuyEvent | MarketSellEvent) -> int:
+        commodity_id = self._commodity_ids.get(event.type)
+        if commodity_id is None:
+            commodity_id = self._commodity_ids[event.type] = len(self.commodities)
+            self.commodities.append(event.type)
+        if event.type_localised:
+            self.commodity_names[event.type] = event.type_localised
+        return commodity_id
+
+    def update(self, traverser: JournalEventTraverser) -> int:
+        """Append trades from new or grown journals, returns rows appended."""
+        os.makedirs(self.path, exist_ok=True)
+        new_rows: list[tuple[int, ...]] = []
+
+        for name in traverser.journal_files():
+            journal = fingerprint(traverser.journal_path, name)
+            # An archived journal keeps its trades under the plain name
+            known = self.journals.get(journal_name(name))
+            if known and (known["size"], known["mtime_ns"]) == (
+                journal.size,
+                journal.mtime_ns,
+            ):
+                continue
+
+            collector = MarketTradeCollector()
+            for event in traverser.read_events(name):
+                collector.handle_event(event)
+
+            # Journals only ever grow, so trades already stored are a prefix
+            trades = collector.trades[::-1]
+            already_stored = known["trades"] if known else 0
+            for trade in trades[already_stored:]:
+                new_rows.append(self._row(trade))
+
+            for market_id, market in collector.markets.items():
+                self.markets.setdefault(market_id, market)
+            self.journals[journal_name(name)] = {
+                "size": journal.size,
+                "mtime_ns": journal.mtime_ns,
+                "trades": len(trades),
+            }
+
+        self._append(new_rows)
+        self._save_meta()
+        return len(new_rows)
+
+    def _row(self, trade: MarketBuyEvent | MarketSellEvent) -> tuple[int, ...]:
+        timestamp = int(trade.timestamp.timestamp())
+        commodity_id = self._commodity_id(trade)
+        if isinstance(trade, MarketBuyEvent):
+            return (
+                timestamp,
+                trade.market_id,
+                commodity_id,
+                BUY,
+                trade.count,
+                trade.buy_price,
+                trade.total_cost,
+                trade.buy_price,
+            )
+        return (
+            timestamp,
+            trade.market_id,
+            commodity_id,
+            SELL,
+            trade.count,
+            trade.sell_price,
+            trade.total_sale,
+            trade.avg_price_paid,
+        )
+
+    def _append(self, rows: list[tuple[int, ...]]) -> None:
+        if not rows:
+            return
+
+        values = list(zip(*rows))
+        for i, (column, dtype) in enumerate(COLUMNS.items()):
+            with open(self._column_path(column), "ab") as f:
+                # Drop bytes of an interrupted append that never made it to meta
+                f.truncate(self.rows * np.dtype(dtype).itemsize)
+                np.asarray(values[i], dtype=dtype).tofile(f)
+        self.rows += len(rows)
+
+    def column(self, name: str) -> np.ndarray:
+        dtype = COLUMNS[name]
+        if self.rows == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(
+            self._column_path(name), dtype=dtype, mode="r", shape=(self.rows,)
+        )
+
+    def stats(self, by: GroupBy, since: int | None = None) -> TradeStats:
+        """Vectorised totals grouped by day, commodity or market."""
+        timestamp = self.column("timestamp")
+        if by == "day":
+            keys: np.ndarray = timestamp // 86400
+        elif by == "commodity":
+            keys = self.column("commodity_id")
+        else:
+            keys = self.column("market_id")
+
+        side = self.column("side")
+        count = self.column("count").astype(np.int64)
+        total = self.column("total")
+        avg_paid = self.column("avg_paid").astype(np.int64)
+
+        if since is not None:
+            selected = timestamp >= since
+            keys, side, count, total, avg_paid = (
+                keys[selected],
+                side[selected],
+                count[selected],
+                total[selected],
+                avg_paid[selected],
+            )
+
+        groups, inverse = np.unique(keys, return_inverse=True)
+        is_buy = side == BUY
+        is_sell = side == SELL
+
+        def group_sum(values: Any) -> np.ndarray:
+            return np.bincount(inverse, weights=values, minlength=len(groups)).astype(
+                np.int64
+            )
+
+        return TradeStats(
+            keys=groups,
+            bought=group_sum(count * is_buy),
+            cost=group_sum(total * is_buy),
+            sold=group_sum(count * is_sell),
+            revenue=group_sum(total * is_sell),
+            profit=group_sum((total - avg_paid * count) * is_sell),
+        )
@@ -0,0 +1,150 @@
+import curses
+from datetime import datetime, timezone
+from typing import Callable
+from ..journal.tail import JournalTail
+from ..observers.dashboard import (
+    CARGO,
+    MISSIONS,
+    PANELS,
+    SALES,
+    THROUGHPUT,
+    DashboardState,
+)
+from .throughput import format_duration
+
+
+def sales_lines(state: DashboardState) -> list[str]:
+    lines = ["Sales"]
+    for market_id, goods in state.sold.items():
+        market = state.markets.get(market_id)
+        if market is None:
+            lines.append(f"Market #{market_id}")
+        elif market.is_carrier:
+            lines.append(f"Carrier {market.station_name}")
+        else:
+            lines.append(f"{market.system_name} > {market.station_name}")
+        for good, count in goods.most_common():
+            lines.append(f"  {good}: {count:,}")
+    return lines
+
+
+def missions_lines(state: DashboardState) -> list[str]:
+    lines = ["Missions"]
+    for faction, count in state.missions.most_common():
+        lines.append(f"{faction}")
+        lines.append(f"  {count} completed, influence +{state.influence[faction]}")
+    return lines
+
+
+def cargo_lines(state: DashboardState) -> list[str]:
+    total = sum(mission.count for mission in state.pending.values())
+    lines = [f"Pending cargo ({total:,} t)"]
+    by_system: dict[str, dict[str, int]] = {}
+    for mission in state.pending.values():
+        goods = by_system.setdefault(mission.system, {})
+        goods[mission.good] = goods.get(mission.good, 0) + mission.count
+    for system, goods in sorted(by_system.items()):
+        lines.append(system)
+        for good, count in sorted(goods.items(), key=lambda x: (-x[1], x[0])):
+            lines.append(f"  {good}: {count:,}")
+    if state.notices:
+        lines.append("Expiring")
+        lines.extend(f"  {notice}" for notice in reversed(state.notices))
+    return lines
+
+
+def throughput_lines(state: DashboardState) -> list[str]:
+    now = datetime.now(timezone.utc)
+    return [
+        "  ".join(
+            f"{format_duration(rates.duration)}: {rates.tons_per_hour:,.0f} t/h"
+            f" {rates.credits_per_hour:,.0f} cr/h"
+            f" loop {format_duration(rates.loop_time)}"
+            for rates in state.trades.rates(now)
+        )
+    ]
+
+
+RENDERERS: dict[str, Callable[[DashboardState], list[str]]] = {
+    SALES: sales_lines,
+    MISSIONS: missions_lines,
+    CARGO: cargo_lines,
+    THROUGHPUT: throughput_lines,
+}
+
+
+def changed_rows(old: list[str], new: list[str]) -> list[tuple[int, str]]:
+    """Rows to rewrite to turn `old` into `new`, vanished rows become blank."""
+    changes = [
+        (row, text)
+        for row, text in enumerate(new)
+        if row >= len(old) or old[row] != text
+    ]
+    changes.extend((row, "") for row in range(len(new), len(old)))
+    return changes
+
+
+class DashboardView:
+    """Panels side by side, with the throughput on the bottom line.
+
+    Each panel remembers the lines on screen, and only rows whose text
+    changed are written again.
+    """
+
+    def __init__(self, screen: "curses.window") -> None:
+        self.screen = screen
+        self.shown: dict[str, list[str]] = {panel: [] for panel in PANELS}
+        self.layout()
+
+    def layout(self) -> None:
+        height, width = self.screen.getmaxyx()
+        column = width // 3
+        # panel -> top row, left column, width, rows
+        self.boxes = {
+            SALES: (1, 0, column - 1, height - 2),
+            MISSIONS: (1, column, column - 1, height - 2),
+            CARGO: (1, 2 * column, width - 2 * column - 1, height - 2),
+            THROUGHPUT: (height - 1, 0, width - 1, 1),
+        }
+        self.shown = {panel: [] for panel in PANELS}
+        self.screen.erase()
+        self.screen.addnstr(0, 0, "trademeds dashboard (q to quit)", width - 1)
+
+    def update(self, panels: dict[str, list[str]]) -> None:
+        for panel, lines in panels.items():
+            top, left, width, rows = self.boxes[panel]
+            lines = [line[:width].ljust(width) for line in lines[:rows]]
+            for row, text in changed_rows(self.shown[panel], lines):
+                self.screen.addnstr(top + row, left, text or " " * width, width)
+            self.shown[panel] = lines
+        self.screen.refresh()
+
+
+def run_dashboard(
+    screen: "curses.window",
+    state: DashboardState,
+    tail: JournalTail,
+    interval_ms: int = 1000,
+) -> None:
+    curses.curs_set(0)
+    # getch sleeps in the terminal until a key or the timeout, keeping idle CPU low
+    screen.timeout(interval_ms)
+    view = DashboardView(screen)
+    touched = set(PANELS)
+    while True:
+        if state.check_expiries(datetime.now(timezone.utc)):
+            touched.add(CARGO)
+        view.update({panel: RENDERERS[panel](state) for panel in touched})
+
+        key = screen.getch()
+        if key in (ord("q"), ord("Q"), 27):
+            return
+        if key == curses.KEY_RESIZE:
+            view.layout()
+            touched = set(PANELS)
+            continue
+
+        # The rolling windows move with time even without new events
+        touched = {THROUGHPUT}
+        for event in tail.poll():
+            touched |= state.handle_event(event)
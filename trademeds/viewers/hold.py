@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Iterator
+from ..models.hold import HoldReport
+from .records import Record
+
+
+class HoldView:
+    def __init__(self, report: HoldReport) -> None:
+        self.report = report
+
+    def records(self, at: datetime) -> Iterator[Record]:
+        for delivery in self.report.deliveries:
+            record: Record = {
+                "type": "hold_delivery",
+                "at": at,
+                "system": delivery.system,
+                "good": delivery.good,
+                "owed": delivery.owed,
+                "loaded": delivery.loaded,
+                "short": delivery.short,
+            }
+            available = self.report.available.get(delivery.good)
+            if available is not None and self.report.market is not None:
+                record["market_id"] = self.report.market.market_id
+                record["stock"] = available.stock
+                record["buy_price"] = available.buy_price
+            yield record
+        for good, count in self.report.spare.items():
+            yield {"type": "hold_spare", "at": at, "good": good, "count": count}
+
+    def display(self, at: datetime) -> None:
+        market = self.report.market
+        where = f" ({market.system_name} > {market.station_name})" if market else ""
+        print(f"\nHold and pending cargo at {at.strftime('%H:%M:%S')}{where}:\n")
+
+        system = None
+        for delivery in self.report.deliveries:
+            if delivery.system != system:
+                if system is not None:
+                    print()
+                system = delivery.system
+                print(f"{system}:")
+            line = (
+                f"  {delivery.good}: {delivery.loaded:,} loaded"
+                f" of {delivery.owed:,} owed"
+            )
+            if delivery.short:
+                line += f", {delivery.short:,} short"
+                available = self.report.available.get(delivery.good)
+                if available is not None:
+                    line += (
+                        f" ({available.stock:,} in stock"
+                        f" at {available.buy_price:,} cr)"
+                    )
+            print(line)
+        if system is not None:
+            print()
+
+        if self.report.spare:
+            print("Not needed by pending missions:")
+            for good, count in self.report.spare.items():
+                print(f"  {good}: {count:,}")
+            print()
@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Iterator
+from ..models.impact import (
+    ImpactAggregate,
+    CargoMissionSummary,
+    DonationMissionSummary,
+)
+from .records import Record
+from .session import localise_mission_faction_effect
+
+
+class ImpactView:
+    def __init__(self, aggregate: ImpactAggregate) -> None:
+        self.aggregate = aggregate
+
+    def records(self, since: datetime, sessions: int) -> Iterator[Record]:
+        yield {"type": "impact", "since": since, "sessions": sessions}
+        for faction, mission_types in sorted(self.aggregate.factions.items()):
+            for mission_type, summary in sorted(mission_types.items()):
+                yield {
+                    "type": "mission_group",
+                    "faction": faction,
+                    "mission_type": mission_type,
+                } | summary.to_dict()
+
+    def display(self, since: datetime, sessions: int) -> None:
+        print(f"\nVITALS impact since {since.isoformat()} ({sessions} sessions):\n")
+        if not self.aggregate.factions:
+            print("    No completed missions")
+            return
+
+        for faction, mission_types in sorted(self.aggregate.factions.items()):
+            missions = sum(summary.count for summary in mission_types.values())
+            influence = sum(summary.influence for summary in mission_types.values())
+            print(f"Faction <{faction}>: {missions} missions, influence +{influence}")
+
+            effects: dict[str, int] = {}
+            for summary in mission_types.values():
+                for effect, count in summary.effects.items():
+                    effects[effect] = effects.get(effect, 0) + count
+            for effect, count in sorted(effects.items(), key=lambda x: -x[1]):
+                print(" " * 4 + f"{localise_mission_faction_effect(effect)} x {count}")
+
+            for mission_type, summary in sorted(mission_types.items()):
+                print(
+                    " " * 4
+                    + f"{mission_type} x {summary.count}: influence +{summary.influence}"
+                )
+                if isinstance(summary, CargoMissionSummary):
+                    for good, amount in summary.goods.items():
+                        print(" " * 8 + f"{good}: {amount}")
+                elif isinstance(summary, DonationMissionSummary):
+                    print(" " * 8 + f"Donated: {summary.donated} cr")
+            print()
@@ -0,0 +1,32 @@
+from datetime import date
+from typing import Iterator, Optional
+from ..store.influence import InfluenceTotal
+from .records import Record
+
+
+class InfluenceView:
+    def __init__(self, faction: str, totals: list[InfluenceTotal]) -> None:
+        self.faction = faction
+        self.totals = totals
+
+    def records(self) -> Iterator[Record]:
+        for row in self.totals:
+            yield {
+                "type": "influence",
+                "faction": self.faction,
+                "system": row.system,
+                "system_address": row.system_address,
+                "pluses": row.pluses,
+                "missions": row.missions,
+            }
+
+    def display(self, since: Optional[date] = None) -> None:
+        period = f" since {since.isoformat()}" if since else ""
+        total = sum(row.pluses for row in self.totals)
+        missions = sum(row.missions for row in self.totals)
+        print(
+            f"\nInfluence for <{self.faction}>{period}: {total:+,} from {missions:,} missions\n"
+        )
+        for row in self.totals:
+            system = row.system or f"System #{row.system_address}"
+            print(f"    {system}: {row.pluses:+,} ({row.missions:,} missions)")
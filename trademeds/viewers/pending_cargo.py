@@ -1,7 +1,11 @@
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import DefaultDict, Dict
-from ..observers.incomplete_cargo import IncompleteMission
+from datetime import datetime
+from typing import DefaultDict, Dict, Iterator, Optional
+from ..observers.incomplete_cargo import IncompleteMission, mission_commodity
+from ..store.prices import PriceSource
+from .records import Record
+from .throughput import format_duration
 
 
 @dataclass(frozen=True)
@@ -9,15 +13,27 @@ class CargoGroup:
     good: str
     count: int
     faction: str
+    expires: Optional[datetime] = None  # soonest expiry of the group's missions
 
 
 class PendingCargoView:
-    def __init__(self, missions: Dict[int, IncompleteMission]) -> None:
+    def __init__(
+        self,
+        missions: Dict[int, IncompleteMission],
+        sources: Optional[Dict[str, PriceSource]] = None,  # by commodity key
+    ) -> None:
         self.missions = missions
+        self.sources = sources or {}
 
-    def display(self) -> None:
-        total_cargo = sum(mission.count for mission in self.missions.values())
+    def source(self, good: str) -> Optional[PriceSource]:
+        """Suggested market to buy a pending good at."""
+        for mission in self.missions.values():
+            if mission.good == good:
+                return self.sources.get(mission_commodity(mission))
+        return None
 
+    def groups(self) -> Dict[str, list[CargoGroup]]:
+        """Cargo groups by system name, the largest first within a system."""
         # Group by system and good
         by_system: DefaultDict[str, Dict[str, CargoGroup]] = defaultdict(dict)
         for mission in self.missions.values():
@@ -31,15 +47,86 @@ class PendingCargoView:
                         if existing.faction == mission.faction
                         else "Multiple factions"
                     ),
+                    expires=_soonest(existing.expires, mission.expiry),
                 )
             else:
                 by_system[mission.system][mission.good] = CargoGroup(
-                    good=mission.good, count=mission.count, faction=mission.faction
+                    good=mission.good,
+                    count=mission.count,
+                    faction=mission.faction,
+                    expires=mission.expiry,
                 )
 
+        return {
+            system: sorted(goods.values(), key=lambda x: (-x.count, x.good))
+            for system, goods in sorted(by_system.items())
+        }
+
+    def records(self) -> Iterator[Record]:
+        for system, groups in self.groups().items():
+            for cargo in groups:
+                record: Record = {
+                    "type": "pending_cargo",
+                    "system": system,
+                    "good": cargo.good,
+                    "count": cargo.count,
+                    "faction": cargo.faction,
+                    "expires": cargo.expires,
+                }
+                source = self.source(cargo.good)
+                if source is not None:
+                    record["source"] = {
+                        "market_id": source.market_id,
+                        "station": (
+                            source.market.station_name if source.market else None
+                        ),
+                        "system": source.market.system_name if source.market else None,
+                        "last_price": source.last_price,
+                        "last_at": source.last_at,
+                        "best_price": source.best_price,
+                        "best_at": source.best_at,
+                    }
+                yield record
+
+    def display(self, now: Optional[datetime] = None) -> None:
+        total_cargo = sum(mission.count for mission in self.missions.values())
+
         print(f"\nPending cargo missions (total: {total_cargo:,} units):\n")
-        for system, goods in sorted(by_system.items()):
+        for system, groups in self.groups().items():
             print(f"{system}:")
-            for cargo in sorted(goods.values(), key=lambda x: (-x.count, x.good)):
-                print(f"  {cargo.good}: {cargo.count:,} units for {cargo.faction}")
+            for cargo in groups:
+                line = f"  {cargo.good}: {cargo.count:,} units for {cargo.faction}"
+                if now is not None and cargo.expires is not None:
+                    line += (
+                        f", expires in {format_duration(cargo.expires - now)}"
+                        if cargo.expires > now
+                        else ", expired"
+                    )
+                source = self.source(cargo.good)
+                if source is not None:
+                    line += f" (buy at {_market_name(source)}: {_prices(source)})"
+                print(line)
             print()
+
+
+def _soonest(
+    expires: Optional[datetime], expiry: Optional[datetime]
+) -> Optional[datetime]:
+    if expires is None or expiry is None:
+        return expires or expiry
+    return min(expires, expiry)
+
+
+def _market_name(source: PriceSource) -> str:
+    if source.market is None:
+        return f"market #{source.market_id}"
+    if source.market.is_carrier:
+        return f"carrier {source.market.station_name}"
+    return f"{source.market.system_name} > {source.market.station_name}"
+
+
+def _prices(source: PriceSource) -> str:
+    text = f"{source.last_price:,} cr on {source.last_at.date().isoformat()}"
+    if source.best_price < source.last_price:
+        text += f", {source.best_price:,} cr on {source.best_at.date().isoformat()}"
+    return text
@@ -0,0 +1,74 @@
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, BinaryIO, Iterable, Literal, Optional
+
+OutputFormat = Literal["text", "ndjson", "json"]
+FORMATS: tuple[OutputFormat, ...] = ("text", "ndjson", "json")
+
+Record = dict[str, Any]
+
+BUFFER_SIZE = 64 * 1024
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class RecordWriter:
+    """Writes view records as NDJSON lines or as the elements of one JSON array.
+
+    Each record is encoded as soon as it is written and appended to a single
+    buffer, which goes to `stream` whenever it holds `buffer_size` bytes, so
+    a long report streams out in large writes instead of one per record.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        output_format: Literal["ndjson", "json"],
+        buffer_size: int = BUFFER_SIZE,
+    ) -> None:
+        self.stream = stream
+        self.output_format = output_format
+        self.buffer_size = buffer_size
+        self.records = 0
+        self._buffer = bytearray()
+        self._encoder = json.JSONEncoder(
+            default=_encode_default, ensure_ascii=False, separators=(",", ":")
+        )
+
+    def write(self, record: Record) -> None:
+        encoded = self._encoder.encode(record).encode()
+        if self.output_format == "ndjson":
+            self._buffer += encoded
+            self._buffer += b"\n"
+        else:
+            self._buffer += b"," if self.records else b"["
+            self._buffer += encoded
+        self.records += 1
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_all(self, records: Iterable[Record]) -> None:
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        self.stream.write(self._buffer)
+        self._buffer.clear()
+        self.stream.flush()
+
+    def close(self) -> None:
+        if self.output_format == "json":
+            self._buffer += b"]\n" if self.records else b"[]\n"
+        self.flush()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc: Optional[object]) -> None:
+        self.close()
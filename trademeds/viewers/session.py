@@ -1,37 +1,82 @@
-from collections import defaultdict
-from dataclasses import dataclass, field
-from typing import Type
+from typing import Iterable, Iterator
 from ..models.entities import (
     Market,
     CargoSession,
-    CargoMission,
-    DonationMission,
     Mission,
-    GenericMission,
 )
+from ..models.impact import (
+    ImpactAggregate,
+    CargoMissionSummary,
+    DonationMissionSummary,
+)
+from .records import Record
+
+
+def localise_mission_faction_effect(t: str) -> str:
+    if t == "$MISSIONUTIL_Interaction_Summary_Outbreak_down;":
+        return "OUTBREAK_DOWN"
+    if t == "$MISSIONUTIL_Interaction_Summary_EP_up;":
+        return "ECONOMY_POWER_UP"
+    if t == "$MISSIONUTIL_Interaction_Summary_SP_up;":
+        return "SECURITY_UP"
+    return t
 
 
 class SessionView:
     def __init__(self, markets: dict[int, Market]) -> None:
         self.markets = markets
 
-    def display_sessions(self, sessions: list[CargoSession]) -> None:
+    def display_sessions(self, sessions: Iterable[CargoSession]) -> None:
         for session in sessions:
             self.display_session(session)
             print("")
 
+    def records(self, sessions: Iterable[CargoSession]) -> Iterator[Record]:
+        """A record per session, each followed by one per mission group."""
+        for session in sessions:
+            yield {
+                "type": "session",
+                "started_at": session.started_at,
+                "ended_at": session.ended_at,
+                "bought": self._trade_records(session.bought),
+                "sold": self._trade_records(session.sold),
+            }
+            session_key = session.started_at.isoformat()
+            aggr = ImpactAggregate.from_session(session)
+            for faction, mission_types in aggr.factions.items():
+                for mission_type, summary in mission_types.items():
+                    yield {
+                        "type": "mission_group",
+                        "session": session_key,
+                        "faction": faction,
+                        "mission_type": mission_type,
+                    } | summary.to_dict()
+
+    def _trade_records(self, trades: dict[int, dict[str, int]]) -> list[Record]:
+        records = []
+        for market_id, goods in trades.items():
+            market = self.markets.get(market_id)
+            records.append(
+                {
+                    "market_id": market_id,
+                    "station": market.station_name if market else None,
+                    "system": market.system_name if market else None,
+                    "is_carrier": market.is_carrier if market else None,
+                    "goods": dict(goods),
+                }
+            )
+        return records
+
     def display_session(self, session: CargoSession) -> None:
         print(
             f"VITAL Session {session.started_at.isoformat()} - {session.ended_at.isoformat()}"
         )
-        self._display_sales(session)
+        self._display_trades("MarketBuy", session.bought)
+        self._display_trades("MarketSell", session.sold)
         self._display_missions(session)
 
-    def _display_sales(self, session: CargoSession) -> None:
-        if not session.sold:
-            return
-
-        for market_id, goods in session.sold.items():
+    def _display_trades(self, kind: str, trades: dict[int, dict[str, int]]) -> None:
+        for market_id, goods in trades.items():
             market = self.markets[market_id]
             market_name = market.station_name
             system_name = market.system_name
@@ -40,7 +85,7 @@ class SessionView:
                 if market.is_carrier
                 else f"{system_name} > {market_name}"
             )
-            print(f"    MarketSell at {location}:")
+            print(f"    {kind} at {location}:")
 
             total = 0
             for good, count in goods.items():
@@ -54,75 +99,15 @@ class SessionView:
         print(f"    Missions:")
         self._missions_repr(session.missions)
 
-    def _localise_mission_faction_effect(self, t: str) -> str:
-        if t == "$MISSIONUTIL_Interaction_Summary_Outbreak_down;":
-            return "OUTBREAK_DOWN"
-        if t == "$MISSIONUTIL_Interaction_Summary_EP_up;":
-            return "ECONOMY_POWER_UP"
-        if t == "$MISSIONUTIL_Interaction_Summary_SP_up;":
-            return "SECURITY_UP"
-        return t
-
     def _missions_repr(self, missions: dict[int, Mission]) -> None:
-        @dataclass
-        class MissionSummary:
-            count: int = 0
-            effects: dict[str, int] = field(default_factory=lambda: defaultdict(int))
-            aux_effects: dict[str, dict[str, int]] = field(
-                default_factory=lambda: defaultdict(lambda: defaultdict(int))
-            )
-
-        @dataclass
-        class CargoMissionSummary(MissionSummary):
-            goods: dict[str, int] = field(default_factory=lambda: defaultdict(int))
-
-        @dataclass
-        class DonationMissionSummary(MissionSummary):
-            donated: int = 0
-
-        @dataclass
-        class GenericMissionSummary(MissionSummary):
-            pass
-
-        type_to_summary: dict[Type[Mission], Type[MissionSummary]] = {
-            CargoMission: CargoMissionSummary,
-            DonationMission: DonationMissionSummary,
-            GenericMission: GenericMissionSummary,
-        }
-        aggr: dict[str, dict[str, MissionSummary]] = defaultdict(dict)
-
-        for mission in missions.values():
-            if mission.technical_name not in aggr[mission.faction]:
-                aggr[mission.faction][mission.technical_name] = type_to_summary[
-                    type(mission)
-                ]()
-
-            mtype_aggr = aggr[mission.faction][mission.technical_name]
-            mtype_aggr.count += 1
-            if isinstance(mission, CargoMission):
-                assert isinstance(mtype_aggr, CargoMissionSummary)
-                mtype_aggr.goods[mission.good] += mission.count
-            elif isinstance(mission, DonationMission):
-                assert isinstance(mtype_aggr, DonationMissionSummary)
-                mtype_aggr.donated += mission.donated
-            elif isinstance(mission, GenericMission):
-                pass
-            else:
-                raise ValueError("Unknown mission type")
-
-            for faction_effect in mission.effects:
-                effect_aggr = mtype_aggr.effects
-                if faction_effect.faction != mission.faction:
-                    effect_aggr = mtype_aggr.aux_effects[faction_effect.faction]
-
-                effect_aggr[faction_effect.effect] += 1
+        aggr = ImpactAggregate.from_missions(missions.values())
 
-        for faction, mission_types in aggr.items():
+        for faction, mission_types in aggr.factions.items():
             print(" " * 8 + f"Faction <{faction}>:")
             for mission_type, summary in mission_types.items():
                 faction_effects = "; ".join(
                     [
-                        f"{self._localise_mission_faction_effect(effect)} x {count}"
+                        f"{localise_mission_faction_effect(effect)} x {count}"
                         for effect, count in summary.effects.items()
                     ]
                 )
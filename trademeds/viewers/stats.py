@@ -0,0 +1,54 @@
+from datetime import date
+from typing import Iterator
+from ..store.trades import GroupBy, TradeStats, TradeStore
+from .records import Record
+
+
+class TradeStatsView:
+    def __init__(self, store: TradeStore, stats: TradeStats, by: GroupBy) -> None:
+        self.store = store
+        self.stats = stats
+        self.by = by
+
+    def _label(self, key: int) -> str:
+        if self.by == "day":
+            return date.fromordinal(date(1970, 1, 1).toordinal() + key).isoformat()
+        if self.by == "commodity":
+            commodity = self.store.commodities[key]
+            return self.store.commodity_names.get(commodity, commodity)
+        market = self.store.markets.get(key)
+        if market is None:
+            return f"Market #{key}"
+        if market.is_carrier:
+            return f"Carrier {market.station_name}"
+        return f"{market.system_name} > {market.station_name}"
+
+    def records(self) -> Iterator[Record]:
+        stats = self.stats
+        for i in range(len(stats.keys)):
+            yield {
+                "type": "trade_stats",
+                "by": self.by,
+                "key": self._label(int(stats.keys[i])),
+                "bought": int(stats.bought[i]),
+                "cost": int(stats.cost[i]),
+                "sold": int(stats.sold[i]),
+                "revenue": int(stats.revenue[i]),
+                "profit": int(stats.profit[i]),
+            }
+
+    def display(self) -> None:
+        stats = self.stats
+        print(f"\nTrades by {self.by} ({self.store.rows:,} transactions stored):\n")
+        for i in range(len(stats.keys)):
+            print(f"{self._label(int(stats.keys[i]))}:")
+            if stats.bought[i]:
+                print(
+                    " " * 4 + f"bought: {stats.bought[i]:,} t for {stats.cost[i]:,} cr"
+                )
+            if stats.sold[i]:
+                print(
+                    " " * 4
+                    + f"sold: {stats.sold[i]:,} t for {stats.revenue[i]:,} cr"
+                    + f" (profit {stats.profit[i]:,} cr)"
+                )
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+from ..models.throughput import SessionThroughput, TradeRates
+from .records import Record
+
+
+def format_duration(duration: Optional[timedelta]) -> str:
+    if duration is None:
+        return "-"
+    minutes = int(duration.total_seconds() // 60)
+    return f"{minutes // 60}:{minutes % 60:02} h" if minutes >= 60 else f"{minutes} min"
+
+
+class ThroughputView:
+    def __init__(
+        self, sessions: list[SessionThroughput], live: list[TradeRates]
+    ) -> None:
+        self.sessions = sessions
+        self.live = live
+
+    def records(self, now: datetime) -> Iterator[Record]:
+        for rates in self.live:
+            yield {"type": "live_throughput", "at": now} | _rates_record(rates)
+        for session in self.sessions:
+            yield {
+                "type": "session_throughput",
+                "started_at": session.started_at,
+                "ended_at": session.ended_at,
+            } | _rates_record(session.rates)
+
+    def display(self, now: datetime) -> None:
+        if self.live:
+            print(f"\nHauling throughput at {now.isoformat(timespec='seconds')}:\n")
+            for rates in self.live:
+                print(f"Last {format_duration(rates.duration)}:")
+                self._display_rates(rates)
+            print()
+
+        for session in self.sessions:
+            print(
+                f"Session {session.started_at.isoformat()} - {session.ended_at.isoformat()}"
+                f" ({format_duration(session.ended_at - session.started_at)}):"
+            )
+            self._display_rates(session.rates)
+            print()
+
+    def _display_rates(self, rates: TradeRates) -> None:
+        print(
+            " " * 4
+            + f"{rates.tons:,} t moved, {rates.credits:,} cr"
+            + f" ({rates.tons_per_hour:,.0f} t/h, {rates.credits_per_hour:,.0f} cr/h)"
+        )
+        if rates.loops:
+            print(
+                " " * 4
+                + f"{rates.loops} loops, {format_duration(rates.loop_time)} per loop"
+            )
+
+
+def _rates_record(rates: TradeRates) -> Record:
+    return {
+        "duration": rates.duration,
+        "tons": rates.tons,
+        "credits": rates.credits,
+        "loops": rates.loops,
+        "loop_time": rates.loop_time,
+        "tons_per_hour": rates.tons_per_hour,
+        "credits_per_hour": rates.credits_per_hour,
+    }